@@ -268,14 +268,21 @@ def get_recently_sent_article_hashes(user_id: int, hours: int = ARTICLE_DEDUP_WI
         return set()
 
 
-def record_sent_articles(user_id: int, articles: List[Dict[str, Any]]):
-    """Mark articles as sent to user so they aren't repeated."""
+def record_sent_articles(user_id: int, articles: List[Dict[str, Any]], batch=None):
+    """
+    Mark articles as sent to user so they aren't repeated.
+    
+    If `batch` (a Firestore WriteBatch) is given, the writes are added to it
+    and the caller commits it; otherwise they are committed here.
+    """
     db = _get_db()
     if not db or not articles:
         return
 
     try:
-        batch = db.batch()
+        owns_batch = batch is None
+        if owns_batch:
+            batch = db.batch()
         user_ref = db.collection('users').document(str(user_id))
         for article in articles:
             h = _article_hash(article)
@@ -286,7 +293,8 @@ def record_sent_articles(user_id: int, articles: List[Dict[str, Any]]):
                 'url': article.get('url', '')[:200],
                 'sent_at': firestore.SERVER_TIMESTAMP if firestore else datetime.now(timezone.utc),
             }, merge=True)
-        batch.commit()
+        if owns_batch:
+            batch.commit()
     except Exception as e:
         print(f"Error recording sent articles for {user_id}: {e}")
 
@@ -4,24 +4,42 @@ Firestore-based cache with TTL for news digests.
 """
 
 import time
-from typing import Any, Optional, List
+import hashlib
+from typing import Any, Optional, List, Tuple
 from datetime import datetime, timezone
 try:
     from google.cloud import firestore
 except ImportError:
     firestore = None
 
-def get_firestore_client():
-    """Get Firestore client or None if not available."""
-    try:
-        from google.cloud import firestore as firestore_module
-        import os
-        project_id = os.environ.get("FIRESTORE_PROJECT_ID") or os.environ.get("GOOGLE_CLOUD_PROJECT")
-        if project_id:
-            return firestore_module.Client(project=project_id)
-        return firestore_module.Client()
-    except Exception:
-        return None
+from .user_storage import get_firestore_client
+
+
+# How long (minutes) a digest stays fresh for each source, based on how
+# often that source publishes. A digest uses the shortest TTL of its sources.
+SOURCE_CACHE_TTL_MINUTES = {
+    'hackernews': 10,
+    'techcrunch': 20,
+    'theverge': 20,
+    'github': 30,
+    'producthunt': 30,
+    'ai_blogs': 60,
+}
+DEFAULT_CACHE_TTL_MINUTES = 15
+
+
+def get_digest_ttl_minutes(sources: Optional[List[str]] = None) -> int:
+    """
+    Pick a digest cache TTL from the enabled sources.
+    
+    Args:
+        sources: Enabled source list
+        
+    Returns:
+        TTL in minutes (the fastest-changing source wins)
+    """
+    ttls = [SOURCE_CACHE_TTL_MINUTES.get(source, DEFAULT_CACHE_TTL_MINUTES) for source in (sources or [])]
+    return min(ttls) if ttls else DEFAULT_CACHE_TTL_MINUTES
 
 
 def build_digest_cache_key(language: str = "en", sources: Optional[List[str]] = None, scope: str = "global") -> str:
@@ -33,15 +51,24 @@ def build_digest_cache_key(language: str = "en", sources: Optional[List[str]] =
         sources: Enabled source list
         scope: Optional segment (e.g., "news", "scheduled")
     """
-    from .security_utils import stable_hash
-    normalized_sources = ",".join(sorted((sources or [])))
+    # Users with the same language and source *set* share one entry,
+    # regardless of the order (or duplicates) in their stored source list.
+    normalized_sources = ",".join(sorted(set(sources or [])))
     payload = f"{scope}|{language}|{normalized_sources}"
-    suffix = stable_hash(payload)[:16]
+    suffix = hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
     return f"news_digest_{suffix}"
 
 
-def get_cached_digest(cache_key: str = "news_digest") -> Optional[str]:
-    """Get cached news digest if available and valid."""
+def get_cached_digest_with_meta(cache_key: str = "news_digest") -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Get a cached digest together with its creation timestamp in one read.
+    
+    Args:
+        cache_key: Cache document ID
+        
+    Returns:
+        (content, created_at) if a valid entry exists, otherwise None
+    """
     db = get_firestore_client()
     if not db:
         return None
@@ -53,9 +80,10 @@ def get_cached_digest(cache_key: str = "news_digest") -> Optional[str]:
             
         data = doc.to_dict()
         expiry = data.get('expires_at', 0)
+        content = data.get('content')
         
-        if time.time() < expiry:
-            return data.get('content')
+        if time.time() < expiry and content is not None:
+            return content, data.get('created_at')
             
         return None
     except Exception as e:
@@ -63,10 +91,17 @@ def get_cached_digest(cache_key: str = "news_digest") -> Optional[str]:
         return None
 
 
-def set_cached_digest(digest: str, ttl_minutes: int = 15, cache_key: str = "news_digest"):
+def get_cached_digest(cache_key: str = "news_digest") -> Optional[str]:
+    """Get cached news digest if available and valid."""
+    entry = get_cached_digest_with_meta(cache_key=cache_key)
+    return entry[0] if entry else None
+
+
+def set_cached_digest(digest: str, ttl_minutes: int = DEFAULT_CACHE_TTL_MINUTES, cache_key: str = "news_digest", batch=None):
     """
     Cache news digest in Firestore.
-    Default TTL is 15 minutes.
+    Default TTL is 15 minutes. If `batch` (a Firestore WriteBatch) is given,
+    the write is added to it and the caller commits it.
     """
     db = get_firestore_client()
     if not db:
@@ -76,32 +111,26 @@ def set_cached_digest(digest: str, ttl_minutes: int = 15, cache_key: str = "news
         now_ts = time.time()
         expiry = now_ts + (ttl_minutes * 60)
         
-        db.collection('cache').document(cache_key).set({
+        cache_ref = db.collection('cache').document(cache_key)
+        cache_data = {
             'content': digest,
             'expires_at': expiry,
             'created_at': datetime.now(timezone.utc).isoformat(),
             'cache_key': cache_key,
             'updated_at': firestore.SERVER_TIMESTAMP if firestore else datetime.now()
-        })
+        }
+        if batch is not None:
+            batch.set(cache_ref, cache_data)
+        else:
+            cache_ref.set(cache_data)
     except Exception as e:
         print(f"Cache set error: {e}")
 
 
 def get_digest_timestamp(cache_key: str = "news_digest") -> Optional[str]:
     """Get when the cached digest was created."""
-    db = get_firestore_client()
-    if not db:
-        return None
-        
-    try:
-        doc = db.collection('cache').document(cache_key).get()
-        if doc.exists:
-            data = doc.to_dict()
-            if time.time() < data.get('expires_at', 0):
-                return data.get('created_at')
-        return None
-    except Exception:
-        return None
+    entry = get_cached_digest_with_meta(cache_key=cache_key)
+    return entry[1] if entry else None
 
 
 def is_digest_cached(cache_key: str = "news_digest") -> bool:
@@ -4,6 +4,7 @@ Handles all database operations for users, articles, and digests.
 """
 
 import os
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta, timezone
 from google.cloud import firestore
@@ -23,8 +24,9 @@ def get_firestore_project_id() -> Optional[str]:
     return os.environ.get("FIRESTORE_PROJECT_ID") or os.environ.get("GOOGLE_CLOUD_PROJECT")
 
 
+@lru_cache(maxsize=1)
 def get_db() -> firestore.Client:
-    """Get Firestore client."""
+    """Get the shared Firestore client (created once per process)."""
     # In Cloud Functions, this uses default credentials
     # For local development, set GOOGLE_APPLICATION_CREDENTIALS env var
     project_id = get_firestore_project_id()
@@ -23,6 +23,11 @@ class MergedArticle:
         return ""
 
 
+# Compiled once; normalize_text runs for every article in every digest
+_URL_RE = re.compile(r'https?://\S+')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+
 def normalize_text(text: str) -> str:
     """
     Normalize text for comparison.
@@ -33,9 +38,9 @@ def normalize_text(text: str) -> str:
     """
     text = text.lower()
     # Remove URLs
-    text = re.sub(r'https?://\S+', '', text)
+    text = _URL_RE.sub('', text)
     # Remove special characters
-    text = re.sub(r'[^\w\s]', ' ', text)
+    text = _NON_WORD_RE.sub(' ', text)
     # Remove extra whitespace
     text = ' '.join(text.split())
     return text
@@ -274,10 +274,9 @@ async def process_deep_dive_queue_batch(batch_size: int = 5) -> Dict[str, Any]:
     if not pending:
         return {'processed': 0}
 
-    from telegram import Bot
-    from .telegram_bot import get_bot_token
+    from .telegram_bot import get_broadcast_bot
 
-    bot = Bot(token=get_bot_token())
+    bot = get_broadcast_bot()
     processed = 0
     errors = []
 
@@ -11,18 +11,7 @@ except Exception:
     g_firestore = None
 
 
-def get_firestore_client():
-    """Get Firestore client or None if not available."""
-    try:
-        if g_firestore is None:
-            return None
-        import os
-        project_id = os.environ.get("FIRESTORE_PROJECT_ID") or os.environ.get("GOOGLE_CLOUD_PROJECT")
-        if project_id:
-            return g_firestore.Client(project=project_id)
-        return g_firestore.Client()
-    except Exception:
-        return None
+from .user_storage import get_firestore_client
 
 
 class DistributedLock:
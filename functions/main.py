@@ -14,6 +14,39 @@ from zoneinfo import ZoneInfo
 import functions_framework
 from flask import Request
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+async def _run_and_close_clients(coro):
+    """Await coro, then close the pooled HTTP clients opened on this loop."""
+    try:
+        return await coro
+    finally:
+        from .scrapers.http_client import close_shared_client
+        from .summarizer import close_async_clients
+        from .telegram_bot import close_broadcast_bot
+        await close_shared_client()
+        await close_async_clients()
+        await close_broadcast_bot()
+
+
+def run_async(coro):
+    """
+    Run a coroutine to completion on a fresh event loop.
+    
+    Uses uvloop's libuv-based loop when it is installed (Linux/macOS) and
+    the standard asyncio loop otherwise. Every handler builds its own loop,
+    so this replaces asyncio.run() at each entry point. The shared scraper,
+    AI and broadcast Bot clients bound to that loop are closed on every
+    exit path.
+    """
+    if uvloop is not None:
+        return uvloop.run(_run_and_close_clients(coro))
+    return asyncio.run(_run_and_close_clients(coro))
+
 
 # ============ WEBHOOK HANDLER FOR TELEGRAM ============
 
@@ -27,7 +60,8 @@ def telegram_webhook(request: Request):
     even if processing fails or times out.
     """
     from telegram import Update
-    from .telegram_bot import create_bot_application
+    from .telegram_bot import create_bot_application, drain_background_tasks
+    from .scrapers.http_client import close_shared_client
     
     if request.method != 'POST':
         return 'OK', 200
@@ -76,6 +110,9 @@ def telegram_webhook(request: Request):
                 print(f"ERROR: Error processing update: {e}")
                 traceback.print_exc()
             finally:
+                # Let fire-and-forget writes land before the loop shuts down and cancels them
+                await drain_background_tasks()
+                await close_shared_client()
                 try:
                     print("Shutting down bot application...")
                     await asyncio.wait_for(
@@ -86,7 +123,7 @@ def telegram_webhook(request: Request):
                 except Exception as e:
                     print(f"Error during shutdown: {e}")
         
-        asyncio.run(process())
+        run_async(process())
         
         # Always return 200 OK to Telegram (even if processing failed)
         # This prevents infinite retries from Telegram
@@ -182,6 +219,20 @@ async def _filter_safe_news(news_items: list) -> list:
     return safe_news
 
 
+async def _fetch_safe_news(fetch_awaitable) -> list:
+    """
+    Await one source fetch, then URL-check its items right away.
+    
+    Gathering these per source lets the safety checks for fast sources run
+    while slower sources are still downloading, instead of waiting for
+    every fetch before checking anything.
+    """
+    items = await fetch_awaitable
+    if not isinstance(items, list):
+        return []
+    return await _filter_safe_news(items)
+
+
 async def process_scheduled_digest(target_time: str = None) -> dict:
     """
     Core logic for processing scheduled digests.
@@ -192,13 +243,13 @@ async def process_scheduled_digest(target_time: str = None) -> dict:
     """
     from .database import get_users_for_time, get_all_active_users, save_digest, get_last_digest_sent_at
     from .distributed_lock import DistributedLock
-    from .telegram_bot import send_digest_to_user
+    from .telegram_bot import broadcast, send_digest_to_user
     from .scrapers.hackernews import fetch_hackernews
-    from .scrapers.techcrunch import fetch_techcrunch
+    from .scrapers.techcrunch import fetch_techcrunch_async
     from .scrapers.ai_blogs import fetch_ai_blogs
-    from .scrapers.theverge import fetch_theverge
-    from .scrapers.github_trending import fetch_github_trending
-    from .scrapers.producthunt import fetch_producthunt
+    from .scrapers.theverge import fetch_theverge_async
+    from .scrapers.github_trending import fetch_github_trending_async
+    from .scrapers.producthunt import fetch_producthunt_async
     from .summarizer import summarize_news
     
     if target_time:
@@ -221,11 +272,11 @@ async def process_scheduled_digest(target_time: str = None) -> dict:
     # Fetch news from all sources concurrently
     tasks = []
     tasks.append(fetch_hackernews(12))
-    tasks.append(asyncio.to_thread(fetch_techcrunch, 8))
+    tasks.append(fetch_techcrunch_async(8))
     tasks.append(fetch_ai_blogs(3))
-    tasks.append(asyncio.to_thread(fetch_theverge, 5))
-    tasks.append(asyncio.to_thread(fetch_github_trending, 5))
-    tasks.append(asyncio.to_thread(fetch_producthunt, 8))
+    tasks.append(fetch_theverge_async(5))
+    tasks.append(fetch_github_trending_async(5))
+    tasks.append(fetch_producthunt_async(8))
     
     results = await asyncio.gather(*tasks, return_exceptions=True)
     
@@ -263,62 +314,51 @@ async def process_scheduled_digest(target_time: str = None) -> dict:
     # Send to all scheduled users with their language-specific digest
     from datetime import timedelta as dt_timedelta
     now_utc = datetime.now(timezone.utc)
-    sent_count = 0
-    errors = []
-    skipped_locked = 0
-    skipped_recent = 0
-    
-    for lang, lang_users in users_by_lang.items():
-        digest = digests_by_lang[lang]
-        for user in lang_users:
-            telegram_id = user.get('telegram_id')
-            if not telegram_id:
-                continue
-            
-            lock = DistributedLock('scheduled_digest', telegram_id, ttl_seconds=300)
-            acquired = lock.acquire()
-            
-            if not acquired:
-                print(f"Lock held for user {telegram_id}, skipping to prevent double-send")
-                skipped_locked += 1
-                continue
+    digest_by_user = {
+        user['telegram_id']: digests_by_lang[lang]
+        for lang, lang_users in users_by_lang.items()
+        for user in lang_users
+    }
+    articles_meta = all_news[:20]
+
+    async def send_to_user(telegram_id: int):
+        lock = DistributedLock('scheduled_digest', telegram_id, ttl_seconds=300)
+        acquired = await asyncio.to_thread(lock.acquire)
+        
+        if not acquired:
+            print(f"Lock held for user {telegram_id}, skipping to prevent double-send")
+            return None
+        
+        try:
+            last_sent = await asyncio.to_thread(get_last_digest_sent_at, telegram_id)
+            if last_sent and (now_utc - last_sent) < dt_timedelta(minutes=50):
+                print(f"Digest already sent to {telegram_id} at {last_sent}, skipping")
+                return None
             
-            try:
-                last_sent = get_last_digest_sent_at(telegram_id)
-                if last_sent and (now_utc - last_sent) < dt_timedelta(minutes=50):
-                    print(f"Digest already sent to {telegram_id} at {last_sent}, skipping")
-                    skipped_recent += 1
-                    lock.release()
-                    continue
-                
-                success = await send_digest_to_user(telegram_id, digest, articles_meta=all_news[:20])
-                if success:
-                    save_digest(telegram_id, digest)
-                    sent_count += 1
-                else:
-                    errors.append(telegram_id)
-            except Exception as e:
-                print(f"Error sending to {telegram_id}: {e}")
-                errors.append(telegram_id)
-            finally:
-                lock.release()
+            digest = digest_by_user[telegram_id]
+            success = await send_digest_to_user(telegram_id, digest, articles_meta=articles_meta)
+            if success:
+                await asyncio.to_thread(save_digest, telegram_id, digest)
+            return success
+        finally:
+            await asyncio.to_thread(lock.release)
+
+    result = await broadcast(digest_by_user, send_to_user)
                 
     return {
         'message': f'Digest sent for {current_time}',
-        'sent': sent_count,
+        'sent': result['sent'],
         'total_users': len(users),
-        'skipped_locked': skipped_locked,
-        'skipped_recently_sent': skipped_recent,
-        'errors': errors
+        'skipped': result['skipped'],
+        'errors': result['failed_ids']
     }
 
 
 async def process_weekly_trend_alerts() -> dict:
     """Send weekly trend alerts to opted-in users."""
-    from telegram import Bot
     from .database import get_all_active_users
     from .trend_analysis import calculate_weekly_trends, format_trends_message
-    from .telegram_bot import get_bot_token
+    from .telegram_bot import get_broadcast_bot
     from .user_storage import get_user_preferences, get_user_language
 
     trends = calculate_weekly_trends()
@@ -332,7 +372,7 @@ async def process_weekly_trend_alerts() -> dict:
     if not users:
         return {"message": "No active users", "sent": 0}
 
-    bot = Bot(token=get_bot_token())
+    bot = get_broadcast_bot()
     sent = 0
     skipped = 0
     errors = []
@@ -395,7 +435,7 @@ def scheduled_digest(request: Request):
             if target_time and not re.match(r'^\d{2}:\d{2}$', target_time):
                 return json.dumps({'error': 'Invalid time format. Expected HH:MM.'}), 400
 
-        result = asyncio.run(process_scheduled_digest(target_time))
+        result = run_async(process_scheduled_digest(target_time))
         return json.dumps(result), 200
 
     except Exception as e:
@@ -415,7 +455,7 @@ def weekly_trend_alerts(request: Request):
         return error
 
     try:
-        result = asyncio.run(process_weekly_trend_alerts())
+        result = run_async(process_weekly_trend_alerts())
         return json.dumps(result), 200
     except Exception as e:
         print(f"Weekly trend alert error: {e}")
@@ -432,11 +472,11 @@ def fetch_news(request: Request):
     Useful for testing or API access.
     """
     from .scrapers.hackernews import fetch_hackernews
-    from .scrapers.techcrunch import fetch_techcrunch
+    from .scrapers.techcrunch import fetch_techcrunch_async
     from .scrapers.ai_blogs import fetch_ai_blogs
-    from .scrapers.theverge import fetch_theverge
-    from .scrapers.github_trending import fetch_github_trending
-    from .scrapers.producthunt import fetch_producthunt
+    from .scrapers.theverge import fetch_theverge_async
+    from .scrapers.github_trending import fetch_github_trending_async
+    from .scrapers.producthunt import fetch_producthunt_async
     from .summarizer import summarize_news
 
     ok, error = _require_internal_secret(request)
@@ -454,19 +494,19 @@ def fetch_news(request: Request):
                 tasks.append(fetch_hackernews(12))
             
             if 'all' in sources_arg or 'techcrunch' in sources_arg:
-                tasks.append(asyncio.to_thread(fetch_techcrunch, 8))
+                tasks.append(fetch_techcrunch_async(8))
             
             if 'all' in sources_arg or 'ai_blogs' in sources_arg:
                 tasks.append(fetch_ai_blogs(3))
             
             if 'all' in sources_arg or 'theverge' in sources_arg:
-                tasks.append(asyncio.to_thread(fetch_theverge, 5))
+                tasks.append(fetch_theverge_async(5))
             
             if 'all' in sources_arg or 'github' in sources_arg:
-                tasks.append(asyncio.to_thread(fetch_github_trending, 5))
+                tasks.append(fetch_github_trending_async(5))
 
             if 'all' in sources_arg or 'producthunt' in sources_arg:
-                tasks.append(asyncio.to_thread(fetch_producthunt, 5))
+                tasks.append(fetch_producthunt_async(5))
                 
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
@@ -503,7 +543,7 @@ def fetch_news(request: Request):
                     'count': len(processed_news)
                 }
 
-        result = asyncio.run(fetch_async())
+        result = run_async(fetch_async())
         return json.dumps(result), 200
 
     except Exception as e:
@@ -535,11 +575,11 @@ def hourly_news_check(request: Request):
 
     try:
         from .scrapers.hackernews import fetch_hackernews
-        from .scrapers.techcrunch import fetch_techcrunch
+        from .scrapers.techcrunch import fetch_techcrunch_async
         from .scrapers.ai_blogs import fetch_ai_blogs
-        from .scrapers.theverge import fetch_theverge
-        from .scrapers.github_trending import fetch_github_trending
-        from .scrapers.producthunt import fetch_producthunt
+        from .scrapers.theverge import fetch_theverge_async
+        from .scrapers.github_trending import fetch_github_trending_async
+        from .scrapers.producthunt import fetch_producthunt_async
         from .breaking_news import (
             detect_breaking_news, format_breaking_alert,
             get_user_breaking_news_preference,
@@ -548,17 +588,16 @@ def hourly_news_check(request: Request):
             cleanup_old_temporal_patterns
         )
         from .database import get_all_active_users
-        from telegram import Bot
-        from .telegram_bot import get_bot_token
+        from .telegram_bot import get_broadcast_bot
 
         async def check_async():
             tasks = [
                 fetch_hackernews(20),
-                asyncio.to_thread(fetch_techcrunch, 10),
+                fetch_techcrunch_async(10),
                 fetch_ai_blogs(5),
-                asyncio.to_thread(fetch_theverge, 8),
-                asyncio.to_thread(fetch_github_trending, 5),
-                asyncio.to_thread(fetch_producthunt, 5),
+                fetch_theverge_async(8),
+                fetch_github_trending_async(5),
+                fetch_producthunt_async(5),
             ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             all_news = []
@@ -575,7 +614,7 @@ def hourly_news_check(request: Request):
                 return {'alerts': 0, 'sent': 0}
 
             users = get_all_active_users()
-            bot = Bot(token=get_bot_token())
+            bot = get_broadcast_bot()
             sent = 0
             skipped_users = 0
             skipped_dupes = 0
@@ -629,7 +668,7 @@ def hourly_news_check(request: Request):
                 'skipped_duplicates': skipped_dupes
             }
 
-        result = asyncio.run(check_async())
+        result = run_async(check_async())
         return json.dumps(result), 200
 
     except Exception as e:
@@ -652,7 +691,7 @@ def process_deep_dives(request: Request):
 
     try:
         from .deep_dive import process_deep_dive_queue_batch, cleanup_old_deep_dives
-        result = asyncio.run(process_deep_dive_queue_batch(batch_size=5))
+        result = run_async(process_deep_dive_queue_batch(batch_size=5))
         cleanup_old_deep_dives(days=7)
         return json.dumps(result), 200
     except Exception as e:
@@ -675,21 +714,21 @@ def stalker_check(request: Request):
 
     try:
         from .scrapers.hackernews import fetch_hackernews
-        from .scrapers.techcrunch import fetch_techcrunch
+        from .scrapers.techcrunch import fetch_techcrunch_async
         from .scrapers.ai_blogs import fetch_ai_blogs
-        from .scrapers.theverge import fetch_theverge
-        from .scrapers.github_trending import fetch_github_trending
-        from .scrapers.producthunt import fetch_producthunt
+        from .scrapers.theverge import fetch_theverge_async
+        from .scrapers.github_trending import fetch_github_trending_async
+        from .scrapers.producthunt import fetch_producthunt_async
         from .stalker import process_stalker_alerts
 
         async def stalk_async():
             tasks = [
                 fetch_hackernews(15),
-                asyncio.to_thread(fetch_techcrunch, 8),
+                fetch_techcrunch_async(8),
                 fetch_ai_blogs(3),
-                asyncio.to_thread(fetch_theverge, 5),
-                asyncio.to_thread(fetch_github_trending, 5),
-                asyncio.to_thread(fetch_producthunt, 5),
+                fetch_theverge_async(5),
+                fetch_github_trending_async(5),
+                fetch_producthunt_async(5),
             ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
             all_news = []
@@ -703,7 +742,7 @@ def stalker_check(request: Request):
             result = await process_stalker_alerts(all_news)
             return result
 
-        result = asyncio.run(stalk_async())
+        result = run_async(stalk_async())
         return json.dumps(result), 200
 
     except Exception as e:
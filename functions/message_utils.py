@@ -3,16 +3,17 @@ Message Utility Functions
 Provides utilities for safely splitting and formatting Telegram messages.
 """
 
-from typing import List
+from typing import Iterator, List
+from urllib.parse import urlsplit
 
 
 # Telegram's maximum message length
 TELEGRAM_MAX_LENGTH = 4096
 
 
-def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]:
+def iter_message_chunks(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> Iterator[str]:
     """
-    Split a long message into chunks that respect Telegram's character limit.
+    Lazily split a long message into chunks that respect Telegram's character limit.
     
     This function intelligently splits messages at natural boundaries to avoid:
     - Breaking multi-byte UTF-8 characters (emojis, Cyrillic, etc.)
@@ -23,17 +24,17 @@ def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]
         text: The message text to split
         max_length: Maximum length per chunk (default: 4096 for Telegram)
         
-    Returns:
-        List of message chunks, each under max_length characters
+    Yields:
+        Message chunks in order, each under max_length characters
     """
     if not text:
-        return []
+        return
     
-    # If text fits in one message, return it as-is
+    # If text fits in one message, yield it as-is
     if len(text) <= max_length:
-        return [text]
+        yield text
+        return
     
-    chunks = []
     current_chunk = ""
     
     # Split by double newlines first (paragraphs)
@@ -44,7 +45,7 @@ def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]
         if len(current_chunk) + len(paragraph) + 2 > max_length:
             # If current chunk has content, save it
             if current_chunk:
-                chunks.append(current_chunk.rstrip())
+                yield current_chunk.rstrip()
                 current_chunk = ""
             
             # If the paragraph itself is too long, split by single newlines
@@ -55,7 +56,7 @@ def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]
                     # If adding this line would exceed the limit
                     if len(current_chunk) + len(line) + 1 > max_length:
                         if current_chunk:
-                            chunks.append(current_chunk.rstrip())
+                            yield current_chunk.rstrip()
                             current_chunk = ""
                         
                         # If even a single line is too long, split by words
@@ -66,7 +67,7 @@ def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]
                                 # If adding this word would exceed limit
                                 if len(current_chunk) + len(word) + 1 > max_length:
                                     if current_chunk:
-                                        chunks.append(current_chunk.rstrip())
+                                        yield current_chunk.rstrip()
                                     
                                     # If even a single word is too long (e.g., very long URL)
                                     # split it carefully at the character level
@@ -75,7 +76,7 @@ def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]
                                         safe_length = max_length - 10
                                         for i in range(0, len(word), safe_length):
                                             chunk = word[i:i + safe_length]
-                                            chunks.append(chunk)
+                                            yield chunk
                                         current_chunk = ""
                                     else:
                                         current_chunk = word + " "
@@ -92,9 +93,24 @@ def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]
     
     # Add any remaining content
     if current_chunk.strip():
-        chunks.append(current_chunk.rstrip())
+        yield current_chunk.rstrip()
+
+
+def split_message(text: str, max_length: int = TELEGRAM_MAX_LENGTH) -> List[str]:
+    """
+    Split a long message into a list of Telegram-sized chunks.
     
-    return chunks
+    Use iter_message_chunks() when chunks are consumed one at a time and
+    the full list is not needed up front.
+    
+    Args:
+        text: The message text to split
+        max_length: Maximum length per chunk (default: 4096 for Telegram)
+        
+    Returns:
+        List of message chunks, each under max_length characters
+    """
+    return list(iter_message_chunks(text, max_length))
 
 
 def split_message_simple(text: str, max_length: int = 4000) -> List[str]:
@@ -147,3 +163,46 @@ def split_message_simple(text: str, max_length: int = 4000) -> List[str]:
         chunks.append(current_chunk.rstrip())
     
     return chunks
+
+
+# Registered domain -> source name used by the scrapers. github.com is a
+# plain 'GitHub': repo and blog URLs are not all from the trending scraper.
+_SOURCE_BY_DOMAIN = {
+    'news.ycombinator.com': 'Hacker News',
+    'techcrunch.com': 'TechCrunch',
+    'theverge.com': 'The Verge',
+    'github.com': 'GitHub',
+    'producthunt.com': 'Product Hunt',
+    'anthropic.com': 'Anthropic',
+    'blog.google': 'Google AI',
+    'deepmind.google': 'DeepMind',
+    'mistral.ai': 'Mistral AI',
+    'deepseek.com': 'DeepSeek',
+    'qwenlm.github.io': 'Qwen',
+    'openai.com': 'OpenAI',
+}
+
+
+def source_from_url(url: str) -> str:
+    """
+    Guess an article's source from its URL host.
+
+    Tries the host and each parent domain against _SOURCE_BY_DOMAIN, so
+    www. and other subdomains match without scanning the whole URL.
+
+    Args:
+        url: Article URL
+
+    Returns:
+        Source name, or '' if the host is not a known source
+    """
+    try:
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        return ''
+    labels = host.split('.')
+    for i in range(len(labels) - 1):
+        source = _SOURCE_BY_DOMAIN.get('.'.join(labels[i:]))
+        if source:
+            return source
+    return ''
@@ -1,24 +1,18 @@
 """
 Observability Helpers
-Builds a simple runtime health snapshot for admin usage.
+Builds a simple runtime health snapshot for admin usage, and buffered
+progress logging for the broadcast scripts.
 """
 
-from typing import Dict, Any
+import logging
+import logging.handlers
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
 from datetime import datetime, timedelta, timezone
 from collections import Counter
 
 
-def get_firestore_client():
-    """Get Firestore client or None."""
-    try:
-        from google.cloud import firestore
-        import os
-        project_id = os.environ.get("FIRESTORE_PROJECT_ID") or os.environ.get("GOOGLE_CLOUD_PROJECT")
-        if project_id:
-            return firestore.Client(project=project_id)
-        return firestore.Client()
-    except Exception:
-        return None
+from .user_storage import get_firestore_client
 
 
 def build_health_snapshot() -> Dict[str, Any]:
@@ -106,3 +100,34 @@ def build_health_snapshot() -> Dict[str, Any]:
         snapshot["locks_error"] = str(e)
 
     return snapshot
+
+
+@contextmanager
+def buffered_progress_logger(name: str, capacity: int = 50) -> Iterator[logging.Logger]:
+    """
+    Log per-user progress lines to stderr in batches of `capacity`.
+    
+    Broadcast scripts log one line per user; buffering them avoids a write
+    per send. Errors flush the buffer at once, and the remaining lines are
+    flushed when the block exits, even if it raises.
+    
+    Args:
+        name: Logger name
+        capacity: Records buffered between writes
+        
+    Yields:
+        The logger to write progress lines to
+    """
+    logger = logging.getLogger(name)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("   %(message)s"))
+    handler = logging.handlers.MemoryHandler(capacity, flushLevel=logging.ERROR, target=stream_handler)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    try:
+        yield logger
+    finally:
+        logger.removeHandler(handler)
+        handler.flush()
+        handler.close()
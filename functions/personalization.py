@@ -8,17 +8,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 
-def get_firestore_client():
-    """Get Firestore client or None if unavailable."""
-    try:
-        from google.cloud import firestore
-        import os
-        project_id = os.environ.get("FIRESTORE_PROJECT_ID") or os.environ.get("GOOGLE_CLOUD_PROJECT")
-        if project_id:
-            return firestore.Client(project=project_id)
-        return firestore.Client()
-    except Exception:
-        return None
+from .user_storage import get_firestore_client
 
 
 def _get_topic(article: Dict[str, Any]) -> str:
@@ -79,9 +69,12 @@ def rank_articles_for_user(telegram_id: int, articles: List[Dict[str, Any]]) ->
     return ranked
 
 
-def record_digest_context(digest_id: str, telegram_id: int, articles: List[Dict[str, Any]]) -> bool:
+def record_digest_context(digest_id: str, telegram_id: int, articles: List[Dict[str, Any]], batch=None) -> bool:
     """
     Store lightweight digest context for later feedback learning.
+    
+    If `batch` (a Firestore WriteBatch) is given, the write is added to it
+    and the caller commits it.
     """
     db = get_firestore_client()
     if not db:
@@ -97,11 +90,16 @@ def record_digest_context(digest_id: str, telegram_id: int, articles: List[Dict[
                 "title": article.get("title", "")[:160],
             })
 
-        db.collection("digest_context").document(digest_id).set({
+        context_ref = db.collection("digest_context").document(digest_id)
+        context_data = {
             "user_id": telegram_id,
             "items": context_rows,
             "created_at": datetime.now(timezone.utc).isoformat(),
-        }, merge=True)
+        }
+        if batch is not None:
+            batch.set(context_ref, context_data, merge=True)
+        else:
+            context_ref.set(context_data, merge=True)
         return True
     except Exception as e:
         print(f"Digest context store error: {e}")
@@ -11,18 +11,8 @@ try:
 except Exception:
     g_firestore = None
 
-def get_firestore_client():
-    """Get Firestore client or None if not available."""
-    try:
-        if g_firestore is None:
-            return None
-        import os
-        project_id = os.environ.get("FIRESTORE_PROJECT_ID") or os.environ.get("GOOGLE_CLOUD_PROJECT")
-        if project_id:
-            return g_firestore.Client(project=project_id)
-        return g_firestore.Client()
-    except Exception:
-        return None
+from .user_storage import get_firestore_client
+
 
 # Rate limit configurations
 LIMITS = {
@@ -33,7 +23,11 @@ LIMITS = {
     'default': {'max': 30, 'window': 60}    # Default
 }
 
-def check_rate_limit(user_id: int, action: str = 'default') -> Tuple[bool, str]:
+# Seconds to ask the user to wait when the limit check itself fails
+RATE_LIMIT_ERROR_RETRY_SECONDS = 30
+
+
+def check_rate_limit(user_id: int, action: str = 'default') -> Tuple[bool, int]:
     """
     Check if user is rate limited for an action using Firestore.
     
@@ -42,13 +36,14 @@ def check_rate_limit(user_id: int, action: str = 'default') -> Tuple[bool, str]:
         action: Action type ('news', 'search', 'ai_chat', 'save', 'default')
         
     Returns:
-        Tuple of (is_allowed, message)
+        Tuple of (is_allowed, retry_after_seconds); retry_after_seconds is 0
+        when the request is allowed
     """
     db = get_firestore_client()
     
     # Fail open if no DB (local dev without creds)
     if not db:
-        return True, "No database connection"
+        return True, 0
         
     config = LIMITS.get(action, LIMITS['default'])
     max_requests = config['max']
@@ -60,7 +55,7 @@ def check_rate_limit(user_id: int, action: str = 'default') -> Tuple[bool, str]:
     
     try:
         if g_firestore is None:
-            return True, "Firestore SDK unavailable"
+            return True, 0
 
         # Transactional update to ensure consistency
         @g_firestore.transactional
@@ -84,7 +79,7 @@ def check_rate_limit(user_id: int, action: str = 'default') -> Tuple[bool, str]:
                 if timestamps:
                     oldest = min(timestamps)
                     wait_time = int(oldest + window_seconds - now_ts)
-                    return False, wait_time
+                    return False, max(wait_time, 1)
                 return False, window_seconds
             
             # Add new request
@@ -98,21 +93,16 @@ def check_rate_limit(user_id: int, action: str = 'default') -> Tuple[bool, str]:
                 'updated_at': datetime.now(timezone.utc)
             })
             
-            return True, max_requests - len(timestamps)
+            return True, 0
 
         # Run transaction
         trans = db.transaction()
-        allowed, result = update_rate_limit(trans, doc_ref)
-        
-        if not allowed:
-            return False, f"Rate limit reached. Please wait {result} seconds."
-            
-        return True, f"Remaining: {result}"
+        return update_rate_limit(trans, doc_ref)
         
     except Exception as e:
         print(f"Rate limit error: {e}")
         # Fail closed for all actions to prevent abuse on DB errors.
-        return False, "Rate limit check failed. Please try again in 30 seconds."
+        return False, RATE_LIMIT_ERROR_RETRY_SECONDS
 
 
 def reset_limits(user_id: int):
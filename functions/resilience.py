@@ -134,6 +134,32 @@ async def safe_call_async(func: Callable[..., T], *args, default: Optional[T] =
         return default
 
 
+class AsyncRateLimiter:
+    """
+    Spaces awaited calls at most `rate` per second, shared by all callers.
+    
+    Each acquire() reserves the next free slot (1/rate seconds after the
+    previous one) and sleeps until it, so callers proceed in arrival order
+    however many are waiting. State is plain floats, not asyncio
+    primitives, so one limiter can serve successive event loops.
+    
+    Args:
+        rate: Maximum acquisitions per second
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for this caller's slot."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
 class TimeoutError(Exception):
     """Raised when an operation times out."""
     pass
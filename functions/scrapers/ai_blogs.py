@@ -5,7 +5,7 @@ Fetches latest news from AI company blogs (OpenAI, Anthropic, Google AI, Mistral
 
 import httpx
 from bs4 import BeautifulSoup
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 import asyncio
 
@@ -174,34 +174,42 @@ async def scrape_blog(client: httpx.AsyncClient, blog_key: str, limit: int = 5)
 
 
 @retry_with_backoff(max_retries=2, base_delay=1.0)
-async def fetch_ai_blogs(limit_per_blog: int = 5) -> List[Dict[str, Any]]:
+async def fetch_ai_blogs(limit_per_blog: int = 5, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
     """
     Fetch latest posts from all AI company blogs.
     
     Args:
         limit_per_blog: Max posts per blog
+        client: Optional shared AsyncClient (a short-lived one is used otherwise)
         
     Returns:
         List of all blog posts from all sources
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Scrape all blogs concurrently
-        tasks = [
-            scrape_blog(client, blog_key, limit_per_blog)
-            for blog_key in AI_BLOGS.keys()
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Combine all results
-        all_posts = []
-        for result in results:
-            if isinstance(result, list):
-                all_posts.extend(result)
-            elif isinstance(result, Exception):
-                print(f"Blog scraping error: {result}")
-        
-        return all_posts
+    if client is None:
+        async with httpx.AsyncClient(timeout=30.0) as own_client:
+            return await _fetch_ai_blogs_with(own_client, limit_per_blog)
+    return await _fetch_ai_blogs_with(client, limit_per_blog)
+
+
+async def _fetch_ai_blogs_with(client: httpx.AsyncClient, limit_per_blog: int) -> List[Dict[str, Any]]:
+    """Scrape every AI blog concurrently using the given client."""
+    # Scrape all blogs concurrently
+    tasks = [
+        scrape_blog(client, blog_key, limit_per_blog)
+        for blog_key in AI_BLOGS.keys()
+    ]
+    
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Combine all results
+    all_posts = []
+    for result in results:
+        if isinstance(result, list):
+            all_posts.extend(result)
+        elif isinstance(result, Exception):
+            print(f"Blog scraping error: {result}")
+    
+    return all_posts
 
 
 def fetch_ai_blogs_sync(limit_per_blog: int = 5) -> List[Dict[str, Any]]:
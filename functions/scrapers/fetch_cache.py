@@ -0,0 +1,50 @@
+"""
+Short-lived cache for raw scraper results.
+/search and the refresh button re-scrape the same sources for every user;
+within a short window the 2nd..Nth caller reuses the first fetch instead
+of paying the HTTP round-trips again.
+"""
+
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+
+# Seconds a scraped article list stays fresh
+FETCH_CACHE_TTL_SECONDS = 90
+
+# (source, limit) -> (monotonic time fetched, articles)
+_fetch_cache: Dict[Tuple[str, int], Tuple[float, List[dict]]] = {}
+
+
+async def get_or_fetch(source: str, limit: int, fetch: Callable[[], Awaitable[list]],
+                       ttl_seconds: int = FETCH_CACHE_TTL_SECONDS) -> List[dict]:
+    """
+    Return a recent article list for a source, fetching it on a miss.
+
+    Entries live in process memory: a warm Cloud Functions instance serves
+    many users back to back, so that is where the repeats are. Empty or
+    failed fetches are not cached.
+
+    Args:
+        source: Source key, e.g. 'hackernews'
+        limit: Article limit passed to the scraper (part of the cache key)
+        fetch: Zero-argument callable returning an awaitable article list
+        ttl_seconds: Freshness window for the cached list
+
+    Returns:
+        List of article dicts (copies, so callers may modify them)
+    """
+    key = (source, limit)
+    cached = _fetch_cache.get(key)
+    if cached and time.monotonic() - cached[0] < ttl_seconds:
+        return [dict(article) for article in cached[1]]
+
+    articles = await fetch()
+    if isinstance(articles, list) and articles:
+        _fetch_cache[key] = (time.monotonic(), [dict(article) for article in articles])
+    return articles
+
+
+def clear_fetch_cache() -> None:
+    """Drop every cached scraper result."""
+    _fetch_cache.clear()
@@ -3,8 +3,9 @@ GitHub Trending Scraper
 Fetches trending repositories from GitHub.
 """
 
+import asyncio
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from bs4 import BeautifulSoup
 
@@ -19,6 +20,70 @@ except ImportError:
 
 GITHUB_TRENDING_URL = "https://github.com/trending"
 
+GITHUB_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+
+def _trending_url(language: str = None) -> str:
+    """Build the trending page URL, optionally filtered by language."""
+    if language:
+        return f"{GITHUB_TRENDING_URL}/{language}"
+    return GITHUB_TRENDING_URL
+
+
+def _parse_github_trending(html: str, limit: int) -> List[Dict[str, Any]]:
+    """Parse the GitHub trending page HTML into repo dicts."""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    repos = []
+    articles = soup.select('article.Box-row')
+    
+    for article in articles[:limit]:
+        # Get repo name and URL
+        h2 = article.select_one('h2 a')
+        if not h2:
+            continue
+            
+        repo_path = h2.get('href', '').strip()
+        repo_name = repo_path.lstrip('/')
+        repo_url = f"https://github.com{repo_path}"
+        
+        # Get description
+        description_elem = article.select_one('p')
+        description = description_elem.get_text(strip=True) if description_elem else ''
+        
+        # Get language
+        lang_elem = article.select_one('[itemprop="programmingLanguage"]')
+        repo_lang = lang_elem.get_text(strip=True) if lang_elem else 'Unknown'
+        
+        # Get stars today
+        stars_elem = article.select_one('span.d-inline-block.float-sm-right')
+        stars_today = stars_elem.get_text(strip=True) if stars_elem else '0 stars today'
+        
+        # Get total stars
+        total_stars_elem = article.select('a.Link--muted')
+        total_stars = '0'
+        if total_stars_elem:
+            for link in total_stars_elem:
+                if '/stargazers' in link.get('href', ''):
+                    total_stars = link.get_text(strip=True).replace(',', '')
+                    break
+        
+        repos.append({
+            'title': f"🔥 {repo_name}",
+            'url': repo_url,
+            'summary': description[:200] if description else f"Trending {repo_lang} repository",
+            'source': 'GitHub Trending',
+            'language': repo_lang,
+            'stars': total_stars,
+            'stars_today': stars_today,
+            'time': datetime.now().isoformat(),
+        })
+    
+    print(f"GitHub Trending: Fetched {len(repos)} repositories")
+    return repos
+
 
 @retry_with_backoff(max_retries=2, base_delay=1.0)
 def fetch_github_trending(limit: int = 10, language: str = None) -> List[Dict[str, Any]]:
@@ -33,73 +98,52 @@ def fetch_github_trending(limit: int = 10, language: str = None) -> List[Dict[st
         List of repos with name, description, url, stars, language
     """
     try:
-        url = GITHUB_TRENDING_URL
-        if language:
-            url = f"{url}/{language}"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
         with httpx.Client(timeout=30.0) as client:
-            response = client.get(url, headers=headers)
+            response = client.get(_trending_url(language), headers=GITHUB_HEADERS)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            repos = []
-            articles = soup.select('article.Box-row')
-            
-            for article in articles[:limit]:
-                # Get repo name and URL
-                h2 = article.select_one('h2 a')
-                if not h2:
-                    continue
-                    
-                repo_path = h2.get('href', '').strip()
-                repo_name = repo_path.lstrip('/')
-                repo_url = f"https://github.com{repo_path}"
-                
-                # Get description
-                description_elem = article.select_one('p')
-                description = description_elem.get_text(strip=True) if description_elem else ''
-                
-                # Get language
-                lang_elem = article.select_one('[itemprop="programmingLanguage"]')
-                repo_lang = lang_elem.get_text(strip=True) if lang_elem else 'Unknown'
-                
-                # Get stars today
-                stars_elem = article.select_one('span.d-inline-block.float-sm-right')
-                stars_today = stars_elem.get_text(strip=True) if stars_elem else '0 stars today'
-                
-                # Get total stars
-                total_stars_elem = article.select('a.Link--muted')
-                total_stars = '0'
-                if total_stars_elem:
-                    for link in total_stars_elem:
-                        if '/stargazers' in link.get('href', ''):
-                            total_stars = link.get_text(strip=True).replace(',', '')
-                            break
-                
-                repos.append({
-                    'title': f"🔥 {repo_name}",
-                    'url': repo_url,
-                    'summary': description[:200] if description else f"Trending {repo_lang} repository",
-                    'source': 'GitHub Trending',
-                    'language': repo_lang,
-                    'stars': total_stars,
-                    'stars_today': stars_today,
-                    'time': datetime.now().isoformat(),
-                })
-            
-            print(f"GitHub Trending: Fetched {len(repos)} repositories")
-            return repos
+            return _parse_github_trending(response.text, limit)
             
     except Exception as e:
         print(f"Error fetching GitHub Trending: {e}")
         return []
 
 
+@retry_with_backoff(max_retries=2, base_delay=1.0)
+async def fetch_github_trending_async(
+    limit: int = 10,
+    language: str = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_github_trending.
+    
+    The download runs on the event loop; only the HTML parse (CPU-bound,
+    and the page is large) is handed to a worker thread.
+    
+    Args:
+        limit: Maximum number of repos to return
+        language: Optional language filter (e.g., 'python', 'javascript')
+        client: Optional shared AsyncClient (a short-lived one is used otherwise)
+        
+    Returns:
+        List of repos with name, description, url, stars, language
+    """
+    if client is None:
+        async with httpx.AsyncClient(timeout=30.0) as own_client:
+            return await fetch_github_trending_async(limit, language, client=own_client)
+
+    try:
+        response = await client.get(_trending_url(language), headers=GITHUB_HEADERS)
+        response.raise_for_status()
+        
+        return await asyncio.to_thread(_parse_github_trending, response.text, limit)
+        
+    except Exception as e:
+        print(f"Error fetching GitHub Trending: {e}")
+        return []
+
+
 if __name__ == "__main__":
     # Test the scraper
     repos = fetch_github_trending(5)
@@ -4,7 +4,7 @@ Fetches top stories from Hacker News using the official API.
 """
 
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, timezone
 
 try:
@@ -55,43 +55,52 @@ def is_tech_related(story: Dict[str, Any]) -> bool:
 
 
 @retry_with_backoff(max_retries=2, base_delay=1.0)
-async def fetch_hackernews(limit: int = 30) -> List[Dict[str, Any]]:
+async def fetch_hackernews(limit: int = 30, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
     """
     Fetch top tech stories from Hacker News.
     
     Args:
         limit: Maximum number of stories to return
+        client: Optional shared AsyncClient (a short-lived one is used otherwise)
         
     Returns:
         List of stories with title, url, score, comments count
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Get top story IDs
-        response = await client.get(f"{HN_API_BASE}/topstories.json")
-        response.raise_for_status()
-        story_ids = response.json()[:100]  # Get top 100 to filter from
-        
-        # Fetch stories in parallel
-        stories = []
-        for story_id in story_ids:
-            story = await fetch_story(client, story_id)
-            if story and is_tech_related(story):
-                stories.append({
-                    'title': story.get('title', ''),
-                    'url': story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
-                    'score': story.get('score', 0),
-                    'comments': story.get('descendants', 0),
-                    'source': 'Hacker News',
-                    'hn_id': story_id,
-                    'time': datetime.fromtimestamp(story.get('time', 0), timezone.utc).isoformat()
-                })
-                
-                if len(stories) >= limit:
-                    break
-        
-        # Sort by score
-        stories.sort(key=lambda x: x['score'], reverse=True)
-        return stories
+    if client is None:
+        async with httpx.AsyncClient(timeout=30.0) as own_client:
+            return await _fetch_hackernews_with(own_client, limit)
+    return await _fetch_hackernews_with(client, limit)
+
+
+async def _fetch_hackernews_with(client: httpx.AsyncClient, limit: int) -> List[Dict[str, Any]]:
+    """Fetch top tech stories using the given client."""
+    # Get top story IDs
+    response = await client.get(f"{HN_API_BASE}/topstories.json")
+    response.raise_for_status()
+    story_ids = response.json()[:100]  # Get top 100 to filter from
+    
+    # Fetch stories in parallel
+    stories = []
+    for story_id in story_ids:
+        story = await fetch_story(client, story_id)
+        if story and is_tech_related(story):
+            stories.append({
+                'title': story.get('title', ''),
+                'title_lc': story.get('title', '').lower(),
+                'url': story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
+                'score': story.get('score', 0),
+                'comments': story.get('descendants', 0),
+                'source': 'Hacker News',
+                'hn_id': story_id,
+                'time': datetime.fromtimestamp(story.get('time', 0), timezone.utc).isoformat()
+            })
+            
+            if len(stories) >= limit:
+                break
+    
+    # Sort by score
+    stories.sort(key=lambda x: x['score'], reverse=True)
+    return stories
 
 
 def fetch_hackernews_sync(limit: int = 30) -> List[Dict[str, Any]]:
@@ -131,6 +140,7 @@ def _fetch_hackernews_sync_impl(limit: int = 30) -> List[Dict[str, Any]]:
                 if story and is_tech_related(story):
                     stories.append({
                         'title': story.get('title', ''),
+                        'title_lc': story.get('title', '').lower(),
                         'url': story.get('url', f"https://news.ycombinator.com/item?id={story_id}"),
                         'score': story.get('score', 0),
                         'comments': story.get('descendants', 0),
@@ -0,0 +1,67 @@
+"""
+Shared HTTP client for the async scrapers.
+Keeps one keep-alive connection pool per event loop so repeated fetches
+reuse TCP/TLS connections instead of opening a new client per source.
+"""
+
+import asyncio
+import weakref
+from typing import Optional
+
+import httpx
+
+
+# Shared clients keyed (weakly) by their event loop. httpx connections are
+# bound to the loop that opened them, and webhook requests / scheduled jobs
+# each run under their own loop. The loop object is the key, not id(loop):
+# ids are reused, and a later loop must never get a previous loop's client.
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_shared_client() -> httpx.AsyncClient:
+    """Build a pooled AsyncClient for scraper traffic."""
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(
+            max_connections=50,
+            max_keepalive_connections=20,
+            keepalive_expiry=60.0,
+        ),
+    )
+
+
+def get_shared_client() -> Optional[httpx.AsyncClient]:
+    """
+    Get the pooled scraper client for the running event loop.
+
+    Returns:
+        Shared AsyncClient, or None when called outside a running loop
+        (scrapers then fall back to a short-lived client of their own).
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+    client = _shared_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _build_shared_client()
+        _shared_clients[loop] = client
+    return client
+
+
+async def close_shared_client() -> None:
+    """Close the pooled client for the running event loop, if any."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    client = _shared_clients.pop(loop, None)
+    if client is not None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"Error closing scraper HTTP client: {e}")
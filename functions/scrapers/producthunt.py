@@ -4,7 +4,8 @@ Fetches trending products from Product Hunt RSS feed.
 """
 
 import httpx
-from typing import List, Dict, Any
+import urllib.parse
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from defusedxml import ElementTree as ET
 from defusedxml.common import DefusedXmlException
@@ -26,6 +27,42 @@ PRODUCTHUNT_RSS_URL = "https://www.producthunt.com/feed"
 PRODUCTHUNT_WEB_URL = "https://www.producthunt.com/"
 
 
+def _parse_producthunt_html(html: str, limit: int) -> List[Dict[str, Any]]:
+    """Extract product links from the Product Hunt front page HTML."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    products = []
+    seen_urls = set()
+
+    # Product cards usually contain links under posts.
+    for link in soup.select("a[href*='/posts/']"):
+        href = link.get("href", "")
+        if not href:
+            continue
+        if href.startswith("/"):
+            href = f"https://www.producthunt.com{href}"
+        if href in seen_urls:
+            continue
+        seen_urls.add(href)
+
+        title = link.get_text(" ", strip=True)
+        if not title or len(title) < 3:
+            continue
+
+        products.append({
+            "title": title[:200],
+            "url": href,
+            "summary": "",
+            "source": "Product Hunt",
+            "time": datetime.now().isoformat(),
+        })
+
+        if len(products) >= limit:
+            break
+
+    return products
+
+
 def _scrape_producthunt_html(client: httpx.Client, limit: int) -> List[Dict[str, Any]]:
     """Fallback HTML scraper when RSS is empty/unavailable."""
     try:
@@ -54,41 +91,71 @@ def _scrape_producthunt_html(client: httpx.Client, limit: int) -> List[Dict[str,
         else:
             return []
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        return _parse_producthunt_html(response.text, limit)
+    except Exception as e:
+        print(f"Product Hunt HTML fallback error: {e}")
+        return []
 
-        products = []
-        seen_urls = set()
 
-        # Product cards usually contain links under posts.
-        for link in soup.select("a[href*='/posts/']"):
-            href = link.get("href", "")
-            if not href:
-                continue
-            if href.startswith("/"):
-                href = f"https://www.producthunt.com{href}"
-            if href in seen_urls:
-                continue
-            seen_urls.add(href)
+def _parse_producthunt_feed(content: bytes, limit: int) -> List[Dict[str, Any]]:
+    """Convert the Product Hunt RSS (or Atom) feed into product dicts."""
+    root = ET.fromstring(content)
+    
+    products = []
+    items = root.findall('.//item')
+    
+    for item in items[:limit]:
+        title = item.find('title')
+        link = item.find('link')
+        description = item.find('description')
+        pub_date = item.find('pubDate')
+        
+        if title is not None and link is not None:
+            # Clean up description (remove HTML)
+            desc_text = ''
+            if description is not None and description.text:
+                desc_text = sanitize_html(description.text)[:200]
+            
+            products.append({
+                'title': title.text or '',
+                'url': link.text or '',
+                'summary': desc_text,
+                'source': 'Product Hunt',
+                'time': pub_date.text if pub_date is not None else datetime.now().isoformat(),
+            })
+
+    # Product Hunt feed can be Atom instead of RSS.
+    if not products:
+        atom_ns = {'atom': 'http://www.w3.org/2005/Atom'}
+        entries = root.findall('.//atom:entry', atom_ns)
+        for entry in entries[:limit]:
+            title = entry.find('atom:title', atom_ns)
+            link = entry.find('atom:link', atom_ns)
+            summary = entry.find('atom:summary', atom_ns)
+            if summary is None:
+                summary = entry.find('atom:content', atom_ns)
+
+            published = entry.find('atom:published', atom_ns)
+            if published is None:
+                published = entry.find('atom:updated', atom_ns)
 
-            title = link.get_text(" ", strip=True)
-            if not title or len(title) < 3:
+            if title is None or link is None:
                 continue
 
+            href = link.get('href', '')
+            desc_text = ''
+            if summary is not None and summary.text:
+                desc_text = sanitize_html(summary.text)[:200]
+
             products.append({
-                "title": title[:200],
-                "url": href,
-                "summary": "",
-                "source": "Product Hunt",
-                "time": datetime.now().isoformat(),
+                'title': title.text or '',
+                'url': href,
+                'summary': desc_text,
+                'source': 'Product Hunt',
+                'time': published.text if published is not None else datetime.now().isoformat(),
             })
 
-            if len(products) >= limit:
-                break
-
-        return products
-    except Exception as e:
-        print(f"Product Hunt HTML fallback error: {e}")
-        return []
+    return products
 
 
 def fetch_producthunt(limit: int = 10) -> List[Dict[str, Any]]:
@@ -137,61 +204,7 @@ def fetch_producthunt(limit: int = 10) -> List[Dict[str, Any]]:
                 return []
             
             # Parse RSS feed
-            root = ET.fromstring(response.content)
-            
-            products = []
-            items = root.findall('.//item')
-            
-            for item in items[:limit]:
-                title = item.find('title')
-                link = item.find('link')
-                description = item.find('description')
-                pub_date = item.find('pubDate')
-                
-                if title is not None and link is not None:
-                    # Clean up description (remove HTML)
-                    desc_text = ''
-                    if description is not None and description.text:
-                        desc_text = sanitize_html(description.text)[:200]
-                    
-                    products.append({
-                        'title': title.text or '',
-                        'url': link.text or '',
-                        'summary': desc_text,
-                        'source': 'Product Hunt',
-                        'time': pub_date.text if pub_date is not None else datetime.now().isoformat(),
-                    })
-
-            # Product Hunt feed can be Atom instead of RSS.
-            if not products:
-                atom_ns = {'atom': 'http://www.w3.org/2005/Atom'}
-                entries = root.findall('.//atom:entry', atom_ns)
-                for entry in entries[:limit]:
-                    title = entry.find('atom:title', atom_ns)
-                    link = entry.find('atom:link', atom_ns)
-                    summary = entry.find('atom:summary', atom_ns)
-                    if summary is None:
-                        summary = entry.find('atom:content', atom_ns)
-
-                    published = entry.find('atom:published', atom_ns)
-                    if published is None:
-                        published = entry.find('atom:updated', atom_ns)
-
-                    if title is None or link is None:
-                        continue
-
-                    href = link.get('href', '')
-                    desc_text = ''
-                    if summary is not None and summary.text:
-                        desc_text = sanitize_html(summary.text)[:200]
-
-                    products.append({
-                        'title': title.text or '',
-                        'url': href,
-                        'summary': desc_text,
-                        'source': 'Product Hunt',
-                        'time': published.text if published is not None else datetime.now().isoformat(),
-                    })
+            products = _parse_producthunt_feed(response.content, limit)
 
             if not products:
                 products = _scrape_producthunt_html(client, limit)
@@ -207,6 +220,78 @@ def fetch_producthunt(limit: int = 10) -> List[Dict[str, Any]]:
         return []
 
 
+async def _get_with_safe_redirects(client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+    """GET a URL, following up to 5 redirects that pass the SSRF check."""
+    try:
+        from ..security_utils import is_safe_url
+    except ImportError:
+        async def is_safe_url(url: str) -> bool:
+            return True
+
+    current_url = url
+    for _ in range(5):
+        if not await is_safe_url(current_url):
+            return None
+        response = await client.get(current_url, headers=headers, follow_redirects=False)
+        if response.status_code not in (301, 302, 303, 307, 308):
+            return response
+        location = response.headers.get("Location")
+        if not location:
+            return response
+        current_url = urllib.parse.urljoin(current_url, location)
+    return None
+
+
+async def fetch_producthunt_async(limit: int = 10, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_producthunt that runs on the event loop.
+    
+    Args:
+        limit: Maximum number of products to return
+        client: Optional shared AsyncClient (a short-lived one is used otherwise)
+        
+    Returns:
+        List of products with name, tagline, url
+    """
+    if client is None:
+        async with httpx.AsyncClient(timeout=30.0) as own_client:
+            return await fetch_producthunt_async(limit, client=own_client)
+
+    try:
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (compatible; LensAI Bot/1.0)',
+            'Accept': 'application/rss+xml, application/xml, text/xml, */*'
+        }
+        response = await _get_with_safe_redirects(client, PRODUCTHUNT_RSS_URL, headers=headers)
+        if response is None:
+            return []
+        if response.status_code != 200:
+            print(f"Product Hunt RSS returned {response.status_code}")
+            return []
+
+        products = _parse_producthunt_feed(response.content, limit)
+
+        if not products:
+            # Fallback HTML scraper when the feed is empty
+            try:
+                page = await _get_with_safe_redirects(client, PRODUCTHUNT_WEB_URL)
+                if page is not None:
+                    page.raise_for_status()
+                    products = _parse_producthunt_html(page.text, limit)
+            except Exception as e:
+                print(f"Product Hunt HTML fallback error: {e}")
+
+        print(f"Product Hunt: Fetched {len(products)} products")
+        return products
+
+    except (ParseError, DefusedXmlException) as e:
+        print(f"Product Hunt XML parse error: {e}")
+        return []
+    except Exception as e:
+        print(f"Error fetching Product Hunt: {e}")
+        return []
+
+
 if __name__ == "__main__":
     # Test the scraper
     products = fetch_producthunt(5)
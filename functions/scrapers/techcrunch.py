@@ -5,7 +5,7 @@ Fetches latest articles from TechCrunch using their RSS feed.
 
 import feedparser
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 import time
 
@@ -41,6 +41,31 @@ def parse_date(date_struct) -> str:
     return datetime.now().isoformat()
 
 
+def _parse_techcrunch_feed(feed, limit: int) -> List[Dict[str, Any]]:
+    """Convert a parsed TechCrunch feed into article dicts."""
+    articles = []
+    for entry in feed.entries[:limit]:
+        # Clean up summary (remove HTML tags)
+        summary = entry.get('summary', '')
+        if summary:
+            # Basic HTML tag removal
+            summary = sanitize_html(summary)
+            summary = summary[:300] + '...' if len(summary) > 300 else summary
+        
+        title = entry.get('title', '')
+        articles.append({
+            'title': title,
+            'title_lc': title.lower(),
+            'url': entry.get('link', ''),
+            'summary': summary,
+            'date': parse_date(entry.get('published_parsed')),
+            'source': 'TechCrunch',
+            'author': entry.get('author', 'TechCrunch')
+        })
+    
+    return articles
+
+
 @retry_with_backoff(max_retries=2, base_delay=1.0)
 def fetch_techcrunch(limit: int = 20) -> List[Dict[str, Any]]:
     """
@@ -60,25 +85,41 @@ def fetch_techcrunch(limit: int = 20) -> List[Dict[str, Any]]:
             print(f"Error parsing TechCrunch feed: {feed.bozo_exception}")
             return []
         
-        articles = []
-        for entry in feed.entries[:limit]:
-            # Clean up summary (remove HTML tags)
-            summary = entry.get('summary', '')
-            if summary:
-                # Basic HTML tag removal
-                summary = sanitize_html(summary)
-                summary = summary[:300] + '...' if len(summary) > 300 else summary
-            
-            articles.append({
-                'title': entry.get('title', ''),
-                'url': entry.get('link', ''),
-                'summary': summary,
-                'date': parse_date(entry.get('published_parsed')),
-                'source': 'TechCrunch',
-                'author': entry.get('author', 'TechCrunch')
-            })
+        return _parse_techcrunch_feed(feed, limit)
+        
+    except Exception as e:
+        print(f"Error fetching TechCrunch: {e}")
+        return []
+
+
+@retry_with_backoff(max_retries=2, base_delay=1.0)
+async def fetch_techcrunch_async(limit: int = 20, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_techcrunch that runs on the event loop.
+    
+    Args:
+        limit: Maximum number of articles to return
+        client: Optional shared AsyncClient (a short-lived one is used otherwise)
+        
+    Returns:
+        List of articles with title, url, summary, date
+    """
+    if client is None:
+        async with httpx.AsyncClient(timeout=30.0) as own_client:
+            return await fetch_techcrunch_async(limit, client=own_client)
+
+    try:
+        response = await client.get(TECHCRUNCH_RSS, follow_redirects=True)
+        response.raise_for_status()
+        
+        # feedparser only parses here; the download already happened above
+        feed = feedparser.parse(response.content)
+        
+        if feed.bozo and not feed.entries:
+            print(f"Error parsing TechCrunch feed: {feed.bozo_exception}")
+            return []
         
-        return articles
+        return _parse_techcrunch_feed(feed, limit)
         
     except Exception as e:
         print(f"Error fetching TechCrunch: {e}")
@@ -3,8 +3,9 @@ The Verge RSS Scraper
 Fetches latest tech news from The Verge using their RSS feed.
 """
 
+import urllib.parse
 import httpx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 from defusedxml import ElementTree as ET
 
@@ -28,14 +29,50 @@ except ImportError:
 
 VERGE_RSS_URL = "https://www.theverge.com/rss/index.xml"
 
+VERGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+
+def _parse_verge_feed(content: bytes, limit: int) -> List[Dict[str, Any]]:
+    """Parse The Verge Atom feed into article dicts."""
+    # Parse XML/Atom feed
+    root = ET.fromstring(content)
+    
+    # The Verge uses Atom format
+    namespace = {'atom': 'http://www.w3.org/2005/Atom'}
+    
+    articles = []
+    entries = root.findall('.//atom:entry', namespace)
+    
+    for entry in entries[:limit]:
+        title = entry.find('atom:title', namespace)
+        link = entry.find('atom:link', namespace)
+        published = entry.find('atom:published', namespace)
+        summary = entry.find('atom:content', namespace)
+        
+        if title is not None and link is not None:
+            article = {
+                'title': title.text or '',
+                'url': link.get('href', ''),
+                'source': 'The Verge',
+                'time': published.text if published is not None else datetime.now().isoformat(),
+            }
+            
+            # Add summary if available (clean HTML)
+            if summary is not None and summary.text:
+                # Basic HTML cleaning - just extract first 200 chars of text
+                clean_summary = sanitize_html(summary.text)
+                article['summary'] = clean_summary[:200] + '...' if len(clean_summary) > 200 else clean_summary
+            
+            articles.append(article)
+    
+    print(f"The Verge: Fetched {len(articles)} articles")
+    return articles
+
 
 @retry_with_backoff(max_retries=2, base_delay=1.0)
 def fetch_theverge(limit: int = 10) -> List[Dict[str, Any]]:
-    try:
-        from ..security_utils import is_safe_url_sync
-    except ImportError:
-        def is_safe_url_sync(url: str) -> bool:
-            return True
     """
     Fetch latest articles from The Verge RSS feed.
     
@@ -45,23 +82,25 @@ def fetch_theverge(limit: int = 10) -> List[Dict[str, Any]]:
     Returns:
         List of articles with title, url, summary
     """
+    try:
+        from ..security_utils import is_safe_url_sync
+    except ImportError:
+        def is_safe_url_sync(url: str) -> bool:
+            return True
+
     try:
         with httpx.Client(timeout=30.0, follow_redirects=False) as client:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
             redirects = 0
             current_url = VERGE_RSS_URL
             response = None
             while redirects < 5:
                 if not is_safe_url_sync(current_url):
                     return []
-                response = client.get(current_url, headers=headers)
+                response = client.get(current_url, headers=VERGE_HEADERS)
                 if response.status_code in (301, 302, 303, 307, 308):
                     location = response.headers.get("Location")
                     if not location:
                         break
-                    import urllib.parse
                     current_url = urllib.parse.urljoin(current_url, location)
                     redirects += 1
                 else:
@@ -70,45 +109,62 @@ def fetch_theverge(limit: int = 10) -> List[Dict[str, Any]]:
             else:
                 return []
             
-            # Parse XML/Atom feed
-            root = ET.fromstring(response.content)
-            
-            # The Verge uses Atom format
-            namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            articles = []
-            entries = root.findall('.//atom:entry', namespace)
-            
-            for entry in entries[:limit]:
-                title = entry.find('atom:title', namespace)
-                link = entry.find('atom:link', namespace)
-                published = entry.find('atom:published', namespace)
-                summary = entry.find('atom:content', namespace)
-                
-                if title is not None and link is not None:
-                    article = {
-                        'title': title.text or '',
-                        'url': link.get('href', ''),
-                        'source': 'The Verge',
-                        'time': published.text if published is not None else datetime.now().isoformat(),
-                    }
-                    
-                    # Add summary if available (clean HTML)
-                    if summary is not None and summary.text:
-                        # Basic HTML cleaning - just extract first 200 chars of text
-                        clean_summary = sanitize_html(summary.text)
-                        article['summary'] = clean_summary[:200] + '...' if len(clean_summary) > 200 else clean_summary
-                    
-                    articles.append(article)
-            
-            print(f"The Verge: Fetched {len(articles)} articles")
-            return articles
+            return _parse_verge_feed(response.content, limit)
             
     except Exception as e:
         print(f"Error fetching The Verge: {e}")
         return []
 
 
+@retry_with_backoff(max_retries=2, base_delay=1.0)
+async def fetch_theverge_async(limit: int = 10, client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
+    """
+    Async version of fetch_theverge that runs on the event loop.
+    
+    Args:
+        limit: Maximum number of articles to return
+        client: Optional shared AsyncClient (a short-lived one is used otherwise)
+        
+    Returns:
+        List of articles with title, url, summary
+    """
+    try:
+        from ..security_utils import is_safe_url
+    except ImportError:
+        async def is_safe_url(url: str) -> bool:
+            return True
+
+    if client is None:
+        async with httpx.AsyncClient(timeout=30.0) as own_client:
+            return await fetch_theverge_async(limit, client=own_client)
+
+    try:
+        redirects = 0
+        current_url = VERGE_RSS_URL
+        response = None
+        while redirects < 5:
+            if not await is_safe_url(current_url):
+                return []
+            response = await client.get(current_url, headers=VERGE_HEADERS, follow_redirects=False)
+            if response.status_code in (301, 302, 303, 307, 308):
+                location = response.headers.get("Location")
+                if not location:
+                    break
+                current_url = urllib.parse.urljoin(current_url, location)
+                redirects += 1
+            else:
+                response.raise_for_status()
+                break
+        else:
+            return []
+        
+        return _parse_verge_feed(response.content, limit)
+        
+    except Exception as e:
+        print(f"Error fetching The Verge: {e}")
+        return []
+
+
 if __name__ == "__main__":
     # Test the scraper
     articles = fetch_theverge(5)
@@ -8,6 +8,7 @@ import hashlib
 import asyncio
 import urllib.parse
 import ipaddress
+from functools import lru_cache
 
 async def is_safe_url(url: str) -> bool:
     """
@@ -60,6 +61,12 @@ def is_safe_url_sync(url: str) -> bool:
     else:
         return asyncio.run(is_safe_url(url))
 
+
+# Special characters in Markdown V1 that need escaping, as a one-pass
+# str.translate table (cheaper than a regex substitution per call)
+_MARKDOWN_ESCAPE_TABLE = str.maketrans({c: '\\' + c for c in r'_*[]()~`>#+-=|{}.!'})
+
+
 def escape_markdown_v1(text: str) -> str:
     """
     Escape special characters for Telegram Markdown V1.
@@ -74,10 +81,7 @@ def escape_markdown_v1(text: str) -> str:
     if not text:
         return ""
         
-    # List of special characters in Markdown V1 that need escaping
-    escape_chars = r'_*[]()~`>#+-=|{}.!'
-    
-    return re.sub(f'([{re.escape(escape_chars)}])', r'\\\1', text)
+    return text.translate(_MARKDOWN_ESCAPE_TABLE)
 
 
 def sanitize_markdown_url(url: str) -> str:
@@ -100,6 +104,73 @@ def sanitize_markdown_url(url: str) -> str:
     return url
 
 
+def has_balanced_markdown_v1(text: str) -> bool:
+    """
+    Check that every Telegram Markdown V1 entity in text is closed.
+
+    Telegram rejects messages with an unterminated *bold*, _italic_, `code`
+    or [link](url). Callers use this to send such chunks as plain text
+    straight away instead of waiting for the API error and retrying.
+    Backslash-escaped characters are skipped, and entities do not nest.
+
+    Args:
+        text: Message text
+
+    Returns:
+        True if the text should parse as Markdown V1
+    """
+    if not text:
+        return True
+
+    open_entity = None  # '*', '_', '`', '```' or '['
+    i = 0
+    n = len(text)
+    while i < n:
+        ch = text[i]
+
+        if open_entity in ('`', '```'):
+            # Code spans end only at the matching fence
+            if text.startswith(open_entity, i):
+                i += len(open_entity)
+                open_entity = None
+            else:
+                i += 1
+            continue
+
+        if ch == '\\':
+            i += 2
+            continue
+
+        if open_entity == '[':
+            if ch == ']':
+                if not text.startswith('(', i + 1):
+                    return False
+                close = text.find(')', i + 2)
+                if close == -1:
+                    return False
+                i = close + 1
+                open_entity = None
+                continue
+        elif ch in '*_':
+            if open_entity is None:
+                open_entity = ch
+            elif open_entity == ch:
+                open_entity = None
+        elif open_entity is None:
+            if ch == '`':
+                open_entity = '```' if text.startswith('```', i) else '`'
+                i += len(open_entity)
+                continue
+            if ch == '[':
+                open_entity = '['
+        i += 1
+
+    return open_entity is None
+
+
+_MARKDOWN_LINK_RE = re.compile(r"(\[[^\]]+\]\()(https?://[^\)]+)")
+
+
 def sanitize_markdown_links(text: str) -> str:
     """
     Post-process text containing Markdown links and sanitize every URL.
@@ -112,13 +183,17 @@ def sanitize_markdown_links(text: str) -> str:
         url = match.group(2)
         return f"{prefix}{sanitize_markdown_url(url)})"
 
-    return re.sub(r"(\[[^\]]+\]\()(https?://[^\)]+)", _replace_link, text)
+    return _MARKDOWN_LINK_RE.sub(_replace_link, text)
 
 
+@lru_cache(maxsize=4096)
 def stable_hash(value: str) -> str:
     """
     Create a deterministic hash suitable for document IDs.
     
+    Memoized: the same URLs are hashed again and again (saved-list pages,
+    delete buttons, temp-URL keys), so repeat calls are a dict lookup.
+    
     Args:
         value: Input string
         
@@ -16,8 +16,11 @@ SYNONYMS = {
 }
 
 
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+
 def _tokenize(text: str) -> List[str]:
-    tokens = re.findall(r"[a-z0-9]{2,}", (text or "").lower())
+    tokens = _TOKEN_RE.findall((text or "").lower())
     return tokens
 
 
@@ -173,11 +173,10 @@ async def process_stalker_alerts(articles: List[Dict[str, Any]]) -> Dict[str, An
     if not db:
         return {'sent': 0}
 
-    from telegram import Bot
-    from .telegram_bot import get_bot_token
+    from .telegram_bot import get_broadcast_bot
     from .user_storage import get_user_language
 
-    bot = Bot(token=get_bot_token())
+    bot = get_broadcast_bot()
     sent = 0
     errors = []
 
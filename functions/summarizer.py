@@ -5,10 +5,12 @@ the tech news digest.
 """
 
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from openai import AsyncOpenAI
 import asyncio
+import weakref
+import httpx
 from .resilience import retry_with_backoff
 from .fallback_digest import create_simple_digest, create_raw_list
 
@@ -51,19 +53,69 @@ def get_chat_model() -> str:
     return DEFAULT_AI_MODELS[get_ai_provider()]
 
 
-def get_async_client() -> AsyncOpenAI:
-    """Get the configured Async API client."""
-    provider = get_ai_provider()
+# Shared API clients per event loop, then per provider. Reusing one client
+# keeps its httpx connection pool warm, so concurrent chats skip new TLS
+# handshakes. Keyed on the loop object itself (weakly): id() values are
+# reused, and a client must never outlive the loop its pool is bound to.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_async_client(provider: str) -> AsyncOpenAI:
+    """Build an Async API client for a provider with a pooled HTTP client."""
     if provider == "gemini":
         api_key = os.environ.get("GEMINI_API_KEY")
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set")
-        return AsyncOpenAI(api_key=api_key, base_url=GEMINI_BASE_URL)
+        base_url = GEMINI_BASE_URL
+    else:
+        api_key = os.environ.get("DEEPSEEK_API_KEY")
+        if not api_key:
+            raise ValueError("DEEPSEEK_API_KEY environment variable not set")
+        base_url = DEEPSEEK_BASE_URL
+
+    http_client = httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client)
+
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    Get the configured Async API client.
+    
+    The client is reused for the lifetime of the running event loop
+    (httpx connections cannot be shared across loops, and scheduled jobs
+    each run under their own event loop). close_async_clients() closes it.
+    """
+    provider = get_ai_provider()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return _build_async_client(provider)
 
-    api_key = os.environ.get("DEEPSEEK_API_KEY")
-    if not api_key:
-        raise ValueError("DEEPSEEK_API_KEY environment variable not set")
-    return AsyncOpenAI(api_key=api_key, base_url=DEEPSEEK_BASE_URL)
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(provider)
+    if client is None:
+        client = _build_async_client(provider)
+        clients[provider] = client
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close the API clients opened on the running event loop, if any."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    for client in _async_clients.pop(loop, {}).values():
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"Error closing AI client: {e}")
 
 
 async def chat_completion(
@@ -345,6 +397,25 @@ async def summarize_news(news_items: List[Dict[str, Any]], max_items: int = 30,
     """
     Summarize a list of news items into a formatted digest.
     Uses the configured AI provider with fallback to simple formatting if AI fails.
+    See summarize_news_with_status() for the arguments.
+    
+    Returns:
+        Formatted markdown digest for Telegram
+    """
+    digest, _ = await summarize_news_with_status(news_items, max_items=max_items, language=language)
+    return digest
+
+
+async def summarize_news_with_status(
+    news_items: List[Dict[str, Any]],
+    max_items: int = 30,
+    language: str = 'en',
+) -> Tuple[str, bool]:
+    """
+    Summarize news items, also reporting whether the AI wrote the digest.
+    
+    Callers that keep digests around (e.g. on disk) use the flag to avoid
+    persisting the non-AI fallback formatting.
     
     Now includes:
     - Smart deduplication (merges similar stories)
@@ -357,12 +428,13 @@ async def summarize_news(news_items: List[Dict[str, Any]], max_items: int = 30,
         language: Language code ('en', 'ru')
         
     Returns:
-        Formatted markdown digest for Telegram
+        (digest, ai_generated) - ai_generated is False for the empty-news
+        message and the simple/raw fallback digests
     """
     if not news_items:
         if language == 'ru':
-            return "📭 Сегодня новостей нет. Проверьте позже!"
-        return "📭 No tech news found today. Check back later!"
+            return "📭 Сегодня новостей нет. Проверьте позже!", False
+        return "📭 No tech news found today. Check back later!", False
     
     # Step 1: Deduplicate articles from different sources
     try:
@@ -375,9 +447,10 @@ async def summarize_news(news_items: List[Dict[str, Any]], max_items: int = 30,
     
     # Step 2: Cluster articles by topic
     try:
-        from .topic_clustering import cluster_articles, get_topic_counts
+        from .topic_clustering import cluster_articles
         clusters = cluster_articles(items_to_summarize)
-        topic_counts = get_topic_counts(items_to_summarize)
+        # Clusters are already sorted largest first; count them directly
+        topic_counts = {topic: len(articles) for topic, articles in clusters.items()}
         print(f"Clustered into topics: {list(topic_counts.keys())}")
     except Exception as e:
         print(f"Clustering failed: {e}")
@@ -407,16 +480,16 @@ async def summarize_news(news_items: List[Dict[str, Any]], max_items: int = 30,
     try:
         digest = await _ai_summarize(prompt_items, language)
         # Always prepend our own date header to ensure accuracy
-        return date_header + digest
+        return date_header + digest, True
     except Exception as e:
         print(f"AI summarization failed: {e}. Falling back to simple digest.")
         # Fallback to simple digest without AI
         try:
-            return date_header + create_simple_digest(prompt_items, language)
+            return date_header + create_simple_digest(prompt_items, language), False
         except Exception as e2:
             print(f"Simple digest failed: {e2}. Falling back to raw list.")
             # Last resort: raw list
-            return date_header + create_raw_list(prompt_items, language)
+            return date_header + create_raw_list(prompt_items, language), False
 
 
 @retry_with_backoff(max_retries=2, base_delay=1.0, max_delay=5.0)
@@ -5,8 +5,17 @@ Handles all Telegram bot interactions and commands.
 
 import os
 import re
+import sys
+import time
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import asyncio
+import weakref
 import urllib.parse
+from functools import lru_cache
+from typing import Optional
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, constants, InlineQueryResultArticle, InputTextMessageContent
@@ -20,10 +29,63 @@ from telegram.ext import (
     ContextTypes
 )
 
+from .translations import t
+from .resilience import AsyncRateLimiter
+from .user_storage import get_user_language
+from .message_utils import split_message, split_message_simple, iter_message_chunks, source_from_url
+from .security_utils import (
+    escape_markdown_v1,
+    sanitize_markdown_url,
+    sanitize_markdown_links,
+    has_balanced_markdown_v1,
+    stable_hash,
+    is_safe_url,
+)
+
 # Baku timezone (UTC+4)
 BAKU_TZ = timezone(timedelta(hours=4))
 PERSONALIZED_DIGEST_ITEM_LIMIT = 14
 
+logger = logging.getLogger(__name__)
+
+
+def _configure_queue_logging():
+    """
+    Emit this module's log records through a queue.
+    
+    Handlers enqueue records (an O(1) call) and a background listener
+    thread does the actual stdout write, so logging from a handler never
+    blocks the event loop on I/O.
+    """
+    if logger.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+_configure_queue_logging()
+
+# A message that is nothing but a single http(s) link
+_URL_MESSAGE_RE = re.compile(r'^https?://[^\s]+$')
+
+# HH:MM-HH:MM range accepted by /quiet_hours (compiled once, not per request)
+_QUIET_HOURS_RE = re.compile(r"^((?:[01]\d|2[0-3]):[0-5]\d)-((?:[01]\d|2[0-3]):[0-5]\d)$")
+
+# [title](url) links and bare URLs in digest Markdown (save-digest
+# fallback), found in one left-to-right pass. A link's URL is consumed by
+# the first branch, so the bare-URL branch never sees it again.
+_DIGEST_URL_RE = re.compile(
+    r'\[(?P<title>[^\]]+)\]\((?P<link_url>https?://[^)]+)\)'
+    r'|(?P<plain_url>https?://[^\s)\]]+)'
+)
+
 
 def get_bot_token() -> str:
     """Get Telegram bot token from environment."""
@@ -48,31 +110,77 @@ def get_admin_ids() -> set:
     return values
 
 
-def get_digest_reply_markup(digest_id: str, user_lang: str) -> InlineKeyboardMarkup:
-    """Build shared inline keyboard for digest actions."""
-    if user_lang == "ru":
-        refresh_label = "Обновить"
-        save_label = "Сохранить"
-        why_label = "Почему это важно"
-    else:
-        refresh_label = "Refresh"
-        save_label = "Save Digest"
-        why_label = "Why It Matters"
+def markdown_parse_mode(text: str) -> Optional[str]:
+    """
+    Pick the parse mode for a digest chunk.
+    
+    Chunks with unbalanced Markdown go out as plain text up front, rather
+    than costing a rejected request plus a plain-text retry.
+    """
+    return 'Markdown' if has_balanced_markdown_v1(text) else None
+
 
+def compute_digest_id(digest: str) -> str:
+    """
+    Short ID for a digest's action buttons and temp-digest record.
+    
+    Derived from the first 100 characters, so every send of the same digest
+    maps to the same ID (and the memoized stable_hash is hit again).
+    """
+    return stable_hash(digest[:100])[:8]
+
+
+@lru_cache(maxsize=256)
+def get_digest_reply_markup(digest_id: str, user_lang: str) -> InlineKeyboardMarkup:
+    """
+    Build shared inline keyboard for digest actions.
+    
+    Cached per (digest_id, language): cached-digest hits and repeat sends
+    of the same digest reuse one immutable markup.
+    """
     keyboard = [
         [
             InlineKeyboardButton("👍", callback_data=f"rate_up_{digest_id}"),
             InlineKeyboardButton("👎", callback_data=f"rate_down_{digest_id}"),
-            InlineKeyboardButton(refresh_label, callback_data="refresh_news"),
+            InlineKeyboardButton(t('btn_refresh', user_lang), callback_data="refresh_news"),
         ],
         [
-            InlineKeyboardButton(save_label, callback_data=f"save_digest_{digest_id}"),
-            InlineKeyboardButton(why_label, callback_data=f"why_digest_{digest_id}"),
+            InlineKeyboardButton(t('btn_save_digest', user_lang), callback_data=f"save_digest_{digest_id}"),
+            InlineKeyboardButton(t('btn_why_matters', user_lang), callback_data=f"why_digest_{digest_id}"),
         ]
     ]
     return InlineKeyboardMarkup(keyboard)
 
 
+def add_prediction_buttons(reply_markup: InlineKeyboardMarkup, telegram_id: int, articles: list) -> InlineKeyboardMarkup:
+    """
+    Append "save predicted article" rows to a digest keyboard.
+    
+    Scoring and storing predictions touch Firestore, so async callers run
+    this in a worker thread. On any error the keyboard is returned as is.
+    """
+    try:
+        from .predictive_bookmarking import predict_saves_for_user, store_predicted_articles
+        predicted = predict_saves_for_user(telegram_id, articles, top_n=2, threshold=0.35)
+        if not predicted:
+            return reply_markup
+        mapping = store_predicted_articles(predicted)
+        if not mapping:
+            return reply_markup
+
+        # Append prediction buttons as new rows
+        keyboard = list(reply_markup.inline_keyboard) if reply_markup else []
+        for url_hash, label in mapping.items():
+            keyboard.append([
+                InlineKeyboardButton(f"🔮 {label}", callback_data=f"predict_save_{url_hash}"),
+                InlineKeyboardButton("❌", callback_data=f"predict_ignore_{url_hash}")
+            ])
+        return InlineKeyboardMarkup(keyboard)
+    except Exception as e:
+        logger.warning("Predictive bookmarking error for %s: %s", telegram_id, e)
+        return reply_markup
+
+
 def _digest_action_texts(lang: str) -> dict:
     """Localized callback copy for digest action buttons."""
     if lang == 'ru':
@@ -110,27 +218,88 @@ def get_main_keyboard(lang: str = 'en'):
     return ReplyKeyboardRemove()
 
 
+# ============ BACKGROUND WRITES ============
+
+# Pending fire-and-forget storage writes (kept referenced until done),
+# one set per event loop (weakly keyed): each webhook update runs on its
+# own loop, and a loop can only wait on its own tasks
+_background_tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, set]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _on_background_task_done(task: asyncio.Task):
+    """Forget a finished background task and log its failure, if any."""
+    pending = _background_tasks.get(task.get_loop())
+    if pending is not None:
+        pending.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.warning("Background write failed: %s", task.exception())
+
+
+def run_in_background(func, *args, **kwargs) -> asyncio.Task:
+    """
+    Run a blocking storage call in a worker thread without awaiting it.
+    
+    Used for writes the reply does not depend on, so the user gets a
+    response before the database confirms. Call drain_background_tasks()
+    before the event loop ends so the writes are not cancelled.
+    
+    Args:
+        func: Blocking function to run
+        *args, **kwargs: Arguments for func
+        
+    Returns:
+        The scheduled task
+    """
+    task = asyncio.create_task(asyncio.to_thread(func, *args, **kwargs))
+    _background_tasks.setdefault(task.get_loop(), set()).add(task)
+    task.add_done_callback(_on_background_task_done)
+    return task
+
+
+async def run_blocking_parallel(*calls) -> list:
+    """
+    Run independent blocking storage reads concurrently in worker threads.
+    
+    A handler that needs, say, the user's language and their saved
+    articles waits for the slower of the two round-trips, not their sum.
+    
+    Args:
+        *calls: (func, *args) tuples
+        
+    Returns:
+        Results in the same order as calls; exceptions propagate
+    """
+    return await asyncio.gather(*(asyncio.to_thread(func, *args) for func, *args in calls))
+
+
+async def drain_background_tasks(timeout: float = 10.0):
+    """Wait (bounded) for the running loop's pending background writes."""
+    pending = _background_tasks.get(asyncio.get_running_loop())
+    if pending:
+        await asyncio.wait(list(pending), timeout=timeout)
+
+
 # ============ COMMAND HANDLERS ============
 
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command - welcome message."""
-    from .user_storage import get_user_language
-    from .translations import t
     
     user = update.effective_user
     telegram_id = user.id
     username = user.username or user.first_name
     user_lang = get_user_language(telegram_id)
     
-    # Try to register user in database (optional - may not work locally)
+    # Register user in the background (optional - may not work locally);
+    # the welcome reply does not depend on the write.
     try:
         from .database import create_or_update_user
-        create_or_update_user(telegram_id, username)
+        run_in_background(create_or_update_user, telegram_id, username)
     except Exception as e:
-        print(f"Database not available (running locally?): {e}")
+        logger.info("Database not available (running locally?): %s", e)
     
     # Escape username for Markdown
-    from .security_utils import escape_markdown_v1
     safe_username = escape_markdown_v1(username)
     
     welcome_message = t('welcome', user_lang, username=safe_username)
@@ -144,8 +313,6 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /help command."""
-    from .user_storage import get_user_language
-    from .translations import t
     
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -154,12 +321,85 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await reply_msg.reply_text(t('help_text', user_lang), parse_mode='Markdown')
 
 
+async def _fetch_news_for_sources(sources: frozenset) -> list:
+    """Fetch and URL-check the /news article pool for a set of sources."""
+    from .scrapers.hackernews import fetch_hackernews
+    from .scrapers.techcrunch import fetch_techcrunch_async
+    from .scrapers.ai_blogs import fetch_ai_blogs
+    from .scrapers.theverge import fetch_theverge_async
+    from .scrapers.github_trending import fetch_github_trending_async
+    from .scrapers.producthunt import fetch_producthunt_async
+    from .scrapers.http_client import get_shared_client
+    from .main import _fetch_safe_news
+
+    # All async scrapers share one keep-alive pool for this event loop
+    client = get_shared_client()
+
+    # Fetch news concurrently; each source is URL-checked as soon as it arrives
+    tasks = []
+    
+    if 'hackernews' in sources:
+        tasks.append(fetch_hackernews(15, client=client)) # Fetch more for variety
+    if 'techcrunch' in sources:
+        tasks.append(fetch_techcrunch_async(10, client=client))
+    if 'ai_blogs' in sources:
+        tasks.append(fetch_ai_blogs(5, client=client))
+    if 'theverge' in sources:
+        tasks.append(fetch_theverge_async(8, client=client))
+    if 'github' in sources:
+        tasks.append(fetch_github_trending_async(8, client=client))
+    if 'producthunt' in sources:
+        tasks.append(fetch_producthunt_async(8, client=client))
+        
+    results = await asyncio.gather(*(_fetch_safe_news(task) for task in tasks), return_exceptions=True)
+
+    all_news = []
+    for res in results:
+        if isinstance(res, list):
+            all_news.extend(res)
+        elif isinstance(res, Exception):
+            print(f"Error fetching news: {res}")
+    return all_news
+
+
+# In-flight /news fetches: event loop (weakly) -> {source set: task}. The
+# loop object is the key, not id(loop): ids are reused, and a new loop must
+# never await a task that belongs to a dead one.
+_inflight_news_fetches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def fetch_news_coalesced(sources) -> list:
+    """
+    Fetch the /news article pool, sharing one in-flight fetch per source set.
+    
+    When many users miss the cache at once, only the first starts the
+    scrapers; the rest await the same task. Fetches are only shared within
+    one event loop, so this helps a long-lived loop (polling mode); in
+    webhook mode each update runs on its own loop and never coalesces.
+    
+    Args:
+        sources: Enabled source keys
+        
+    Returns:
+        New list of URL-checked articles
+    """
+    key = frozenset(sources)
+    inflight = _inflight_news_fetches.setdefault(asyncio.get_running_loop(), {})
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_news_for_sources(key))
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # Shield so one cancelled waiter does not cancel the fetch for the others
+    return list(await asyncio.shield(task))
+
+
 async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /news command - fetch and send digest now."""
-    from .cache import get_cached_digest, set_cached_digest, get_digest_timestamp, is_digest_cached, build_digest_cache_key
+    from .cache import get_cached_digest_with_meta, set_cached_digest, build_digest_cache_key, get_digest_ttl_minutes
     from .rate_limiter import check_rate_limit
-    from .user_storage import get_user_language
-    from .translations import t
     
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -181,10 +421,9 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     cache_key = build_digest_cache_key(language=user_lang, sources=sources, scope='news')
     
     # Check cache first (no rate limit for cached responses)
-    if is_digest_cached(cache_key=cache_key):
-        cached_digest = get_cached_digest(cache_key=cache_key)
-        timestamp = get_digest_timestamp(cache_key=cache_key)
-        
+    cached_entry = get_cached_digest_with_meta(cache_key=cache_key)
+    if cached_entry:
+        cached_digest, timestamp = cached_entry
         
         # Format timestamp to Baku time
         timestamp_str = 'recently'
@@ -201,12 +440,9 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         header = t('cached_news', user_lang, timestamp=timestamp_str)
         
         # Generate digest ID for buttons
-        from .security_utils import stable_hash
-        digest_id = stable_hash(cached_digest[:100])[:8]
+        digest_id = compute_digest_id(cached_digest)
         reply_markup = get_digest_reply_markup(digest_id, user_lang)
         
-        from .message_utils import split_message
-        from .security_utils import sanitize_markdown_links
         chunks = split_message(header + cached_digest)
 
         for i, chunk in enumerate(chunks):
@@ -215,7 +451,7 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             try:
                 await update.message.reply_text(
                     safe_chunk,
-                    parse_mode='Markdown',
+                    parse_mode=markdown_parse_mode(safe_chunk),
                     disable_web_page_preview=True,
                     reply_markup=reply_markup if is_last else None
                 )
@@ -227,70 +463,33 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 )
         return
     
-    # Check if already generating using distributed lock
-    from .distributed_lock import is_locked
-    if is_locked('news_generation', telegram_id):
-        wait_text = "⏳ Дайджест уже генерируется, пожалуйста подождите..." if user_lang == 'ru' else "⏳ Digest is already being generated, please wait..."
-        await update.message.reply_text(wait_text)
-        return
-    
-    # Rate limit fresh requests
-    allowed, message = check_rate_limit(telegram_id, 'news')
-    if not allowed:
-        await update.message.reply_text(t('rate_limited', user_lang, seconds=message.split()[-2] if 'seconds' in message else '60'))
-        return
-    
-    # Acquire distributed lock
+    # Acquire the distributed lock first: its transaction doubles as the
+    # "already generating" check, so a held lock costs one round-trip and
+    # never consumes a rate-limit slot.
     from .distributed_lock import DistributedLock
     lock = DistributedLock('news_generation', telegram_id, ttl_seconds=300)
     
     if not lock.acquire():
         # Lock already held
-        wait_text = "⏳ Дайджест уже генерируется, пожалуйста подождите..." if user_lang == 'ru' else "⏳ Digest is already being generated, please wait..."
-        await update.message.reply_text(wait_text)
+        await update.message.reply_text(t('digest_in_progress', user_lang))
+        return
+    
+    # Rate limit fresh requests
+    allowed, retry_after = check_rate_limit(telegram_id, 'news')
+    if not allowed:
+        lock.release()
+        await update.message.reply_text(t('rate_limited', user_lang, seconds=retry_after))
         return
     
     # Send "typing" indicator after acquiring lock
     await update.message.reply_text(t('gathering_news', user_lang), parse_mode='Markdown')
     
     try:
-        from .scrapers.hackernews import fetch_hackernews
-        from .scrapers.techcrunch import fetch_techcrunch
-        from .scrapers.ai_blogs import fetch_ai_blogs
-        from .scrapers.theverge import fetch_theverge
-        from .scrapers.github_trending import fetch_github_trending
-        from .scrapers.producthunt import fetch_producthunt
         from .summarizer import summarize_news
         
         # Source list already resolved above (used in cache key as well).
-        
-        # Fetch news concurrently
-        tasks = []
-        
-        if 'hackernews' in sources:
-            tasks.append(fetch_hackernews(15)) # Fetch more for variety
-        if 'techcrunch' in sources:
-            tasks.append(asyncio.to_thread(fetch_techcrunch, 10))
-        if 'ai_blogs' in sources:
-            tasks.append(fetch_ai_blogs(5))
-        if 'theverge' in sources:
-            tasks.append(asyncio.to_thread(fetch_theverge, 8))
-        if 'github' in sources:
-            tasks.append(asyncio.to_thread(fetch_github_trending, 8))
-        if 'producthunt' in sources:
-            tasks.append(asyncio.to_thread(fetch_producthunt, 8))
-            
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        all_news = []
-        for res in results:
-            if isinstance(res, list):
-                all_news.extend(res)
-            elif isinstance(res, Exception):
-                print(f"Error fetching news: {res}")
-
-        from .main import _filter_safe_news
-        all_news = await _filter_safe_news(all_news)
+        # Concurrent misses for the same source set share one fetch.
+        all_news = await fetch_news_coalesced(sources)
 
         if not all_news:
             await update.message.reply_text(t('no_news', user_lang))
@@ -303,6 +502,12 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         digest = await summarize_news(items_to_summarize, language=user_lang)
         
+        # The post-digest Firestore writes below are collected into one
+        # WriteBatch and committed in a single round-trip before sending.
+        from .user_storage import get_firestore_client
+        db = get_firestore_client()
+        batch = db.batch() if db else None
+
         # Initialize refresh session
         try:
             from .user_storage import update_refresh_session, get_article_hash
@@ -310,16 +515,15 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             update_refresh_session(telegram_id, {
                 'attempts': 0,
                 'seen_hashes': seen_hashes
-            })
+            }, batch=batch)
         except Exception as e:
             print(f"Error init session: {e}")
         
-        # Cache digest variant for 15 minutes.
-        set_cached_digest(digest, ttl_minutes=15, cache_key=cache_key)
+        # Cache digest variant for as long as its fastest source stays fresh.
+        set_cached_digest(digest, ttl_minutes=get_digest_ttl_minutes(sources), cache_key=cache_key, batch=batch)
         
         # Generate unique digest ID for rating tracking
-        from .security_utils import stable_hash
-        digest_id = stable_hash(digest[:100])[:8]
+        digest_id = compute_digest_id(digest)
         
         # Store full digest + metadata for callback actions and personalization.
         try:
@@ -332,74 +536,60 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 articles_meta=items_to_summarize,
                 language=user_lang,
                 ttl_hours=24,
+                batch=batch,
             )
-            record_digest_context(digest_id, telegram_id, items_to_summarize)
+            record_digest_context(digest_id, telegram_id, items_to_summarize, batch=batch)
         except Exception as e:
             print(f"Error storing digest: {e}")
         
-        # Try to save digest to history (optional)
+        # Save digest to history off the reply path (optional)
         try:
             from .database import save_digest
-            save_digest(telegram_id, digest)
+            run_in_background(save_digest, telegram_id, digest)
         except Exception:
             pass
 
         # Mark articles as sent so breaking news won't repeat them
         try:
             from .breaking_news import record_sent_articles
-            record_sent_articles(telegram_id, items_to_summarize)
+            record_sent_articles(telegram_id, items_to_summarize, batch=batch)
         except Exception as e:
             print(f"Error recording sent articles for {telegram_id}: {e}")
 
-        # Send digest (split if too long for Telegram)
-        reply_markup = get_digest_reply_markup(digest_id, user_lang)
-
-        # Add predictive save buttons
-        try:
-            from .predictive_bookmarking import predict_saves_for_user, store_predicted_articles
-            predicted = predict_saves_for_user(telegram_id, items_to_summarize, top_n=2, threshold=0.35)
-            if predicted:
-                mapping = store_predicted_articles(predicted)
-                if mapping:
-                    pred_buttons = []
-                    for url_hash, label in mapping.items():
-                        pred_buttons.append([
-                            InlineKeyboardButton(f"🔮 {label}", callback_data=f"predict_save_{url_hash}"),
-                            InlineKeyboardButton("❌", callback_data=f"predict_ignore_{url_hash}")
-                        ])
-                    keyboard = list(reply_markup.inline_keyboard) if reply_markup else []
-                    for row in pred_buttons:
-                        keyboard.append(row)
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-        except Exception as e:
-            print(f"Predictive bookmarking error in news: {e}")
+        if batch is not None:
+            try:
+                await asyncio.to_thread(batch.commit)
+            except Exception as e:
+                print(f"Error committing digest writes for {telegram_id}: {e}")
+
+        # Send digest (split if too long for Telegram). Action buttons go on
+        # the last chunk only, so predictive save buttons are scored in a
+        # worker thread while the leading chunks are sent, in order.
+        markup_task = asyncio.create_task(asyncio.to_thread(
+            add_prediction_buttons,
+            get_digest_reply_markup(digest_id, user_lang),
+            telegram_id,
+            items_to_summarize,
+        ))
 
-        async def send_chunk(chunk, is_last=False):
-            from .security_utils import sanitize_markdown_links
-            safe_chunk = sanitize_markdown_links(chunk)
+        chunks = prepare_digest_chunks(digest)
+        last_index = len(chunks) - 1
+        for i, (safe_chunk, parse_mode) in enumerate(chunks):
+            chunk_markup = (await markup_task) if i == last_index else None
             try:
-                if is_last:
-                    # Add action buttons to the last chunk.
-                    await update.message.reply_text(
-                        safe_chunk,
-                        parse_mode='Markdown',
-                        disable_web_page_preview=True,
-                        reply_markup=reply_markup
-                    )
-                else:
-                    await update.message.reply_text(safe_chunk, parse_mode='Markdown', disable_web_page_preview=True)
+                await update.message.reply_text(
+                    safe_chunk,
+                    parse_mode=parse_mode,
+                    disable_web_page_preview=True,
+                    reply_markup=chunk_markup
+                )
             except Exception:
                 # Fallback: send without markdown parsing
-                if is_last:
-                    await update.message.reply_text(safe_chunk, disable_web_page_preview=True, reply_markup=reply_markup)
-                else:
-                    await update.message.reply_text(safe_chunk, disable_web_page_preview=True)
-        
-        # Smart message splitting to avoid breaking UTF-8, URLs, or markdown
-        from .message_utils import split_message
-        chunks = split_message(digest)
-        for i, chunk in enumerate(chunks):
-            await send_chunk(chunk, is_last=(i == len(chunks) - 1))
+                await update.message.reply_text(
+                    safe_chunk,
+                    disable_web_page_preview=True,
+                    reply_markup=chunk_markup
+                )
             
     except Exception as e:
         await update.message.reply_text(t('error_fetching', user_lang, error=str(e)[:100]))
@@ -407,10 +597,40 @@ async def news_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         lock.release()
 
 
+# Available times (top of each hour from 09:00 to 22:00)
+SCHEDULE_TIMES = ('09:00', '10:00', '11:00', '12:00', '13:00', '14:00',
+                  '15:00', '16:00', '17:00', '18:00', '19:00', '20:00', '21:00', '22:00')
+
+
+@lru_cache(maxsize=64)
+def get_schedule_reply_markup(user_lang: str, current_time: str = None) -> InlineKeyboardMarkup:
+    """
+    Build the /schedule time picker, memoized per (language, current time).
+    
+    Args:
+        user_lang: User language code
+        current_time: Currently scheduled time to mark, if any
+        
+    Returns:
+        InlineKeyboardMarkup with a 2-column time grid and a disable row
+    """
+    # Create button grid (2 columns)
+    keyboard = []
+    for i in range(0, len(SCHEDULE_TIMES), 2):
+        row = []
+        for time_str in SCHEDULE_TIMES[i:i + 2]:
+            check = "✓ " if time_str == current_time else ""
+            row.append(InlineKeyboardButton(f"{check}{time_str}", callback_data=f"schedule_{time_str}"))
+        keyboard.append(row)
+    
+    # Add disable option
+    keyboard.append([InlineKeyboardButton(t('btn_disable', user_lang), callback_data="schedule_disable")])
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
 async def schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /schedule command - show time picker buttons."""
-    from .user_storage import get_user_language
-    from .translations import t
     from .database import get_user
     
     telegram_id = update.effective_user.id
@@ -425,31 +645,11 @@ async def schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
     
-    # Available times (top of each hour from 09:00 to 22:00)
-    times = ['09:00', '10:00', '11:00', '12:00', '13:00', '14:00', 
-             '15:00', '16:00', '17:00', '18:00', '19:00', '20:00', '21:00', '22:00']
-    
-    # Create button grid (2 columns)
-    keyboard = []
-    for i in range(0, len(times), 2):
-        row = []
-        for j in range(2):
-            if i + j < len(times):
-                time = times[i + j]
-                check = "✓ " if time == current_time else ""
-                row.append(InlineKeyboardButton(f"{check}{time}", callback_data=f"schedule_{time}"))
-        keyboard.append(row)
-    
-    # Add disable option
-    disable_text = "🚫 Отключить" if user_lang == 'ru' else "🚫 Disable"
-    keyboard.append([InlineKeyboardButton(disable_text, callback_data="schedule_disable")])
-    
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = get_schedule_reply_markup(user_lang, current_time)
     
-    header = "⏰ *Выберите время для ежедневного дайджеста:*" if user_lang == 'ru' else "⏰ *Choose time for daily digest:*"
+    header = t('schedule_header', user_lang)
     if current_time:
-        current_text = f"\n\n_Текущее время: {current_time}_" if user_lang == 'ru' else f"\n\n_Current time: {current_time}_"
-        header += current_text
+        header += t('schedule_current_time', user_lang, time=current_time)
     
     reply_msg = update.message or update.callback_query.message
     await reply_msg.reply_text(
@@ -461,7 +661,6 @@ async def schedule_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def schedule_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle schedule time selection callback."""
-    from .user_storage import get_user_language
     from .database import create_or_update_user
     
     query = update.callback_query
@@ -479,8 +678,7 @@ async def schedule_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         except Exception:
             pass
         
-        msg = "✅ Ежедневный дайджест отключен." if user_lang == 'ru' else "✅ Daily digest disabled."
-        await query.edit_message_text(msg, parse_mode='Markdown')
+        await query.edit_message_text(t('schedule_disabled', user_lang), parse_mode='Markdown')
         return
     
     # Set the selected time
@@ -492,12 +690,7 @@ async def schedule_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text(f"Error: {e}")
         return
     
-    if user_lang == 'ru':
-        msg = f"✅ Ежедневный дайджест запланирован на *{selected_time}*!\n\nВы будете получать персональные новости технологий в это время каждый день."
-    else:
-        msg = f"✅ Daily digest scheduled for *{selected_time}*!\n\nYou will receive personalized tech news at this time every day."
-    
-    await query.edit_message_text(msg, parse_mode='Markdown')
+    await query.edit_message_text(t('schedule_set', user_lang, time=selected_time), parse_mode='Markdown')
 
 
 # Keep settime_command for backward compatibility with /settime command
@@ -506,10 +699,43 @@ async def settime_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await schedule_command(update, context)
 
 
+# Source toggles shown by /sources, in display order
+SOURCE_LABELS = (
+    ('hackernews', 'Hacker News'),
+    ('techcrunch', 'TechCrunch'),
+    ('ai_blogs', 'AI Blogs'),
+    ('theverge', 'The Verge'),
+    ('github', 'GitHub Trending'),
+    ('producthunt', 'Product Hunt'),
+)
+
+
+@lru_cache(maxsize=2 ** len(SOURCE_LABELS))
+def get_sources_reply_markup(enabled_sources: frozenset) -> InlineKeyboardMarkup:
+    """
+    Build the source toggle keyboard for a set of enabled sources.
+    
+    Only 2^6 on/off combinations exist, so each markup is built once and
+    reused by /sources and every toggle press.
+    
+    Args:
+        enabled_sources: Frozen set of enabled source keys
+        
+    Returns:
+        InlineKeyboardMarkup with one toggle row per source
+    """
+    keyboard = [
+        [InlineKeyboardButton(
+            f"{'✅' if key in enabled_sources else '❌'} {label}",
+            callback_data=f'toggle_{key}'
+        )]
+        for key, label in SOURCE_LABELS
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+
 async def sources_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /sources command - show source management."""
-    from .user_storage import get_user_language
-    from .translations import t
     
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -525,34 +751,7 @@ async def sources_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass  # Use defaults
     
-    # Create inline keyboard for toggling sources
-    keyboard = [
-        [InlineKeyboardButton(
-            f"{'✅' if 'hackernews' in sources else '❌'} Hacker News",
-            callback_data='toggle_hackernews'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'techcrunch' in sources else '❌'} TechCrunch",
-            callback_data='toggle_techcrunch'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'ai_blogs' in sources else '❌'} AI Blogs",
-            callback_data='toggle_ai_blogs'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'theverge' in sources else '❌'} The Verge",
-            callback_data='toggle_theverge'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'github' in sources else '❌'} GitHub Trending",
-            callback_data='toggle_github'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'producthunt' in sources else '❌'} Product Hunt",
-            callback_data='toggle_producthunt'
-        )],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = get_sources_reply_markup(frozenset(sources))
     
     reply_msg = update.message or update.callback_query.message
     await reply_msg.reply_text(
@@ -565,8 +764,6 @@ async def sources_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def toggle_source_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle source toggle button presses."""
     from .database import toggle_user_source
-    from .user_storage import get_user_language
-    from .translations import t
     
     query = update.callback_query
     await query.answer()
@@ -579,33 +776,7 @@ async def toggle_source_callback(update: Update, context: ContextTypes.DEFAULT_T
     new_sources = toggle_user_source(telegram_id, source)
     
     # Update keyboard
-    keyboard = [
-        [InlineKeyboardButton(
-            f"{'✅' if 'hackernews' in new_sources else '❌'} Hacker News",
-            callback_data='toggle_hackernews'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'techcrunch' in new_sources else '❌'} TechCrunch",
-            callback_data='toggle_techcrunch'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'ai_blogs' in new_sources else '❌'} AI Blogs",
-            callback_data='toggle_ai_blogs'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'theverge' in new_sources else '❌'} The Verge",
-            callback_data='toggle_theverge'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'github' in new_sources else '❌'} GitHub Trending",
-            callback_data='toggle_github'
-        )],
-        [InlineKeyboardButton(
-            f"{'✅' if 'producthunt' in new_sources else '❌'} Product Hunt",
-            callback_data='toggle_producthunt'
-        )],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = get_sources_reply_markup(frozenset(new_sources))
     
     await query.edit_message_text(
         t('sources_header', user_lang),
@@ -616,19 +787,20 @@ async def toggle_source_callback(update: Update, context: ContextTypes.DEFAULT_T
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /status command - show current settings."""
-    from .user_storage import get_user_language
-    from .translations import t
     
     telegram_id = update.effective_user.id
-    user_lang = get_user_language(telegram_id)
     
-    # Try to get user from database
-    user = None
-    try:
-        from .database import get_user
-        user = get_user(telegram_id)
-    except Exception:
-        pass  # Database not available
+    def _load_user():
+        try:
+            from .database import get_user
+            return get_user(telegram_id)
+        except Exception:
+            return None  # Database not available
+    
+    user_lang, user = await run_blocking_parallel(
+        (get_user_language, telegram_id),
+        (_load_user,),
+    )
     
     if not user:
         # Show default settings for local mode
@@ -647,7 +819,7 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     sources_text = '\n'.join([f"  вЂў {source_names.get(s, s)}" for s in sources])
     if not sources:
-        sources_text = '  No sources selected' if user_lang == 'en' else '  Нет выбранных источников'
+        sources_text = t('status_no_sources', user_lang)
 
     quiet_hours = user.get('quiet_hours')
     if quiet_hours and quiet_hours.get('start') and quiet_hours.get('end'):
@@ -666,19 +838,19 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     keyboard = [
         [
-            InlineKeyboardButton("⚙️ Sources" if user_lang == 'en' else "⚙️ Источники", callback_data='manage_sources'),
-            InlineKeyboardButton("⏰ Schedule" if user_lang == 'en' else "⏰ Расписание", callback_data='manage_schedule')
+            InlineKeyboardButton(t('btn_sources', user_lang), callback_data='manage_sources'),
+            InlineKeyboardButton(t('btn_schedule', user_lang), callback_data='manage_schedule')
         ],
         [
-            InlineKeyboardButton("🌍 Timezone" if user_lang == 'en' else "🌍 Часовой пояс", callback_data='manage_timezone'),
-            InlineKeyboardButton("🌐 Language" if user_lang == 'en' else "🌐 Язык", callback_data='manage_language')
+            InlineKeyboardButton(t('btn_timezone', user_lang), callback_data='manage_timezone'),
+            InlineKeyboardButton(t('btn_language', user_lang), callback_data='manage_language')
         ],
         [
-            InlineKeyboardButton("🌙 Quiet Hours" if user_lang == 'en' else "🌙 Тихие часы", callback_data='manage_quiet_hours'),
-            InlineKeyboardButton("🚨 Breaking News" if user_lang == 'en' else "🚨 Молнии", callback_data='manage_breaking')
+            InlineKeyboardButton(t('btn_quiet_hours', user_lang), callback_data='manage_quiet_hours'),
+            InlineKeyboardButton(t('btn_breaking_news', user_lang), callback_data='manage_breaking')
         ],
         [
-            InlineKeyboardButton("📊 Reading Stats" if user_lang == 'en' else "📊 Статистика", callback_data='manage_stats')
+            InlineKeyboardButton(t('btn_reading_stats', user_lang), callback_data='manage_stats')
         ]
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
@@ -692,14 +864,21 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 # ============ SAVED ARTICLES ============
 
+# Saved-article categories in display order, with their list emoji
+CATEGORY_EMOJI = {
+    'ai': '🤖', 'security': '🔒', 'crypto': '💰', 'startups': '🚀',
+    'hardware': '💻', 'software': '📱', 'tech': '🔧'
+}
+VALID_CATEGORIES = frozenset(CATEGORY_EMOJI)
+
+
 async def _render_saved_page(update_or_query, telegram_id: int, user_lang: str, page: int, is_callback: bool = False):
-    from .user_storage import get_saved_articles
-    from .translations import t
+    from .user_storage import get_saved_articles, SAVED_LIST_FIELDS
     
     limit = 10
     offset = page * limit
     # Fetch limit + 1 to check if there is a next page
-    articles = get_saved_articles(telegram_id, limit=limit + 1, offset=offset)
+    articles = get_saved_articles(telegram_id, limit=limit + 1, offset=offset, fields=SAVED_LIST_FIELDS)
     
     has_next = len(articles) > limit
     articles = articles[:limit]
@@ -716,15 +895,11 @@ async def _render_saved_page(update_or_query, telegram_id: int, user_lang: str,
         await update_or_query.answer("No more articles.", show_alert=True)
         return
 
-    cat_emoji = {
-        'ai': '🤖', 'security': '🔒', 'crypto': '💰', 'startups': '🚀',
-        'hardware': '💻', 'software': '📱', 'tech': '🔧'
-    }
-    
-    message = t('saved_header', user_lang)
+    header = t('saved_header', user_lang)
     if page > 0:
         # Append page info safely preserving any whitespace
-        message = message.rstrip() + f" (Page {page + 1})\n\n"
+        header = header.rstrip() + f" (Page {page + 1})\n\n"
+    parts = [header]
 
     keyboard = []
     
@@ -735,26 +910,24 @@ async def _render_saved_page(update_or_query, telegram_id: int, user_lang: str,
         saved_at = article.get('saved_at', '')
         is_read = article.get('is_read', False)
         
-        emoji = '✅' if is_read else cat_emoji.get(category, '🔧')
+        emoji = '✅' if is_read else CATEGORY_EMOJI.get(category, '🔧')
         date_str = saved_at[:10] if saved_at else ''
         
-        from .security_utils import escape_markdown_v1, sanitize_markdown_url
         safe_title = escape_markdown_v1(title)
         safe_url = sanitize_markdown_url(url)
 
         item_num = offset + i
 
         if safe_url.startswith('http'):
-            message += f"{item_num}. {emoji} [{safe_title}]({safe_url})"
+            parts.append(f"{item_num}. {emoji} [{safe_title}]({safe_url})")
         else:
-            message += f"{item_num}. {emoji} {safe_title}"
+            parts.append(f"{item_num}. {emoji} {safe_title}")
         
         if date_str:
-            message += f" `{date_str}`"
-        message += "\n"
+            parts.append(f" `{date_str}`")
+        parts.append("\n")
         
         # Create delete button - use URL hash for unique ID
-        from .security_utils import stable_hash
         url_hash = stable_hash(url)[:8]
         delete_label = "🗑️"
         # encode page in callback data so delete button can refresh the correct page
@@ -765,16 +938,15 @@ async def _render_saved_page(update_or_query, telegram_id: int, user_lang: str,
             InlineKeyboardButton(f"{delete_label} {item_num}. {title[:15]}...", callback_data=f"del_{url_hash}_{page}")
         ])
     
-    message += t('saved_footer', user_lang)
+    parts.append(t('saved_footer', user_lang))
+    message = ''.join(parts)
 
     # Add pagination buttons
     nav_buttons = []
     if page > 0:
-        prev_text = "⬅️ Назад" if user_lang == 'ru' else "⬅️ Previous"
-        nav_buttons.append(InlineKeyboardButton(prev_text, callback_data=f"saved_page_{page-1}"))
+        nav_buttons.append(InlineKeyboardButton(t('btn_prev_page', user_lang), callback_data=f"saved_page_{page-1}"))
     if has_next:
-        next_text = "Вперед ➡️" if user_lang == 'ru' else "Next ➡️"
-        nav_buttons.append(InlineKeyboardButton(next_text, callback_data=f"saved_page_{page+1}"))
+        nav_buttons.append(InlineKeyboardButton(t('btn_next_page', user_lang), callback_data=f"saved_page_{page+1}"))
 
     if nav_buttons:
         keyboard.append(nav_buttons)
@@ -816,7 +988,6 @@ async def saved_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
     query = update.callback_query
     await query.answer()
     telegram_id = update.effective_user.id
-    from .user_storage import get_user_language
     user_lang = get_user_language(telegram_id)
 
     data = query.data
@@ -827,7 +998,6 @@ async def saved_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 async def saved_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /saved command - show saved articles with delete buttons."""
-    from .user_storage import get_user_language
 
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -837,9 +1007,7 @@ async def saved_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def save_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /save command - save an article."""
-    from .user_storage import save_article, get_user_language, categorize_article
-    from .translations import t
-    import re
+    from .user_storage import save_article, categorize_article
 
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -871,7 +1039,7 @@ async def save_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     url_to_save = urls[0]['url']
                     title_to_save = urls[0]['title']
                 else:
-                    msg = "Please specify which link to save by providing its number. Example: `/save 2`" if user_lang == 'en' else "Пожалуйста, укажите номер ссылки для сохранения. Пример: `/save 2`"
+                    msg = t('save_pick_link', user_lang)
                     await update.message.reply_text(msg, parse_mode='Markdown')
                     return
             else:
@@ -882,7 +1050,7 @@ async def save_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                         url_to_save = urls[idx]['url']
                         title_to_save = urls[idx]['title']
                     else:
-                        msg = f"Invalid link number. The message contains {len(urls)} links." if user_lang == 'en' else f"Неверный номер ссылки. Сообщение содержит {len(urls)} ссылок."
+                        msg = t('save_invalid_link_number', user_lang, count=len(urls))
                         await update.message.reply_text(msg)
                         return
 
@@ -894,7 +1062,7 @@ async def save_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
         arg = context.args[0]
         if not arg.startswith('http://') and not arg.startswith('https://'):
-            msg = "Please provide a valid URL starting with http:// or https://" if user_lang == 'en' else "Пожалуйста, укажите корректную ссылку, начинающуюся с http:// или https://"
+            msg = t('save_invalid_url', user_lang)
             await update.message.reply_text(msg)
             return
 
@@ -914,14 +1082,13 @@ async def save_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if save_article(telegram_id, title, url_to_save, category=category):
         cat_label = t(f'cat_{category}', user_lang)
 
-        from .security_utils import stable_hash
         from .user_storage import save_temp_url
         url_hash = stable_hash(url_to_save)[:8]
         save_temp_url(url_hash, telegram_id, url_to_save)
 
         read_label = t('btn_read', user_lang)
         summarize_label = t('btn_summarize', user_lang)
-        del_label = "🗑️ " + ("Удалить" if user_lang == 'ru' else "Delete")
+        del_label = t('btn_delete', user_lang)
         reply_markup = InlineKeyboardMarkup([
             [
                 InlineKeyboardButton(f"📖 {read_label}", callback_data=f"read_url_{url_hash}"),
@@ -946,7 +1113,6 @@ async def save_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def _do_export(message_obj, telegram_id: int, user_lang: str, export_format: str, category_filter: str):
     """Internal helper to process the export of saved articles."""
-    from .translations import t
     from .user_storage import get_all_saved_articles
     import io
     import csv
@@ -1096,7 +1262,6 @@ async def _do_export(message_obj, telegram_id: int, user_lang: str, export_forma
 
 async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /export command - export saved articles as a Markdown or CSV file."""
-    from .user_storage import get_user_language
 
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -1132,7 +1297,6 @@ async def export_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.message.delete()
         return
 
-    from .user_storage import get_user_language
 
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -1153,8 +1317,6 @@ async def clear_all_prompt_callback(update: Update, context: ContextTypes.DEFAUL
     query = update.callback_query
     await query.answer()
     telegram_id = update.effective_user.id
-    from .user_storage import get_user_language
-    from .translations import t
     user_lang = get_user_language(telegram_id)
 
     data = query.data
@@ -1178,8 +1340,7 @@ async def clear_all_confirm_callback(update: Update, context: ContextTypes.DEFAU
     query = update.callback_query
     await query.answer()
     telegram_id = update.effective_user.id
-    from .user_storage import clear_saved_articles, get_user_language
-    from .translations import t
+    from .user_storage import clear_saved_articles
 
     user_lang = get_user_language(telegram_id)
     clear_saved_articles(telegram_id)
@@ -1194,7 +1355,6 @@ async def clear_all_cancel_callback(update: Update, context: ContextTypes.DEFAUL
     query = update.callback_query
     await query.answer()
     telegram_id = update.effective_user.id
-    from .user_storage import get_user_language
 
     user_lang = get_user_language(telegram_id)
     data = query.data
@@ -1225,19 +1385,18 @@ async def clear_search_history_callback(update: Update, context: ContextTypes.DE
     await query.answer()
 
     telegram_id = update.effective_user.id
-    from .user_storage import clear_search_history, get_user_language
+    from .user_storage import clear_search_history
 
     clear_search_history(telegram_id)
     user_lang = get_user_language(telegram_id)
 
-    msg = "✅ История поиска очищена." if user_lang == 'ru' else "✅ Search history cleared."
+    msg = t('search_history_cleared', user_lang)
     await query.edit_message_text(msg, parse_mode='Markdown')
 
 
 async def save_search_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle save search button press."""
-    from .user_storage import get_user_language, save_article, categorize_article, get_temp_search_result
-    from .translations import t
+    from .user_storage import save_article, categorize_article, get_temp_search_result
 
     query = update.callback_query
 
@@ -1247,7 +1406,7 @@ async def save_search_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     data = query.data
     parts = data.split('_')
     if len(parts) < 3:
-        msg = "Неверный запрос" if user_lang == 'ru' else "Invalid request"
+        msg = t('invalid_request', user_lang)
         await query.answer(msg, show_alert=True)
         return
 
@@ -1255,7 +1414,7 @@ async def save_search_callback(update: Update, context: ContextTypes.DEFAULT_TYP
     search_data = get_temp_search_result(url_hash, telegram_id)
 
     if not search_data:
-        msg = "Ссылка устарела. Повторите поиск." if user_lang == 'ru' else "Link expired. Please search again."
+        msg = t('search_link_expired', user_lang)
         await query.answer(msg, show_alert=True)
         return
 
@@ -1277,8 +1436,7 @@ async def save_search_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 
 async def clear_saved_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /clear_saved and /clear commands."""
-    from .user_storage import clear_saved_articles, get_user_language
-    from .translations import t
+    from .user_storage import clear_saved_articles
     
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -1288,24 +1446,21 @@ async def clear_saved_command(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 async def filter_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /filter command - filter saved articles by category."""
-    from .user_storage import get_saved_articles, get_user_language
-    from .translations import t
+    from .user_storage import get_saved_articles, SAVED_LIST_FIELDS
     from telegram import InlineKeyboardButton, InlineKeyboardMarkup
     
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
     
-    valid_categories = ['ai', 'security', 'crypto', 'startups', 'hardware', 'software', 'tech']
-    
     reply_msg = update.message if update.message else update.callback_query.message
 
     if not context.args:
         keyboard = []
         row = []
-        for i, cat in enumerate(valid_categories):
+        for i, cat in enumerate(CATEGORY_EMOJI):
             cat_label = t(f'cat_{cat}', user_lang)
             row.append(InlineKeyboardButton(cat_label, callback_data=f"filter_cat_{cat}"))
-            if len(row) == 2 or i == len(valid_categories) - 1:
+            if len(row) == 2 or i == len(CATEGORY_EMOJI) - 1:
                 keyboard.append(row)
                 row = []
 
@@ -1325,14 +1480,14 @@ async def filter_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         else:
             await reply_msg.reply_text("❌ Category name too long.")
         return
-    if category not in valid_categories:
+    if category not in VALID_CATEGORIES:
         if update.callback_query:
             await update.callback_query.edit_message_text(t('filter_prompt', user_lang), parse_mode='Markdown')
         else:
             await reply_msg.reply_text(t('filter_prompt', user_lang), parse_mode='Markdown')
         return
     
-    articles = get_saved_articles(telegram_id, limit=20, category=category)
+    articles = get_saved_articles(telegram_id, limit=20, category=category, fields=SAVED_LIST_FIELDS)
     
     if not articles:
         cat_label = t(f'cat_{category}', user_lang)
@@ -1343,9 +1498,8 @@ async def filter_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     cat_label = t(f'cat_{category}', user_lang)
-    message = t('filter_results', user_lang, category=cat_label, count=len(articles))
+    parts = [t('filter_results', user_lang, category=cat_label, count=len(articles))]
     
-    from .security_utils import sanitize_markdown_url, stable_hash, escape_markdown_v1
     keyboard = []
     for i, article in enumerate(articles, 1):
         title = article.get('title', 'Untitled')[:50]
@@ -1353,9 +1507,9 @@ async def filter_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         raw_url = article.get('url', '')
         url = sanitize_markdown_url(raw_url)
         if url.startswith('http'):
-            message += f"{i}. [{safe_title}]({url})\n"
+            parts.append(f"{i}. [{safe_title}]({url})\n")
         else:
-            message += f"{i}. {safe_title}\n"
+            parts.append(f"{i}. {safe_title}\n")
 
         # Create read and summarize buttons for each item
         if url.startswith('http'):
@@ -1368,8 +1522,10 @@ async def filter_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 InlineKeyboardButton(f"↗️ {i}", url=f"https://t.me/share/url?url={urllib.parse.quote(url)}&text={urllib.parse.quote(title)}")
             ])
 
+    message = ''.join(parts)
+
     # Add a back button
-    keyboard.append([InlineKeyboardButton("⬅️ Back to Categories" if user_lang == 'en' else "⬅️ Назад к категориям", callback_data="filter_menu")])
+    keyboard.append([InlineKeyboardButton(t('btn_back_to_categories', user_lang), callback_data="filter_menu")])
     reply_markup = InlineKeyboardMarkup(keyboard)
     
     try:
@@ -1397,46 +1553,31 @@ async def filter_category_callback(update: Update, context: ContextTypes.DEFAULT
 
     await filter_command(update, context)
 
+
+# /recap covers articles saved within this window
+RECAP_WINDOW_SECONDS = 7 * 24 * 3600
+
+
 async def recap_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /recap command - show weekly summary of saved articles."""
-    from .user_storage import get_saved_articles, get_user_language
-    from .translations import t
-    from datetime import datetime, timedelta
+    from .user_storage import get_saved_articles_since
     
     telegram_id = update.effective_user.id
-    user_lang = get_user_language(telegram_id)
-    
-    # Get all saved articles
-    articles = get_saved_articles(telegram_id, limit=200)
-    
-    # Filter to last 7 days
-    week_ago = datetime.now() - timedelta(days=7)
-    weekly_articles = []
     
-    for article in articles:
-        saved_at = article.get('saved_at', '')
-        if saved_at:
-            try:
-                saved_date = datetime.fromisoformat(saved_at.replace('Z', '+00:00'))
-                if saved_date.replace(tzinfo=None) > week_ago:
-                    weekly_articles.append(article)
-            except Exception:
-                pass
+    # Articles saved in the last 7 days
+    week_ago = time.time() - RECAP_WINDOW_SECONDS
+    user_lang, weekly_articles = await run_blocking_parallel(
+        (get_user_language, telegram_id),
+        (get_saved_articles_since, telegram_id, week_ago, 200),
+    )
     
     if not weekly_articles:
         await update.message.reply_text(t('recap_empty', user_lang), parse_mode='Markdown')
         return
     
-    # Category emoji mapping
-    cat_emoji = {
-        'ai': '🤖', 'security': '🔒', 'crypto': '💰', 'startups': '🚀',
-        'hardware': '💻', 'software': '📱', 'tech': '🔧'
-    }
-    
-    message = t('recap_header', user_lang)
+    parts = [t('recap_header', user_lang)]
     
     # Show top 5 recent articles
-    from .security_utils import sanitize_markdown_url, stable_hash, escape_markdown_v1
     from telegram import InlineKeyboardButton, InlineKeyboardMarkup
     keyboard = []
 
@@ -1448,12 +1589,12 @@ async def recap_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         safe_title = escape_markdown_v1(title)
         url = sanitize_markdown_url(article.get('url', ''))
         category = article.get('category', 'tech')
-        emoji = cat_emoji.get(category, '🔧')
+        emoji = CATEGORY_EMOJI.get(category, '🔧')
 
         if url.startswith('http'):
-            message += f"{i}. {emoji} [{safe_title}]({url})\n"
+            parts.append(f"{i}. {emoji} [{safe_title}]({url})\n")
         else:
-            message += f"{i}. {emoji} {safe_title}\n"
+            parts.append(f"{i}. {emoji} {safe_title}\n")
 
         if url.startswith('http'):
             url_hash = stable_hash(article.get('url', ''))[:8]
@@ -1468,7 +1609,8 @@ async def recap_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
     
-    message += f"\n_Total: {len(weekly_articles)} articles this week_"
+    parts.append(f"\n_Total: {len(weekly_articles)} articles this week_")
+    message = ''.join(parts)
     
     try:
         await update.message.reply_text(message, parse_mode='Markdown', disable_web_page_preview=True, reply_markup=reply_markup)
@@ -1478,10 +1620,8 @@ async def recap_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def summarize_recap_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle summarize week button - generate AI digest of weekly saved articles."""
-    from .user_storage import get_saved_articles, get_user_language
-    from .translations import t
+    from .user_storage import get_saved_articles_since
     from .summarizer import summarize_news
-    from datetime import datetime, timedelta
 
     query = update.callback_query
     telegram_id = update.effective_user.id
@@ -1493,19 +1633,8 @@ async def summarize_recap_callback(update: Update, context: ContextTypes.DEFAULT
     loading_msg = await query.message.reply_text(t('summarizing_week', user_lang), parse_mode='Markdown')
 
     try:
-        articles = get_saved_articles(telegram_id, limit=200)
-        week_ago = datetime.now() - timedelta(days=7)
-        weekly_articles = []
-
-        for article in articles:
-            saved_at = article.get('saved_at', '')
-            if saved_at:
-                try:
-                    saved_date = datetime.fromisoformat(saved_at.replace('Z', '+00:00'))
-                    if saved_date.replace(tzinfo=None) > week_ago:
-                        weekly_articles.append(article)
-                except Exception:
-                    pass
+        week_ago = time.time() - RECAP_WINDOW_SECONDS
+        weekly_articles = get_saved_articles_since(telegram_id, week_ago, limit=200)
 
         if not weekly_articles:
             await loading_msg.edit_text(t('recap_empty', user_lang))
@@ -1514,15 +1643,13 @@ async def summarize_recap_callback(update: Update, context: ContextTypes.DEFAULT
         # Top 15 articles for the week
         digest = await summarize_news(weekly_articles[:15], language=user_lang)
 
-        from .message_utils import split_message
-        chunks = split_message(digest)
 
         # Delete loading message
         await loading_msg.delete()
 
-        for chunk in chunks:
+        for chunk in iter_message_chunks(digest):
             try:
-                await query.message.reply_text(chunk, parse_mode='Markdown', disable_web_page_preview=True)
+                await query.message.reply_text(chunk, parse_mode=markdown_parse_mode(chunk), disable_web_page_preview=True)
             except Exception:
                 await query.message.reply_text(chunk, disable_web_page_preview=True)
 
@@ -1532,8 +1659,6 @@ async def summarize_recap_callback(update: Update, context: ContextTypes.DEFAULT
 
 async def share_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle share button - show bot link to share."""
-    from .user_storage import get_user_language
-    from .translations import t
     
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -1544,7 +1669,6 @@ async def share_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def inline_query_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle inline queries to search and share saved articles."""
     from .user_storage import get_all_saved_articles
-    from .security_utils import escape_markdown_v1
     from .semantic_search import semantic_search_articles
 
     query = update.inline_query.query or ""
@@ -1588,14 +1712,13 @@ async def inline_query_handler(update: Update, context: ContextTypes.DEFAULT_TYP
 
 async def trends_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /trends command - show weekly topic trends."""
-    from .user_storage import get_user_language
     from .trend_analysis import format_trends_message
     
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
     
     # Show loading message
-    loading_text = "📊 Анализирую тренды..." if user_lang == 'ru' else "📊 Analyzing trends..."
+    loading_text = t('trends_loading', user_lang)
     await update.message.reply_text(loading_text)
     
     try:
@@ -1607,7 +1730,7 @@ async def trends_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
     except Exception as e:
         print(f"Error in trends command: {e}")
-        error_text = "❌ Ошибка при анализе трендов." if user_lang == 'ru' else "❌ Error analyzing trends."
+        error_text = t('trends_error', user_lang)
         await update.message.reply_text(error_text)
 
 
@@ -1660,7 +1783,7 @@ async def quiet_hours_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         await reply_msg.reply_text("Quiet hours disabled.")
         return
 
-    match = re.match(r"^([0-2]\d:[0-5]\d)-([0-2]\d:[0-5]\d)$", value)
+    match = _QUIET_HOURS_RE.match(value)
     if not match:
         await reply_msg.reply_text("Invalid format. Use /quiet_hours HH:MM-HH:MM (example: /quiet_hours 23:00-07:00)")
         return
@@ -1717,7 +1840,6 @@ async def semantic_search_command(update: Update, context: ContextTypes.DEFAULT_
     """Search saved articles using lightweight semantic scoring."""
     from .user_storage import get_saved_articles
     from .semantic_search import semantic_search_articles
-    from .security_utils import escape_markdown_v1
 
     telegram_id = update.effective_user.id
     if not context.args:
@@ -1736,7 +1858,6 @@ async def semantic_search_command(update: Update, context: ContextTypes.DEFAULT_
         return
 
     from telegram import InlineKeyboardMarkup, InlineKeyboardButton
-    from .security_utils import stable_hash
     from .user_storage import save_temp_url
 
     safe_query = escape_markdown_v1(query)
@@ -1784,7 +1905,7 @@ async def admin_status_command(update: Update, context: ContextTypes.DEFAULT_TYP
     from time import perf_counter
     from .observability import build_health_snapshot
     from .scrapers.hackernews import fetch_hackernews
-    from .scrapers.techcrunch import fetch_techcrunch
+    from .scrapers.techcrunch import fetch_techcrunch_async
     from .scrapers.ai_blogs import fetch_ai_blogs
 
     snapshot = build_health_snapshot()
@@ -1800,7 +1921,7 @@ async def admin_status_command(update: Update, context: ContextTypes.DEFAULT_TYP
 
     try:
         t0 = perf_counter()
-        tc = await asyncio.to_thread(fetch_techcrunch, 2)
+        tc = await fetch_techcrunch_async(2)
         probe_results.append(f"TechCrunch: {len(tc)} items in {perf_counter() - t0:.2f}s")
     except Exception as e:
         probe_results.append(f"TechCrunch: error {str(e)[:40]}")
@@ -1856,8 +1977,7 @@ async def manage_settings_callback(update: Update, context: ContextTypes.DEFAULT
 
 async def delete_article_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle delete article button press."""
-    from .user_storage import get_user_language, get_all_saved_articles, delete_saved_article
-    from .translations import t
+    from .user_storage import get_saved_article_by_hash, delete_saved_article
     
     query = update.callback_query
     
@@ -1887,16 +2007,12 @@ async def delete_article_callback(update: Update, context: ContextTypes.DEFAULT_
             page = int(parts[2])
     
     # Find the article with matching hash
-    from .security_utils import stable_hash
-    articles = get_all_saved_articles(telegram_id)
+    article = get_saved_article_by_hash(telegram_id, url_hash)
     article_title = ""
     
-    for article in articles:
-        article_hash = stable_hash(article.get('url', ''))[:8]
-        if article_hash == url_hash:
-            article_title = article.get('title', '')[:40]
-            delete_saved_article(telegram_id, article.get('url', ''))
-            break
+    if article:
+        article_title = article.get('title', '')[:40]
+        delete_saved_article(telegram_id, article.get('url', ''))
 
     if article_title:
         await query.answer(f"Deleted: {article_title}", show_alert=False)
@@ -1919,15 +2035,16 @@ async def delete_article_callback(update: Update, context: ContextTypes.DEFAULT_
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /stats command - show personalized reading statistics."""
-    from .user_storage import get_all_saved_articles, get_user_language
-    from .translations import t
+    from .user_storage import get_all_saved_articles
     from collections import Counter
 
     telegram_id = update.effective_user.id
-    user_lang = get_user_language(telegram_id)
     reply_msg = update.message if update.message else update.callback_query.message
 
-    articles = get_all_saved_articles(telegram_id)
+    user_lang, articles = await run_blocking_parallel(
+        (get_user_language, telegram_id),
+        (get_all_saved_articles, telegram_id),
+    )
     if not articles:
         await reply_msg.reply_text(t('stats_empty', user_lang), parse_mode='Markdown')
         return
@@ -1965,15 +2082,15 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def random_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /random command - get a random saved article."""
-    from .user_storage import get_all_saved_articles, get_user_language
-    from .translations import t
+    from .user_storage import get_all_saved_articles
     from telegram import InlineKeyboardMarkup, InlineKeyboardButton
     import random
 
     telegram_id = update.effective_user.id
-    user_lang = get_user_language(telegram_id)
-
-    articles = get_all_saved_articles(telegram_id)
+    user_lang, articles = await run_blocking_parallel(
+        (get_user_language, telegram_id),
+        (get_all_saved_articles, telegram_id),
+    )
 
     msg_obj = update.message if update.message else update.callback_query.message
 
@@ -1988,14 +2105,9 @@ async def random_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     category = article.get('category', 'tech')
     saved_at = article.get('saved_at', '')
 
-    cat_emoji = {
-        'ai': '🤖', 'security': '🔒', 'crypto': '💰', 'startups': '🚀',
-        'hardware': '💻', 'software': '📱', 'tech': '🔧'
-    }
-    emoji = cat_emoji.get(category, '🔧')
+    emoji = CATEGORY_EMOJI.get(category, '🔧')
     date_str = saved_at[:10] if saved_at else ''
 
-    from .security_utils import escape_markdown_v1, sanitize_markdown_url
     safe_title = escape_markdown_v1(title)
     safe_url = sanitize_markdown_url(url)
 
@@ -2009,7 +2121,6 @@ async def random_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if date_str:
         message += f" `{date_str}`"
 
-    from .security_utils import stable_hash
     url_hash = stable_hash(url)[:8]
 
     summarize_label = t('btn_summarize', user_lang)
@@ -2040,21 +2151,21 @@ async def random_next_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 
 async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /search command - search news by topic."""
-    from .scrapers.hackernews import fetch_hackernews_sync
-    from .scrapers.techcrunch import fetch_techcrunch
-    from .security_utils import escape_markdown_v1
-    from .user_storage import add_search_history, get_user_language, get_search_history
+    from .scrapers.hackernews import fetch_hackernews
+    from .scrapers.techcrunch import fetch_techcrunch_async
+    from .scrapers.fetch_cache import get_or_fetch
+    from .scrapers.http_client import get_shared_client
+    from .user_storage import add_search_history, get_search_history
     from .rate_limiter import check_rate_limit
-    from .translations import t
     
     reply_msg = update.message if update.message else update.callback_query.message
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
     
     # Rate limit check
-    allowed, message = check_rate_limit(telegram_id, 'search')
+    allowed, retry_after = check_rate_limit(telegram_id, 'search')
     if not allowed:
-        await reply_msg.reply_text(t('rate_limited', user_lang, seconds='60'))
+        await reply_msg.reply_text(t('rate_limited', user_lang, seconds=retry_after))
         return
     
     if not context.args:
@@ -2071,7 +2182,7 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             keyboard = []
             for query in unique_searches:
                 keyboard.append([InlineKeyboardButton(f"🔍 {query}", callback_data=f"search_history_{query[:45]}")])
-            keyboard.append([InlineKeyboardButton("🗑️ Clear History" if user_lang == 'en' else "🗑️ Очистить историю", callback_data="clear_search_history")])
+            keyboard.append([InlineKeyboardButton(t('btn_clear_history', user_lang), callback_data="clear_search_history")])
             reply_markup = InlineKeyboardMarkup(keyboard)
 
         await reply_msg.reply_text(
@@ -2105,7 +2216,6 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     add_search_history(telegram_id, query)
     
     # Escape query for display
-    from .security_utils import escape_markdown_v1
     safe_query = escape_markdown_v1(query)
     
     search_msg = t('searching', user_lang, query=safe_query)
@@ -2116,24 +2226,39 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await reply_msg.reply_text(search_msg, parse_mode='Markdown')
     
     try:
-        # Fetch news without blocking the event loop.
-        hn_task = asyncio.to_thread(fetch_hackernews_sync, 30)
-        tc_task = asyncio.to_thread(fetch_techcrunch, 20)
-        hn_results, tc_results = await asyncio.gather(hn_task, tc_task, return_exceptions=True)
+        # Fetch both sources concurrently on the shared pool. Recent
+        # scrapes are shared across users for a short window.
+        client = get_shared_client()
+        tasks = [
+            get_or_fetch('hackernews', 30, lambda: fetch_hackernews(30, client=client)),
+            get_or_fetch('techcrunch', 20, lambda: fetch_techcrunch_async(20, client=client)),
+        ]
+        fetched = await asyncio.gather(*tasks, return_exceptions=True)
 
         all_news = []
-        if isinstance(hn_results, list):
-            all_news.extend(hn_results)
-        if isinstance(tc_results, list):
-            all_news.extend(tc_results)
+        for res in fetched:
+            if isinstance(res, list):
+                all_news.extend(res)
+            elif isinstance(res, Exception):
+                print(f"Error fetching news in search: {res}")
         
-        # Filter by query and source
+        # Filter by query and source. A title matches if it contains any
+        # query word (the full query implies its first word). Plain substring
+        # tests beat a regex alternation on titles this short, and a
+        # single-word query needs just one. The pool is at most 50 articles
+        # from the last fetch, so a linear pass is cheaper than building a
+        # title index that would be thrown away with the next fetch.
+        query_words = tuple(dict.fromkeys(query_lower.split()))
+        single_word = query_words[0] if len(query_words) == 1 else None
         results = []
         for article in all_news:
             if source_filter and source_filter not in article.get('source', '').lower():
                 continue
-            title = article.get('title', '').lower()
-            if query_lower in title or any(word in title for word in query_lower.split()):
+            title = article.get('title_lc') or article.get('title', '').lower()
+            if single_word is not None:
+                if single_word in title:
+                    results.append(article)
+            elif any(word in title for word in query_words):
                 results.append(article)
         
         if not results:
@@ -2147,7 +2272,6 @@ async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         message = t('search_results', user_lang, query=safe_query, count=len(results))
 
         from .user_storage import save_temp_search_result
-        from .security_utils import stable_hash
 
         keyboard = []
         buttons_row = []
@@ -2202,14 +2326,9 @@ LANGUAGES = {
     'ru': '🇷🇺 Русский'
 }
 
-async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handle /language command - change language."""
-    from .user_storage import get_user_language
-    from .translations import t
-    
-    telegram_id = update.effective_user.id
-    current_lang = get_user_language(telegram_id)
-    
+
+def _build_language_markup(current_lang: str) -> InlineKeyboardMarkup:
+    """Build the language picker with a checkmark on the current language."""
     keyboard = []
     for code, name in LANGUAGES.items():
         check = "✓ " if code == current_lang else ""
@@ -2218,7 +2337,22 @@ async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Azerbaijani - coming soon
     keyboard.append([InlineKeyboardButton("🇦🇿 Azərbaycan (Tezliklə)", callback_data="lang_coming_soon")])
     
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    return InlineKeyboardMarkup(keyboard)
+
+
+# One pre-built picker per selectable language, plus one without a
+# checkmark for users whose stored language is not selectable (e.g. 'az')
+LANGUAGE_MARKUPS = {code: _build_language_markup(code) for code in LANGUAGES}
+_UNSELECTED_LANGUAGE_MARKUP = _build_language_markup('')
+
+
+async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /language command - change language."""
+    
+    telegram_id = update.effective_user.id
+    current_lang = get_user_language(telegram_id)
+    
+    reply_markup = LANGUAGE_MARKUPS.get(current_lang, _UNSELECTED_LANGUAGE_MARKUP)
     
     reply_msg = update.message or update.callback_query.message
     await reply_msg.reply_text(
@@ -2230,8 +2364,7 @@ async def language_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def language_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle language selection callback."""
-    from .user_storage import set_user_language, get_user_language
-    from .translations import t
+    from .user_storage import set_user_language
     
     query = update.callback_query
     await query.answer()
@@ -2255,16 +2388,8 @@ async def language_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # Set the new language
     set_user_language(telegram_id, lang_code)
     
-    # Rebuild the keyboard with updated checkmark
-    keyboard = []
-    for code, name in LANGUAGES.items():
-        check = "✓ " if code == lang_code else ""
-        keyboard.append([InlineKeyboardButton(f"{check}{name}", callback_data=f"lang_{code}")])
-    
-    # Azerbaijani - coming soon
-    keyboard.append([InlineKeyboardButton("🇦🇿 Azərbaycan (Tezliklə)", callback_data="lang_coming_soon")])
-    
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    # Keyboard with the checkmark on the newly selected language
+    reply_markup = LANGUAGE_MARKUPS[lang_code]
     
     # Update the message with the new keyboard showing the checkmark on selected language
     await query.edit_message_text(
@@ -2285,7 +2410,7 @@ async def language_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def rating_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle digest rating button presses."""
-    from .user_storage import get_user_language, rate_article
+    from .user_storage import rate_article
     from .personalization import apply_digest_feedback
     query = update.callback_query
     telegram_id = update.effective_user.id
@@ -2295,9 +2420,10 @@ async def rating_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if len(parts) >= 3:
         rating_type = parts[1]  # 'up' or 'down'
         digest_id = parts[2]  # unique digest ID
-        # Store rating and update preference profile.
-        rate_article(telegram_id, f"digest_{digest_id}", rating_type)
-        apply_digest_feedback(telegram_id, digest_id, rating_type)
+        # Store rating and update preference profile without holding up
+        # the button response.
+        run_in_background(rate_article, telegram_id, f"digest_{digest_id}", rating_type)
+        run_in_background(apply_digest_feedback, telegram_id, digest_id, rating_type)
         if rating_type == 'up':
             emoji = "+"
             text = "Thanks for your feedback! Glad you liked it."
@@ -2315,9 +2441,8 @@ async def rating_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def refresh_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle refresh button press - fetch fresh news digest."""
-    from .user_storage import get_user_language, get_refresh_session, update_refresh_session, get_article_hash, save_temp_digest
-    from .translations import t
-    from .cache import clear_cached_digest, build_digest_cache_key, set_cached_digest
+    from .user_storage import get_refresh_session, update_refresh_session, get_article_hash, save_temp_digest
+    from .cache import clear_cached_digest, build_digest_cache_key, set_cached_digest, get_digest_ttl_minutes
     from .personalization import rank_articles_for_user, record_digest_context
     query = update.callback_query
     telegram_id = update.effective_user.id
@@ -2352,26 +2477,31 @@ async def refresh_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await query.message.reply_text(loading_text)
     try:
         from .scrapers.hackernews import fetch_hackernews
-        from .scrapers.techcrunch import fetch_techcrunch
+        from .scrapers.techcrunch import fetch_techcrunch_async
         from .scrapers.ai_blogs import fetch_ai_blogs
-        from .scrapers.theverge import fetch_theverge
-        from .scrapers.github_trending import fetch_github_trending
-        from .scrapers.producthunt import fetch_producthunt
+        from .scrapers.theverge import fetch_theverge_async
+        from .scrapers.github_trending import fetch_github_trending_async
+        from .scrapers.producthunt import fetch_producthunt_async
         from .summarizer import summarize_news
+        from .scrapers.http_client import get_shared_client
+        from .scrapers.fetch_cache import get_or_fetch
+        client = get_shared_client()
+        # Presses from different users within seconds reuse one scrape
         tasks = []
         if 'hackernews' in sources:
-            tasks.append(fetch_hackernews(20))
+            tasks.append(get_or_fetch('hackernews', 20, lambda: fetch_hackernews(20, client=client)))
         if 'techcrunch' in sources:
-            tasks.append(asyncio.to_thread(fetch_techcrunch, 15))
+            tasks.append(get_or_fetch('techcrunch', 15, lambda: fetch_techcrunch_async(15, client=client)))
         if 'ai_blogs' in sources:
-            tasks.append(fetch_ai_blogs(6))
+            tasks.append(get_or_fetch('ai_blogs', 6, lambda: fetch_ai_blogs(6, client=client)))
         if 'theverge' in sources:
-            tasks.append(asyncio.to_thread(fetch_theverge, 10))
+            tasks.append(get_or_fetch('theverge', 10, lambda: fetch_theverge_async(10, client=client)))
         if 'github' in sources:
-            tasks.append(asyncio.to_thread(fetch_github_trending, 10))
+            tasks.append(get_or_fetch('github', 10, lambda: fetch_github_trending_async(10, client=client)))
         if 'producthunt' in sources:
-            tasks.append(asyncio.to_thread(fetch_producthunt, 10))
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            tasks.append(get_or_fetch('producthunt', 10, lambda: fetch_producthunt_async(10, client=client)))
+        from .main import _fetch_safe_news
+        results = await asyncio.gather(*(_fetch_safe_news(task) for task in tasks), return_exceptions=True)
         all_news = []
         for res in results:
             if isinstance(res, list):
@@ -2379,9 +2509,6 @@ async def refresh_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             elif isinstance(res, Exception):
                 print(f"Error fetching news in refresh: {res}")
 
-        from .main import _filter_safe_news
-        all_news = await _filter_safe_news(all_news)
-
         if not all_news:
             error_text = "Could not fetch news."
             await query.message.reply_text(error_text)
@@ -2406,8 +2533,7 @@ async def refresh_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             'seen_hashes': list(new_seen)
         })
         digest = await summarize_news(items_to_summarize, language=user_lang)
-        from .security_utils import stable_hash
-        digest_id = stable_hash(digest[:100])[:8]
+        digest_id = compute_digest_id(digest)
         # Persist callback context.
         save_temp_digest(
             digest_id,
@@ -2427,62 +2553,36 @@ async def refresh_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             print(f"Error recording sent refresh articles for {telegram_id}: {e}")
 
         # Refresh cache with latest digest variant.
-        set_cached_digest(digest, ttl_minutes=15, cache_key=cache_key)
-        reply_markup = get_digest_reply_markup(digest_id, user_lang)
-
-        # Add predictive save buttons
-        try:
-            from .predictive_bookmarking import predict_saves_for_user, store_predicted_articles
-            predicted = predict_saves_for_user(telegram_id, items_to_summarize, top_n=2, threshold=0.35)
-            if predicted:
-                mapping = store_predicted_articles(predicted)
-                if mapping:
-                    pred_buttons = []
-                    for url_hash, label in mapping.items():
-                        pred_buttons.append([
-                            InlineKeyboardButton(f"🔮 {label}", callback_data=f"predict_save_{url_hash}"),
-                            InlineKeyboardButton("❌", callback_data=f"predict_ignore_{url_hash}")
-                        ])
-                    keyboard = list(reply_markup.inline_keyboard) if reply_markup else []
-                    for row in pred_buttons:
-                        keyboard.append(row)
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-        except Exception as e:
-            print(f"Predictive bookmarking error in refresh: {e}")
+        set_cached_digest(digest, ttl_minutes=get_digest_ttl_minutes(sources), cache_key=cache_key)
+        # As in /news: the first chunks go out while predictive save buttons
+        # are scored in a worker thread; only the last chunk waits for them.
+        # Chunks are still sent one by one, since Telegram does not
+        # guarantee order for concurrent sends.
+        markup_task = asyncio.create_task(asyncio.to_thread(
+            add_prediction_buttons,
+            get_digest_reply_markup(digest_id, user_lang),
+            telegram_id,
+            items_to_summarize,
+        ))
 
-        from .message_utils import split_message
-        from .security_utils import sanitize_markdown_links
-        chunks = split_message(digest)
-        try:
-            for i, chunk in enumerate(chunks):
-                safe_chunk = sanitize_markdown_links(chunk)
-                if i == len(chunks) - 1:
-                    await query.message.reply_text(
-                        safe_chunk,
-                        parse_mode='Markdown',
-                        disable_web_page_preview=True,
-                        reply_markup=reply_markup
-                    )
-                else:
-                    await query.message.reply_text(
-                        safe_chunk,
-                        parse_mode='Markdown',
-                        disable_web_page_preview=True
-                    )
-        except Exception:
-            for i, chunk in enumerate(chunks):
-                safe_chunk = sanitize_markdown_links(chunk)
-                if i == len(chunks) - 1:
-                    await query.message.reply_text(
-                        safe_chunk,
-                        disable_web_page_preview=True,
-                        reply_markup=reply_markup
-                    )
-                else:
-                    await query.message.reply_text(
-                        safe_chunk,
-                        disable_web_page_preview=True
-                    )
+        chunks = prepare_digest_chunks(digest)
+        last_index = len(chunks) - 1
+        for i, (safe_chunk, parse_mode) in enumerate(chunks):
+            chunk_markup = (await markup_task) if i == last_index else None
+            try:
+                await query.message.reply_text(
+                    safe_chunk,
+                    parse_mode=parse_mode,
+                    disable_web_page_preview=True,
+                    reply_markup=chunk_markup
+                )
+            except Exception:
+                # Fallback for this chunk only: send without markdown parsing
+                await query.message.reply_text(
+                    safe_chunk,
+                    disable_web_page_preview=True,
+                    reply_markup=chunk_markup
+                )
     except Exception as e:
         error_text = f"Error: {str(e)[:50]}"
         await query.message.reply_text(error_text)
@@ -2491,8 +2591,7 @@ async def refresh_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def save_digest_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle save digest button press - extract and save article URLs from digest context."""
-    from .user_storage import get_user_language, save_article, get_temp_digest
-    import re
+    from .user_storage import save_articles_batch, get_temp_digest
     query = update.callback_query
     telegram_id = update.effective_user.id
     user_lang = get_user_language(telegram_id)
@@ -2510,30 +2609,31 @@ async def save_digest_callback(update: Update, context: ContextTypes.DEFAULT_TYP
         return
     digest_content = digest_data.get('content', '')
     articles_meta = digest_data.get('articles_meta', [])
-    saved_count = 0
+    # Collect everything first, then save with one Firestore commit. URLs
+    # are deduplicated up front (digests often repeat a link), so repeats
+    # cost a set lookup and nothing else.
+    items = []
+    seen_urls = set()
     # Preferred path: use exact article metadata.
     for item in articles_meta:
-        title = (item.get('title') or item.get('url') or 'Untitled')[:100]
         url = item.get('url', '')
-        source = item.get('source', '')
-        if url and save_article(telegram_id, title, url, source):
-            saved_count += 1
+        if not url or url in seen_urls:
+            continue
+        seen_urls.add(url)
+        title = (item.get('title') or url)[:100]
+        items.append((title, url, item.get('source', '')))
     # Fallback parsing from markdown in case metadata is missing.
     if not articles_meta and digest_content:
-        url_pattern = r'\[([^\]]+)\]\((https?://[^)]+)\)'
-        matches = re.findall(url_pattern, digest_content)
-        plain_url_pattern = r'(?<!\()https?://[^\s\)\]]+'
-        plain_urls = re.findall(plain_url_pattern, digest_content)
-        for title, url in matches:
-            clean_title = title.strip()[:100]
-            if save_article(telegram_id, clean_title, url, ''):
-                saved_count += 1
-        for url in plain_urls:
-            if any(url in m[1] for m in matches):
+        fallback_title = f"Article {datetime.now().strftime('%Y-%m-%d')}"
+        for match in _DIGEST_URL_RE.finditer(digest_content):
+            url = match.group('link_url') or match.group('plain_url')
+            if url in seen_urls:
                 continue
-            title = f"Article {datetime.now().strftime('%Y-%m-%d')}"
-            if save_article(telegram_id, title, url, ''):
-                saved_count += 1
+            seen_urls.add(url)
+            # Bare URLs and blank anchors like [ ](url) get the generic title
+            title = (match.group('title') or '').strip()[:100] or fallback_title
+            items.append((title, url, source_from_url(url)))
+    saved_count = await asyncio.to_thread(save_articles_batch, telegram_id, items) if items else 0
     if saved_count > 0:
         text = texts['saved'].format(count=saved_count)
         await query.answer(text, show_alert=True)
@@ -2543,7 +2643,7 @@ async def save_digest_callback(update: Update, context: ContextTypes.DEFAULT_TYP
 
 async def why_digest_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Generate a quick \"why it matters\" explanation for a digest."""
-    from .user_storage import get_user_language, get_temp_digest, normalize_language_code
+    from .user_storage import get_temp_digest, normalize_language_code
     from .summarizer import generate_why_digest
     query = update.callback_query
     telegram_id = update.effective_user.id
@@ -2573,7 +2673,7 @@ async def why_digest_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
             language=reply_lang,
         )
         try:
-            await query.message.reply_text(answer, parse_mode='Markdown', disable_web_page_preview=True)
+            await query.message.reply_text(answer, parse_mode=markdown_parse_mode(answer), disable_web_page_preview=True)
         except Exception:
             await query.message.reply_text(answer, disable_web_page_preview=True)
     except Exception as e:
@@ -2582,12 +2682,9 @@ async def why_digest_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 async def summarize_url_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Summarize a saved URL."""
-    from .user_storage import get_user_language, get_temp_url
-    from .translations import t
+    from .user_storage import get_temp_url
     from .summarizer import chat_completion
-    from .security_utils import is_safe_url
     import httpx
-    import urllib.parse
     from bs4 import BeautifulSoup
 
     query = update.callback_query
@@ -2604,7 +2701,6 @@ async def summarize_url_callback(update: Update, context: ContextTypes.DEFAULT_T
 
     if not url:
         from .user_storage import get_all_saved_articles, save_temp_url, get_temp_search_result
-        from .security_utils import stable_hash
 
         articles = get_all_saved_articles(telegram_id)
         for article in articles:
@@ -2694,11 +2790,10 @@ async def summarize_url_callback(update: Update, context: ContextTypes.DEFAULT_T
         )
 
         # Send back summary
-        import urllib.parse
         encoded_url = urllib.parse.quote(url)
         share_url = f"https://t.me/share/url?url={encoded_url}"
 
-        del_label = "🗑️ " + ("Удалить" if user_lang == 'ru' else "Delete")
+        del_label = t('btn_delete', user_lang)
         keyboard = [
             [
                 InlineKeyboardButton("🌐 Original", url=url),
@@ -2726,11 +2821,8 @@ async def summarize_url_callback(update: Update, context: ContextTypes.DEFAULT_T
 
 async def similar_url_callback(update, context):
     """Find similar saved articles to a specific saved URL."""
-    from .user_storage import get_user_language, get_all_saved_articles
-    from .translations import t
-    from .security_utils import escape_markdown_v1, stable_hash, sanitize_markdown_url
+    from .user_storage import get_all_saved_articles
     from .semantic_search import semantic_search_articles
-    import urllib.parse
     from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
     query = update.callback_query
@@ -2811,11 +2903,8 @@ async def similar_url_callback(update, context):
 
 async def read_url_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Read a saved URL directly in Telegram."""
-    from .user_storage import get_user_language, get_temp_url
-    from .translations import t
-    from .security_utils import is_safe_url
+    from .user_storage import get_temp_url
     import httpx
-    import urllib.parse
     from bs4 import BeautifulSoup
 
     query = update.callback_query
@@ -2832,7 +2921,6 @@ async def read_url_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if not url:
         from .user_storage import get_all_saved_articles, get_temp_search_result
-        from .security_utils import stable_hash
 
         articles = get_all_saved_articles(telegram_id)
         for article in articles:
@@ -2890,27 +2978,24 @@ async def read_url_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             return
 
         # Use simple splitter to chunk the text and maintain readability
-        from .message_utils import split_message_simple
 
         # Add title if available
         title = ""
         word_count = len(text_content.split())
         read_time = max(1, word_count // 200)
-        read_time_str = f"~{read_time} мин" if user_lang == 'ru' else f"~{read_time} min"
+        read_time_str = t('read_time_minutes', user_lang, minutes=read_time)
 
         if soup.title and soup.title.string:
-            from .security_utils import escape_markdown_v1
             safe_title = escape_markdown_v1(soup.title.string.strip())
             title = f"**{safe_title}** ⏱ _{read_time_str}_\n\n"
 
         full_text = title + text_content
         chunks = split_message_simple(full_text, max_length=4000)
 
-        import urllib.parse
         encoded_url = urllib.parse.quote(url)
         share_url = f"https://t.me/share/url?url={encoded_url}"
 
-        del_label = "🗑️ " + ("Удалить" if user_lang == 'ru' else "Delete")
+        del_label = t('btn_delete', user_lang)
         keyboard = [
             [
                 InlineKeyboardButton("🌐 Original", url=url),
@@ -2924,18 +3009,13 @@ async def read_url_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
+        last_index = len(chunks) - 1
         for i, chunk in enumerate(chunks):
-            is_last = (i == len(chunks) - 1)
+            chunk_markup = reply_markup if i == last_index else None
             try:
-                if is_last:
-                    await query.message.reply_text(chunk, parse_mode='Markdown', disable_web_page_preview=True, reply_markup=reply_markup)
-                else:
-                    await query.message.reply_text(chunk, parse_mode='Markdown', disable_web_page_preview=True)
+                await query.message.reply_text(chunk, parse_mode=markdown_parse_mode(chunk), disable_web_page_preview=True, reply_markup=chunk_markup)
             except Exception:
-                if is_last:
-                    await query.message.reply_text(chunk, disable_web_page_preview=True, reply_markup=reply_markup)
-                else:
-                    await query.message.reply_text(chunk, disable_web_page_preview=True)
+                await query.message.reply_text(chunk, disable_web_page_preview=True, reply_markup=chunk_markup)
 
     except Exception as e:
         error_msg = str(e)[:80]
@@ -2948,10 +3028,69 @@ async def read_url_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 
+CHAT_SYSTEM_PROMPT = """You are a helpful tech news assistant.
+Users may ask you:
+- Questions about tech news, AI developments, or industry trends
+- To explain what a news item means
+- For more details about a technology or company
+- General tech questions
+
+Be concise, informative, and friendly. Use emojis sparingly.
+If the question is about a specific news item, provide context and explain its significance.
+Keep responses under 300 words unless more detail is needed."""
+
+CHAT_LANGUAGE_INSTRUCTIONS = {
+    'ru': " Respond in Russian.",
+    'az': " Respond in Azerbaijani.",
+}
+
+
+@lru_cache(maxsize=16)
+def get_chat_system_prompt(lang: str, date_str: str) -> str:
+    """
+    Get the AI chat system prompt for a language and date.
+    
+    The shared instructions come first and the date last, so every user's
+    prompt starts with the same prefix (friendly to provider-side prompt
+    caching) and each (language, date) pair is only built once.
+    
+    Args:
+        lang: User language code
+        date_str: Current date as YYYY-MM-DD
+        
+    Returns:
+        System prompt text
+    """
+    return f"{CHAT_SYSTEM_PROMPT}{CHAT_LANGUAGE_INSTRUCTIONS.get(lang, '')}\nCurrent Date: {date_str}"
+
+
+@lru_cache(maxsize=1)
+def _button_dispatch() -> dict:
+    """
+    Map legacy reply-keyboard labels (every language) to their handlers.
+
+    Built once on first use; clients that still show the old persistent
+    keyboard send these labels as plain text.
+    """
+    handlers = {
+        'btn_news': news_command,
+        'btn_search': search_command,
+        'btn_saved': saved_command,
+        'btn_status': status_command,
+        'btn_language': language_command,
+        'btn_settings': sources_command,
+        'btn_schedule': schedule_command,
+        'btn_help': help_command,
+    }
+    return {
+        t(key, lang): handler
+        for key, handler in handlers.items()
+        for lang in ('en', 'ru')
+    }
+
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle any text message - button presses or questions for the active AI model."""
-    from .user_storage import get_user_language
-    from .translations import t
     
     user_message = update.message.text
     telegram_id = update.effective_user.id
@@ -2966,20 +3105,18 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("❌ Message too long (max 1000 chars).")
         return
     
-    # Handle button presses - REMOVED (now using command menu only)
-    # The big persistent keyboard has been disabled, so these checks are no longer needed.
-    # Users should use the /slash commands from the menu.
+    # Labels from the retired persistent keyboard: one dict lookup routes
+    # them to their command instead of the AI chat
+    button_handler = _button_dispatch().get(user_message)
+    if button_handler is not None:
+        await button_handler(update, context)
+        return
     
-    import re
-    # Check if it's a URL to save
-    if re.match(r'^https?://[^\s]+$', user_message):
+    # Check if it's a URL to save (cheap prefix test first; most messages are questions)
+    if user_message.startswith(('http://', 'https://')) and _URL_MESSAGE_RE.match(user_message):
         from .user_storage import save_article, save_temp_url
-        from .security_utils import stable_hash, is_safe_url
         import httpx
         from bs4 import BeautifulSoup
-        import asyncio
-        import urllib.parse
-        from telegram import constants
 
         chat_id = update.effective_chat.id
         await context.bot.send_chat_action(chat_id=chat_id, action=constants.ChatAction.TYPING)
@@ -3043,9 +3180,9 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     from .rate_limiter import check_rate_limit
     
     # Rate limit AI chat
-    allowed, message = check_rate_limit(telegram_id, 'ai_chat')
+    allowed, retry_after = check_rate_limit(telegram_id, 'ai_chat')
     if not allowed:
-        await update.message.reply_text(t('rate_limited', user_lang, seconds='60'))
+        await update.message.reply_text(t('rate_limited', user_lang, seconds=retry_after))
         return
     
     reply_context = ""
@@ -3058,29 +3195,12 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.effective_chat.id
     await context.bot.send_chat_action(chat_id=chat_id, action=constants.ChatAction.TYPING)
     
-    lang_instruction = ""
-    if user_lang == 'ru':
-        lang_instruction = " Respond in Russian."
-    elif user_lang == 'az':
-        lang_instruction = " Respond in Azerbaijani."
+    system_prompt = get_chat_system_prompt(user_lang, datetime.now(BAKU_TZ).strftime('%Y-%m-%d'))
     
     try:
         answer = await chat_completion(
             messages=[
-                {
-                    "role": "system", 
-                    "content": f"""You are a helpful tech news assistant. 
-Current Date: {datetime.now(BAKU_TZ).strftime('%Y-%m-%d')}
-Users may ask you:
-- Questions about tech news, AI developments, or industry trends
-- To explain what a news item means
-- For more details about a technology or company
-- General tech questions
-
-Be concise, informative, and friendly. Use emojis sparingly. 
-If the question is about a specific news item, provide context and explain its significance.
-Keep responses under 300 words unless more detail is needed.{lang_instruction}"""
-                },
+                {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_message}
             ],
             temperature=0.7,
@@ -3088,18 +3208,13 @@ Keep responses under 300 words unless more detail is needed.{lang_instruction}""
             timeout=30.0,
         )
 
-        # Send answer (split if too long) with markdown error handling
-        async def send_answer(text):
+        # Send answer (split if too long). Unbalanced Markdown goes out as
+        # plain text up front; the fallback covers any other parse error.
+        for chunk in iter_message_chunks(answer):
             try:
-                await update.message.reply_text(text, parse_mode='Markdown', disable_web_page_preview=True)
+                await update.message.reply_text(chunk, parse_mode=markdown_parse_mode(chunk), disable_web_page_preview=True)
             except Exception:
-                await update.message.reply_text(text, disable_web_page_preview=True)
-        
-        # Smart message splitting to avoid breaking UTF-8, URLs, or markdown
-        from .message_utils import split_message
-        chunks = split_message(answer)
-        for chunk in chunks:
-            await send_answer(chunk)
+                await update.message.reply_text(chunk, disable_web_page_preview=True)
             
     except Exception as e:
         await update.message.reply_text(t('ai_error', user_lang, error=str(e)[:100]))
@@ -3109,8 +3224,6 @@ Keep responses under 300 words unless more detail is needed.{lang_instruction}""
 
 async def breaking_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /breaking command - toggle breaking news alerts."""
-    from .user_storage import get_user_language
-    from .translations import t
     from .breaking_news import get_user_breaking_news_preference, set_user_breaking_news_preference
 
     telegram_id = update.effective_user.id
@@ -3144,8 +3257,6 @@ async def breaking_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def stalk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /stalk command - add or list stalk targets."""
-    from .user_storage import get_user_language
-    from .translations import t
     from .stalker import add_stalk_target, list_stalk_targets
 
     telegram_id = update.effective_user.id
@@ -3164,14 +3275,13 @@ async def stalk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             emoji = '🏢' if ttype == 'company' else '🚀'
             lines.append(f"{emoji} {name}")
 
-        lines.append(f"\n_Удалить: /unstalk <name>_" if user_lang == 'ru' else f"\n_Remove: /unstalk <name>_")
+        lines.append(t('stalk_remove_hint', user_lang))
         await update.message.reply_text("\n".join(lines), parse_mode='Markdown')
         return
 
     arg = ' '.join(context.args).strip()
 
     if arg.lower().startswith('repo:'):
-        import re
         repo = arg[5:].strip()
         if not re.match(r'^[A-Za-z0-9\-]+/[A-Za-z0-9\-_.]+$', repo):
             await update.message.reply_text(t('stalk_invalid_repo', user_lang), parse_mode='Markdown')
@@ -3191,8 +3301,6 @@ async def stalk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def unstalk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /unstalk command - remove a stalk target."""
-    from .user_storage import get_user_language
-    from .translations import t
     from .stalker import remove_stalk_target
 
     telegram_id = update.effective_user.id
@@ -3200,7 +3308,7 @@ async def unstalk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if not context.args:
         await update.message.reply_text(
-            "Usage: /unstalk <name>" if user_lang == 'en' else "Использование: /unstalk <название>",
+            t('unstalk_usage', user_lang),
             parse_mode='Markdown'
         )
         return
@@ -3216,10 +3324,8 @@ async def unstalk_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def predict_save_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle predictive save button press."""
-    from .user_storage import get_user_language, save_article, categorize_article
-    from .translations import t
+    from .user_storage import save_article, categorize_article
     from .predictive_bookmarking import record_prediction_interaction
-    from .security_utils import stable_hash
 
     query = update.callback_query
     await query.answer()
@@ -3250,7 +3356,7 @@ async def predict_save_callback(update: Update, context: ContextTypes.DEFAULT_TY
             pass
 
     if not article:
-        await query.answer("Link expired" if user_lang == 'en' else "Ссылка устарела", show_alert=True)
+        await query.answer(t('link_expired', user_lang), show_alert=True)
         return
 
     title = article.get('title', 'Untitled')
@@ -3310,8 +3416,6 @@ async def predict_ignore_callback(update: Update, context: ContextTypes.DEFAULT_
 async def predict_done_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle clicking on the '✅ Saved' button gracefully."""
     query = update.callback_query
-    from .user_storage import get_user_language
-    from .translations import t
     user_lang = get_user_language(update.effective_user.id)
     await query.answer(t('article_exists', user_lang))
 
@@ -3528,22 +3632,224 @@ def create_bot_application() -> Application:
     return application
 
 
-async def send_digest_to_user(telegram_id: int, digest: str, articles_meta: list = None):
-    """Send a digest message to a specific user."""
+# Bots reused across broadcast sends, keyed (weakly) by the event loop that
+# created them: a Bot's httpx pool is bound to its loop, and scheduled jobs
+# each run under their own loop
+_broadcast_bots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_broadcast_bot():
+    """
+    Get a Bot shared by all sends on the current event loop.
+    
+    Broadcast jobs send to many users in a row; reusing one Bot keeps its
+    HTTP connection pool (and TLS sessions to api.telegram.org) alive
+    instead of opening a new client per user. close_broadcast_bot() shuts
+    it down before the loop ends.
+    
+    Returns:
+        telegram.Bot instance
+    """
     from telegram import Bot
-    from .user_storage import get_user_language, save_temp_digest
+    from telegram.request import HTTPXRequest
+
+    loop = asyncio.get_running_loop()
+    bot = _broadcast_bots.get(loop)
+    if bot is None:
+        request = HTTPXRequest(
+            connect_timeout=5.0,
+            read_timeout=20.0,
+            write_timeout=10.0,
+            pool_timeout=5.0,
+            connection_pool_size=64
+        )
+        bot = Bot(token=get_bot_token(), request=request)
+        _broadcast_bots[loop] = bot
+    return bot
+
+
+async def close_broadcast_bot() -> None:
+    """Shut down the broadcast Bot of the running event loop, if any."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    bot = _broadcast_bots.pop(loop, None)
+    if bot is not None:
+        try:
+            await bot.shutdown()
+            # shutdown() is a no-op for a Bot that was never initialize()d
+            # (sending does not require it), so close the send pool directly
+            await bot.request.shutdown()
+        except Exception as e:
+            logger.warning("Error closing broadcast bot: %s", e)
+
+
+@lru_cache(maxsize=16)
+def prepare_digest_chunks(digest: str) -> tuple:
+    """
+    Split a digest and sanitize each chunk, once per distinct digest.
+    
+    Every digest send path (/news, refresh, scheduled) goes through this.
+    A scheduled broadcast sends the same digest text to every user of a
+    language, so the split, link sanitizing and Markdown check are done
+    for the first user and reused for the rest.
+    
+    Returns:
+        Tuple of (chunk_text, parse_mode) pairs
+    """
+    # Smart message splitting to avoid breaking UTF-8, URLs, or markdown
+    prepared = []
+    for chunk in split_message(digest):
+        safe_chunk = sanitize_markdown_links(chunk)
+        prepared.append((safe_chunk, markdown_parse_mode(safe_chunk)))
+    return tuple(prepared)
+
+
+# Attempts per message when Telegram answers 429 (RetryAfter) during a broadcast
+SEND_MAX_ATTEMPTS = 3
+
+# Broadcast messages per second across all concurrent sends, under
+# Telegram's global ~30 messages/second per-bot limit
+BROADCAST_MESSAGES_PER_SECOND = 25
+_broadcast_rate_limiter = AsyncRateLimiter(BROADCAST_MESSAGES_PER_SECOND)
+
+
+async def send_message_with_retry(bot, method: str = 'send_message', **kwargs):
+    """
+    bot.send_message that paces broadcasts and waits out flood control.
+    
+    Every attempt first takes a slot from the shared broadcast rate
+    limiter (BROADCAST_MESSAGES_PER_SECOND across all concurrent sends).
+    If Telegram still answers RetryAfter we sleep for the advised time
+    (doubling it on each further attempt) and resend. Other errors, and
+    the last RetryAfter, propagate.
+    
+    Args:
+        bot: telegram.Bot to send with
+        method: Bot method to call, e.g. 'copy_message'
+        **kwargs: Arguments for the bot method
+        
+    Returns:
+        The sent telegram.Message (a MessageId for copy_message)
+    """
+    from telegram.error import RetryAfter
+
+    send = getattr(bot, method)
+    for attempt in range(SEND_MAX_ATTEMPTS):
+        await _broadcast_rate_limiter.acquire()
+        try:
+            return await send(**kwargs)
+        except RetryAfter as e:
+            if attempt == SEND_MAX_ATTEMPTS - 1:
+                raise
+            delay = e.retry_after
+            if isinstance(delay, timedelta):
+                delay = delay.total_seconds()
+            await asyncio.sleep(float(delay) * (2 ** attempt))
+
+
+# Broadcast sends in flight at once. This only bounds concurrency; the
+# message rate is capped by the shared limiter in send_message_with_retry.
+BROADCAST_CONCURRENCY = 25
+
+
+async def broadcast(user_ids, send_fn, concurrency: int = BROADCAST_CONCURRENCY) -> dict:
+    """
+    Run a send for every user, at most `concurrency` at a time.
+    
+    The pooled broadcast Bot is warmed up with get_me() first, so its first
+    connection (TCP + TLS) is open before the concurrent sends reuse it.
+    Every message the sends make waits for the broadcast rate limiter in
+    send_message_with_retry, keeping the total under Telegram's limit.
+    
+    Args:
+        user_ids: Telegram user IDs to send to
+        send_fn: Async callable taking a telegram_id and returning True
+            (sent), False (failed) or None (skipped); raising counts as failed
+        concurrency: Maximum sends in flight
+        
+    Returns:
+        Dict with 'sent', 'skipped' and 'failed' counts and the
+        'failed_ids' list
+    """
+    user_ids = list(user_ids)
+    result = {'sent': 0, 'skipped': 0, 'failed': 0, 'failed_ids': []}
+    if not user_ids:
+        return result
+
+    await get_broadcast_bot().get_me()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send_one(telegram_id) -> None:
+        async with semaphore:
+            try:
+                outcome = await send_fn(telegram_id)
+            except Exception as e:
+                logger.warning("Broadcast send to %s failed: %s", telegram_id, e)
+                outcome = False
+        if outcome is None:
+            result['skipped'] += 1
+        elif outcome:
+            result['sent'] += 1
+        else:
+            result['failed'] += 1
+            result['failed_ids'].append(telegram_id)
+
+    await asyncio.gather(*(send_one(telegram_id) for telegram_id in user_ids))
+    return result
+
+
+async def seed_digest(chat_id: int, digest: str) -> tuple:
+    """
+    Send a digest once to a seed chat so broadcasts can copy it.
+    
+    Args:
+        chat_id: Chat the bot can post to (e.g. an admin's private chat)
+        digest: Digest text
+        
+    Returns:
+        (chat_id, message_ids) to pass as send_digest_to_user(seed=...)
+    """
+    bot = get_broadcast_bot()
+    message_ids = []
+    for safe_chunk, parse_mode in prepare_digest_chunks(digest):
+        message = await send_message_with_retry(
+            bot,
+            chat_id=chat_id,
+            text=safe_chunk,
+            parse_mode=parse_mode,
+            disable_web_page_preview=True,
+        )
+        message_ids.append(message.message_id)
+    return chat_id, tuple(message_ids)
+
+
+async def send_digest_to_user(telegram_id: int, digest: str, articles_meta: list = None, seed: tuple = None):
+    """
+    Send a digest message to a specific user.
+    
+    With a seed from seed_digest(), each chunk is copied server-side from
+    the seed chat (copyMessage) instead of uploading the text again; the
+    buttons are still attached per user.
+    """
+    from .user_storage import save_temp_digest
     from .personalization import record_digest_context
-    from .security_utils import stable_hash
     
-    bot = Bot(token=get_bot_token())
+    bot = get_broadcast_bot()
     user_lang = get_user_language(telegram_id)
     
     # Generate digest ID for buttons
-    digest_id = stable_hash(digest[:100])[:8]
+    digest_id = compute_digest_id(digest)
     
     # Persist temp digest context so callbacks work for scheduled sends too.
+    # Broadcasts send to many users at once, so keep Firestore off the loop.
     try:
-        save_temp_digest(
+        await asyncio.to_thread(
+            save_temp_digest,
             digest_id,
             telegram_id,
             digest,
@@ -3552,70 +3858,53 @@ async def send_digest_to_user(telegram_id: int, digest: str, articles_meta: list
             ttl_hours=24,
         )
         if articles_meta:
-            record_digest_context(digest_id, telegram_id, articles_meta)
+            await asyncio.to_thread(record_digest_context, digest_id, telegram_id, articles_meta)
     except Exception as e:
-        print(f"Error storing scheduled digest context: {e}")
+        logger.warning("Error storing scheduled digest context: %s", e)
 
     reply_markup = get_digest_reply_markup(digest_id, user_lang)
 
     # Add predictive save buttons if we have article metadata
     if articles_meta:
-        try:
-            from .predictive_bookmarking import predict_saves_for_user, store_predicted_articles
-            predicted = predict_saves_for_user(telegram_id, articles_meta, top_n=2, threshold=0.35)
-            if predicted:
-                mapping = store_predicted_articles(predicted)
-                if mapping:
-                    pred_buttons = []
-                    for url_hash, label in mapping.items():
-                        pred_buttons.append([
-                            InlineKeyboardButton(f"🔮 {label}", callback_data=f"predict_save_{url_hash}"),
-                            InlineKeyboardButton("❌", callback_data=f"predict_ignore_{url_hash}")
-                        ])
-                    # Append prediction buttons as new rows
-                    keyboard = list(reply_markup.inline_keyboard) if reply_markup else []
-                    for row in pred_buttons:
-                        keyboard.append(row)
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-        except Exception as e:
-            print(f"Predictive bookmarking error: {e}")
+        reply_markup = await asyncio.to_thread(add_prediction_buttons, reply_markup, telegram_id, articles_meta)
 
     try:
-        # Smart message splitting to avoid breaking UTF-8, URLs, or markdown
-        from .message_utils import split_message
-        from .security_utils import sanitize_markdown_links
-        chunks = split_message(digest)
-
-        for i, chunk in enumerate(chunks):
-            safe_chunk = sanitize_markdown_links(chunk)
-            # Add buttons only to the last chunk
-            if i == len(chunks) - 1:
-                await bot.send_message(
+        if seed is not None:
+            from_chat_id, message_ids = seed
+            for i, message_id in enumerate(message_ids):
+                await send_message_with_retry(
+                    bot,
+                    method='copy_message',
                     chat_id=telegram_id,
-                    text=safe_chunk,
-                    parse_mode='Markdown',
-                    disable_web_page_preview=True,
-                    reply_markup=reply_markup
+                    from_chat_id=from_chat_id,
+                    message_id=message_id,
+                    reply_markup=reply_markup if i == len(message_ids) - 1 else None,
                 )
-            else:
-                await bot.send_message(
+        else:
+            chunks = prepare_digest_chunks(digest)
+
+            for i, (safe_chunk, parse_mode) in enumerate(chunks):
+                # Add buttons only to the last chunk
+                await send_message_with_retry(
+                    bot,
                     chat_id=telegram_id,
                     text=safe_chunk,
-                    parse_mode='Markdown',
-                    disable_web_page_preview=True
+                    parse_mode=parse_mode,
+                    disable_web_page_preview=True,
+                    reply_markup=reply_markup if i == len(chunks) - 1 else None,
                 )
 
         # Mark digest articles as "sent" so breaking news won't repeat them
         if articles_meta:
             try:
                 from .breaking_news import record_sent_articles
-                record_sent_articles(telegram_id, articles_meta)
+                await asyncio.to_thread(record_sent_articles, telegram_id, articles_meta)
             except Exception as e:
-                print(f"Error recording sent digest articles for {telegram_id}: {e}")
+                logger.warning("Error recording sent digest articles for %s: %s", telegram_id, e)
 
         return True
     except Exception as e:
-        print(f"Error sending to user {telegram_id}: {e}")
+        logger.error("Error sending to user %s: %s", telegram_id, e)
         return False
 
 
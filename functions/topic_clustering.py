@@ -3,60 +3,64 @@ Topic Clustering Module
 Automatically groups related news articles by topic.
 """
 
-from typing import Dict, List, Any
-from collections import defaultdict
+from typing import Dict, Iterable, List, Any, Tuple
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
 import re
+from urllib.parse import urlparse
 
 
-# Topic keywords for classification
+# Topic keywords for classification (lowercase). Tuples: the flattened
+# tables below and the extract_topic cache are built from these at import.
 TOPIC_KEYWORDS = {
-    'ai': [
+    'ai': (
         'ai', 'artificial intelligence', 'machine learning', 'ml', 'deep learning',
         'neural', 'gpt', 'llm', 'openai', 'anthropic', 'deepmind', 'mistral',
         'gemini', 'claude', 'chatgpt', 'transformer', 'diffusion', 'stable diffusion',
         'midjourney', 'copilot', 'llama', 'generative ai', 'foundation model',
         'language model', 'computer vision', 'nlp', 'agi', 'superintelligence'
-    ],
-    'security': [
+    ),
+    'security': (
         'security', 'hack', 'breach', 'vulnerability', 'cyber', 'malware',
         'ransomware', 'privacy', 'encryption', 'exploit', 'attack', 'phishing',
         'ddos', 'zero-day', 'password', 'authentication', 'firewall', 'vpn'
-    ],
-    'crypto': [
+    ),
+    'crypto': (
         'crypto', 'bitcoin', 'ethereum', 'blockchain', 'web3', 'nft', 'defi',
         'token', 'wallet', 'mining', 'solana', 'binance', 'coinbase', 'btc', 'eth'
-    ],
-    'startups': [
+    ),
+    'startups': (
         'startup', 'funding', 'series a', 'series b', 'series c', 'vc', 'venture',
         'unicorn', 'valuation', 'raised', 'investment', 'seed round', 'ipo',
         'acquisition', 'acquired', 'merger', 'y combinator', 'accelerator'
-    ],
-    'hardware': [
+    ),
+    'hardware': (
         'hardware', 'chip', 'cpu', 'gpu', 'nvidia', 'amd', 'intel', 'apple silicon',
         'processor', 'semiconductor', 'device', 'quantum', 'robotics', 'drone',
         'm4', 'snapdragon', 'arm', 'risc-v'
-    ],
-    'software': [
+    ),
+    'software': (
         'software', 'app', 'update', 'release', 'version', 'feature', 'tool',
         'platform', 'saas', 'api', 'sdk', 'framework', 'library', 'open source',
         'github', 'developer', 'programming', 'code'
-    ],
-    'big_tech': [
+    ),
+    'big_tech': (
         'google', 'apple', 'microsoft', 'amazon', 'meta', 'facebook', 'tesla',
         'netflix', 'twitter', 'x.com', 'tiktok', 'bytedance', 'spotify'
-    ],
-    'mobile': [
+    ),
+    'mobile': (
         'iphone', 'android', 'ios', 'samsung', 'pixel', 'mobile', 'smartphone',
         'tablet', 'ipad', 'wearable', 'smartwatch', 'airpods'
-    ],
-    'gaming': [
+    ),
+    'gaming': (
         'game', 'gaming', 'playstation', 'xbox', 'nintendo', 'steam', 'esports',
         'vr', 'virtual reality', 'ar', 'augmented reality', 'metaverse'
-    ],
-    'science': [
+    ),
+    'science': (
         'research', 'study', 'scientist', 'discovery', 'experiment', 'nasa',
         'space', 'rocket', 'satellite', 'mars', 'moon', 'climate', 'energy'
-    ]
+    )
 }
 
 # Topic display info with emojis
@@ -75,63 +79,147 @@ TOPIC_DISPLAY = {
 }
 
 
+# Flattened (keyword, topic index) pairs, built once so extract_topic makes
+# one pass over all keywords instead of a nested loop per topic. Each test is
+# a C-level `kw in text` over a title plus hostname (~100 chars), and repeats
+# hit the lru_cache, so a compiled (numba) kernel would not pay for the
+# extra dependency and cold-start JIT on Cloud Functions.
+_TOPICS = tuple(TOPIC_KEYWORDS)
+_KEYWORD_TABLE = tuple(
+    (kw, index)
+    for index, keywords in enumerate(TOPIC_KEYWORDS.values())
+    for kw in keywords
+)
+# Keywords that can earn the exact-word bonus: single words over 2 chars.
+# The bonus is one C-level frozenset intersection with the text's \w+
+# tokens, so each keyword counts once.
+_WORD_KEYWORD_TOPICS = {
+    kw: index for kw, index in _KEYWORD_TABLE
+    if len(kw) > 2 and re.fullmatch(r'\w+', kw)
+}
+_WORD_KEYWORDS = frozenset(_WORD_KEYWORD_TOPICS)
+_WORD_RE = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=2048)
+def _url_host(url: str) -> str:
+    """Lowercase hostname of a URL, or '' if it has none."""
+    try:
+        return urlparse(url).hostname or ''
+    except ValueError:
+        return ''
+
+
+def _topic_text(title: str, url: str) -> str:
+    """Lowercased text extract_topic scans: the title plus the URL hostname."""
+    return title.lower() + " " + _url_host(url) if url else title.lower()
+
+
+def leading_index(hits: Iterable[Tuple[int, int]], size: int) -> int:
+    """
+    Pick the label index with the highest total score.
+    
+    Args:
+        hits: (label index, points) pairs, e.g. one per matched keyword
+        size: Number of labels
+        
+    Returns:
+        Index of the leader (ties go to the lowest index), or -1 if
+        nothing scored
+    """
+    # Track the leader as scores accumulate instead of a max() pass after
+    scores = [0] * size
+    best = 0
+    best_index = -1
+    for index, points in hits:
+        score = scores[index] = scores[index] + points
+        if score > best or (score == best and index < best_index):
+            best, best_index = score, index
+    return best_index
+
+
+@lru_cache(maxsize=4096)
+def _score_text(text: str) -> str:
+    """
+    Pick the best-scoring topic for already-lowercased text.
+    
+    Memoized on the scanned text: the same articles are classified again
+    by clustering, trend counts, personalization and breaking-news checks.
+    """
+    # One point per keyword found anywhere in the text, plus a bonus of two
+    # for exact word matches (each keyword counts once). Ties go to the
+    # topic listed first in TOPIC_KEYWORDS.
+    hits = chain(
+        ((index, 1) for kw, index in _KEYWORD_TABLE if kw in text),
+        ((_WORD_KEYWORD_TOPICS[kw], 2)
+         for kw in _WORD_KEYWORDS.intersection(_WORD_RE.findall(text))),
+    )
+    best_index = leading_index(hits, len(_TOPICS))
+    
+    if best_index >= 0:
+        return _TOPICS[best_index]
+    return 'general'
+
+
 def extract_topic(title: str, url: str = "") -> str:
     """
     Extract the primary topic from an article title and URL.
     
     Args:
         title: Article title
-        url: Article URL (optional, used for additional context)
+        url: Article URL (optional; only its hostname is scanned, the
+            path and query are mostly slugs and tracking noise)
         
     Returns:
         Topic key (e.g., 'ai', 'security', 'crypto')
     """
-    text = (title + " " + url).lower()
-    
-    # Score each topic by keyword matches
-    scores = {}
-    for topic, keywords in TOPIC_KEYWORDS.items():
-        score = sum(1 for kw in keywords if kw in text)
-        # Bonus for exact word matches
-        words = set(re.findall(r'\b\w+\b', text))
-        score += sum(2 for kw in keywords if kw in words and len(kw) > 2)
-        if score > 0:
-            scores[topic] = score
-    
-    if scores:
-        return max(scores, key=scores.get)
-    return 'general'
+    return _score_text(_topic_text(title, url))
 
 
-def cluster_articles(articles: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+def cluster_articles(articles: List[Dict[str, Any]], inplace: bool = False) -> Dict[str, List[Dict[str, Any]]]:
     """
     Group articles by their primary topic.
     
     Args:
         articles: List of article dicts with 'title' and optionally 'url'
+        inplace: Also store the topic on each article as article['topic'].
+            Off by default so shared/cached article lists stay untouched;
+            the cluster key already carries the topic.
         
     Returns:
         Dict mapping topic to list of articles
     """
     clusters = defaultdict(list)
     
-    for article in articles:
-        title = article.get('title', '')
-        url = article.get('url', '')
-        topic = extract_topic(title, url)
-        
-        # Add topic to article for reference
-        article['topic'] = topic
+    for article, topic in zip(articles, topic_of_each(articles)):
+        if inplace:
+            article['topic'] = topic
         clusters[topic].append(article)
     
-    # Sort clusters by number of articles (descending)
-    sorted_clusters = dict(sorted(
-        clusters.items(),
-        key=lambda x: len(x[1]),
-        reverse=True
-    ))
+    # Order clusters by number of articles (descending); sizes are looked up
+    # once instead of calling len() from the sort key
+    sizes = {topic: len(topic_articles) for topic, topic_articles in clusters.items()}
+    ordered = sorted(sizes, key=sizes.__getitem__, reverse=True)
     
-    return sorted_clusters
+    return {topic: clusters[topic] for topic in ordered}
+
+
+def topic_of_each(articles: List[Dict[str, Any]]) -> List[str]:
+    """
+    Get the topic of every article, in input order.
+    
+    Lighter than cluster_articles() for callers that only need labels or
+    counts: no per-topic lists are built and nothing is sorted.
+    
+    Args:
+        articles: List of article dicts with 'title' and optionally 'url'
+        
+    Returns:
+        List of topic keys, one per article
+    """
+    # Build every scan text in one pass, then score them back to back
+    texts = [_topic_text(article.get('title', ''), article.get('url', '')) for article in articles]
+    return [_score_text(text) for text in texts]
 
 
 def get_topic_label(topic: str, lang: str = 'en') -> str:
@@ -151,6 +239,9 @@ def get_topic_label(topic: str, lang: str = 'en') -> str:
     return f"{emoji} {label}"
 
 
+_CLUSTER_SEPARATOR = "-" * 30
+
+
 def format_clustered_articles(clusters: Dict[str, List[Dict[str, Any]]], lang: str = 'en') -> str:
     """
     Format clustered articles for display.
@@ -166,15 +257,12 @@ def format_clustered_articles(clusters: Dict[str, List[Dict[str, Any]]], lang: s
     
     for topic, articles in clusters.items():
         label = get_topic_label(topic, lang)
-        output.append(f"\n**{label}** ({len(articles)})")
-        output.append("-" * 30)
+        output.extend((f"\n**{label}** ({len(articles)})", _CLUSTER_SEPARATOR))
         
         for article in articles[:5]:  # Limit per topic
-            title = article.get('title', 'Untitled')[:60]
-            source = article.get('source', '')
-            output.append(f"• {title}")
-            if source:
-                output.append(f"  _{source}_")
+            title = (article.get('title') or 'Untitled')[:60]
+            source = article.get('source')
+            output.append(f"• {title}\n  _{source}_" if source else f"• {title}")
     
     return "\n".join(output)
 
@@ -187,7 +275,6 @@ def get_topic_counts(articles: List[Dict[str, Any]]) -> Dict[str, int]:
         articles: List of articles
         
     Returns:
-        Dict mapping topic to article count
+        Dict mapping topic to article count, largest first
     """
-    clusters = cluster_articles(articles)
-    return {topic: len(articles) for topic, articles in clusters.items()}
+    return dict(Counter(topic_of_each(articles)).most_common())
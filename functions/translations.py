@@ -3,6 +3,9 @@ Translations Module
 Bot message translations for different languages.
 """
 
+import string
+from types import MappingProxyType
+
 # Message translations
 MESSAGES = {
     'en': {
@@ -190,6 +193,48 @@ Use /sources to toggle sources""",
         'btn_next_random': "🎲 Next Random",
         'btn_similar': "🔍 Similar",
         'similar_header': "🔍 *Similar Articles*\n\n",
+        'btn_refresh': "Refresh",
+        'btn_save_digest': "Save Digest",
+        'btn_why_matters': "Why It Matters",
+        'btn_disable': "🚫 Disable",
+        'btn_delete': "🗑️ Delete",
+        'btn_prev_page': "⬅️ Previous",
+        'btn_next_page': "Next ➡️",
+
+        # Digest generation / schedule picker
+        'digest_in_progress': "⏳ Digest is already being generated, please wait...",
+        'schedule_header': "⏰ *Choose time for daily digest:*",
+        'schedule_current_time': "\n\n_Current time: {time}_",
+        'schedule_disabled': "✅ Daily digest disabled.",
+        'schedule_set': "✅ Daily digest scheduled for *{time}*!\n\nYou will receive personalized tech news at this time every day.",
+
+        # Settings keyboard, /save, search, trends and stalk helpers
+        'status_no_sources': "  No sources selected",
+        'btn_sources': "⚙️ Sources",
+        'btn_timezone': "🌍 Timezone",
+        'btn_quiet_hours': "🌙 Quiet Hours",
+        'btn_breaking_news': "🚨 Breaking News",
+        'btn_reading_stats': "📊 Reading Stats",
+        'btn_back_to_categories': "⬅️ Back to Categories",
+        'btn_clear_history': "🗑️ Clear History",
+        'save_pick_link': "Please specify which link to save by providing its number. Example: `/save 2`",
+        'save_invalid_link_number': "Invalid link number. The message contains {count} links.",
+        'save_invalid_url': "Please provide a valid URL starting with http:// or https://",
+        'search_history_cleared': "✅ Search history cleared.",
+        'invalid_request': "Invalid request",
+        'search_link_expired': "Link expired. Please search again.",
+        'link_expired': "Link expired",
+        'trends_loading': "📊 Analyzing trends...",
+        'trends_error': "❌ Error analyzing trends.",
+        'trends_no_data': "📊 **Trend Analysis**\n\n_Not enough data yet. Trends will appear after a few days of usage._",
+        'trends_header': "📊 **This Week's Trend Analysis**\n",
+        'trends_rising': "📈 **Rising Topics:**",
+        'trends_falling': "📉 **Declining Topics:**",
+        'trends_stable': "➡️ **Stable Topics:**",
+        'trends_footer': "\n_Compared to last week_",
+        'read_time_minutes': "~{minutes} min",
+        'stalk_remove_hint': "\n_Remove: /unstalk <name>_",
+        'unstalk_usage': "Usage: /unstalk <name>",
     },
     'ru': {
         # Existing keys
@@ -376,9 +421,87 @@ _Работает локально - настройки сохранятся п
         'btn_next_random': "🎲 Следующая случайная",
         'btn_similar': "🔍 Похожие",
         'similar_header': "🔍 *Похожие статьи*\n\n",
+        'btn_refresh': "Обновить",
+        'btn_save_digest': "Сохранить",
+        'btn_why_matters': "Почему это важно",
+        'btn_disable': "🚫 Отключить",
+        'btn_delete': "🗑️ Удалить",
+        'btn_prev_page': "⬅️ Назад",
+        'btn_next_page': "Вперед ➡️",
+
+        # Digest generation / schedule picker
+        'digest_in_progress': "⏳ Дайджест уже генерируется, пожалуйста подождите...",
+        'schedule_header': "⏰ *Выберите время для ежедневного дайджеста:*",
+        'schedule_current_time': "\n\n_Текущее время: {time}_",
+        'schedule_disabled': "✅ Ежедневный дайджест отключен.",
+        'schedule_set': "✅ Ежедневный дайджест запланирован на *{time}*!\n\nВы будете получать персональные новости технологий в это время каждый день.",
+
+        # Settings keyboard, /save, search, trends and stalk helpers
+        'status_no_sources': "  Нет выбранных источников",
+        'btn_sources': "⚙️ Источники",
+        'btn_timezone': "🌍 Часовой пояс",
+        'btn_quiet_hours': "🌙 Тихие часы",
+        'btn_breaking_news': "🚨 Молнии",
+        'btn_reading_stats': "📊 Статистика",
+        'btn_back_to_categories': "⬅️ Назад к категориям",
+        'btn_clear_history': "🗑️ Очистить историю",
+        'save_pick_link': "Пожалуйста, укажите номер ссылки для сохранения. Пример: `/save 2`",
+        'save_invalid_link_number': "Неверный номер ссылки. Сообщение содержит {count} ссылок.",
+        'save_invalid_url': "Пожалуйста, укажите корректную ссылку, начинающуюся с http:// или https://",
+        'search_history_cleared': "✅ История поиска очищена.",
+        'invalid_request': "Неверный запрос",
+        'search_link_expired': "Ссылка устарела. Повторите поиск.",
+        'link_expired': "Ссылка устарела",
+        'trends_loading': "📊 Анализирую тренды...",
+        'trends_error': "❌ Ошибка при анализе трендов.",
+        'trends_no_data': "📊 **Анализ трендов**\n\n_Недостаточно данных. Тренды появятся через несколько дней использования._",
+        'trends_header': "📊 **Анализ трендов этой недели**\n",
+        'trends_rising': "📈 **Растущие темы:**",
+        'trends_falling': "📉 **Снижающиеся темы:**",
+        'trends_stable': "➡️ **Стабильные темы:**",
+        'trends_footer': "\n_Сравнение с прошлой неделей_",
+        'read_time_minutes': "~{minutes} мин",
+        'stalk_remove_hint': "\n_Удалить: /unstalk <name>_",
+        'unstalk_usage': "Использование: /unstalk <название>",
     }
 }
 
+# (lang, key) -> message for every language, with missing keys already
+# filled from English, so a lookup is a single dict hit
+_FLAT_MESSAGES = {
+    (lang, key): messages.get(key, english)
+    for lang, messages in MESSAGES.items()
+    for key, english in MESSAGES['en'].items()
+}
+_FLAT_MESSAGES.update(
+    {(lang, key): message for lang, messages in MESSAGES.items() for key, message in messages.items()}
+)
+
+# Catalogue is read-only after import; expose it as frozen views so no
+# caller can mutate a shared dict behind the flat table's back
+MESSAGES = MappingProxyType({lang: MappingProxyType(messages) for lang, messages in MESSAGES.items()})
+
+
+def _parse_template(message: str):
+    """
+    Split a message into (literal, field name) segments for fast formatting.
+    
+    Returns None when the message uses anything beyond plain {name} fields
+    (format specs, conversions, attribute or index access); those keep
+    going through str.format.
+    """
+    segments = []
+    for literal, field, spec, conversion in string.Formatter().parse(message):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        segments.append((literal, field))
+    return tuple(segments)
+
+
+# Parsed templated messages, keyed by message text, so get_message skips
+# str.format's per-call brace scanning. Filled on first use of each
+# template rather than at import, keeping cold starts cheap.
+_PARSED_TEMPLATES = {}
 
 
 def get_message(key: str, lang: str = 'en', **kwargs) -> str:
@@ -393,17 +516,32 @@ def get_message(key: str, lang: str = 'en', **kwargs) -> str:
     Returns:
         Translated and formatted message
     """
-    messages = MESSAGES.get(lang, MESSAGES['en'])
-    message = messages.get(key, MESSAGES['en'].get(key, key))
+    message = _FLAT_MESSAGES.get((lang, key))
+    if message is None:
+        # Unknown language or key: English, else the key itself
+        message = _FLAT_MESSAGES.get(('en', key), key)
     
-    if kwargs:
+    if not kwargs:
+        # Button labels and headers: no formatting work at all
+        return message
+    
+    try:
         try:
-            return message.format(**kwargs)
+            parsed = _PARSED_TEMPLATES[message]
         except KeyError:
-            return message
-    return message
-
-
-def t(key: str, lang: str = 'en', **kwargs) -> str:
-    """Shorthand for get_message."""
-    return get_message(key, lang, **kwargs)
+            parsed = _PARSED_TEMPLATES[message] = _parse_template(message)
+        if parsed is None:
+            return message.format(**kwargs)
+        parts = []
+        for literal, field in parsed:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(kwargs[field]))
+        return ''.join(parts)
+    except KeyError:
+        return message
+
+
+# Shorthand for get_message. An alias rather than a wrapper, so each
+# t() call is one Python call instead of two.
+t = get_message
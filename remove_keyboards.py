@@ -6,6 +6,7 @@ Sends a simple message with ReplyKeyboardRemove to clear cached keyboards.
 import os
 import sys
 import asyncio
+import logging
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 
@@ -15,20 +16,24 @@ load_dotenv()
 # Add functions directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from telegram import ReplyKeyboardRemove
+from functions.database import get_all_active_users
+from functions.user_storage import get_user_languages
+from functions.observability import buffered_progress_logger
+from functions.telegram_bot import broadcast, close_broadcast_bot, get_broadcast_bot, send_message_with_retry
+
 
 CLEANUP_MESSAGES = {
     'en': "✨ **Interface Updated!**\n\nWe've cleaned up the interface. Use the **Menu** button (≡) at the bottom left to access all commands.",
     'ru': "✨ **Интерфейс обновлён!**\n\nМы обновили интерфейс. Используйте кнопку **Меню** (≡) внизу слева для доступа ко всем командам."
 }
 
+# Per-user send results, written by buffered_progress_logger
+logger = logging.getLogger('notify')
+
 
 async def remove_keyboards():
     """Send message with ReplyKeyboardRemove to all users."""
-    from telegram import Bot, ReplyKeyboardRemove
-    from functions.database import get_all_active_users
-    from functions.user_storage import get_user_language
-    from functions.telegram_bot import get_bot_token
-    
     print("=" * 50)
     print("  Keyboard Cleanup Script")
     print(f"  Time: {datetime.now(timezone(timedelta(hours=4))).strftime('%Y-%m-%d %H:%M')} (Baku)")
@@ -47,58 +52,58 @@ async def remove_keyboards():
         print("⚠️ No active users found!")
         return
     
-    # Create bot instance
-    bot = Bot(token=get_bot_token())
-    
     # Send cleanup message to all users
     print("\n📤 Sending keyboard cleanup messages...")
-    sent_count = 0
-    errors = []
+    bot = get_broadcast_bot()
+    usernames = {
+        user['telegram_id']: user.get('username', 'Unknown')
+        for user in users if user.get('telegram_id')
+    }
+    languages = get_user_languages(usernames)
     
-    for user in users:
-        telegram_id = user.get('telegram_id')
-        username = user.get('username', 'Unknown')
-        
-        if not telegram_id:
-            continue
-            
+    async def send_cleanup(telegram_id: int) -> bool:
+        username = usernames[telegram_id]
+        lang = languages[telegram_id]
+        message = CLEANUP_MESSAGES.get(lang, CLEANUP_MESSAGES['en'])
         try:
-            lang = get_user_language(telegram_id)
-            message = CLEANUP_MESSAGES.get(lang, CLEANUP_MESSAGES['en'])
-            
-            print(f"   Sending to {username} ({telegram_id}) [{lang}]...", end=" ")
-            
-            await bot.send_message(
+            await send_message_with_retry(
+                bot,
                 chat_id=telegram_id,
                 text=message,
                 parse_mode='Markdown',
                 reply_markup=ReplyKeyboardRemove()  # This removes the keyboard!
             )
-            
-            print("✅")
-            sent_count += 1
-            
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(0.3)
-            
         except Exception as e:
-            print(f"❌ Error: {e}")
-            errors.append(telegram_id)
+            logger.warning("❌ %s (%s) [%s]: %s", username, telegram_id, lang, e)
+            return False
+        logger.info("✅ %s (%s) [%s]", username, telegram_id, lang)
+        return True
+    
+    with buffered_progress_logger('notify'):
+        result = await broadcast(usernames, send_cleanup)
     
     # Summary
     print("\n" + "=" * 50)
-    print(f"  ✅ Successfully sent: {sent_count}/{len(users)}")
-    if errors:
-        print(f"  ❌ Errors: {len(errors)} users")
+    print(f"  ✅ Successfully sent: {result['sent']}/{len(users)}")
+    if result['failed']:
+        print(f"  ❌ Errors: {result['failed']} users")
     print("=" * 50)
 
 
+async def main():
+    """Run the cleanup, then close the broadcast Bot opened on this loop."""
+    try:
+        await remove_keyboards()
+    finally:
+        await close_broadcast_bot()
+
+
 if __name__ == "__main__":
     print("\n⚠️  This script will remove old keyboard buttons for ALL users.")
     print("    Press Enter to continue or Ctrl+C to cancel...")
     
     try:
         input()
-        asyncio.run(remove_keyboards())
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\n❌ Cancelled by user.")
@@ -31,30 +31,26 @@ def check_env_vars():
     print("✅ Environment variables loaded")
 
 
-def test_scrapers():
-    """Quick test of all scrapers."""
+async def test_scrapers():
+    """Quick test of all scrapers (run concurrently)."""
     print("\n📰 Testing scrapers...")
 
-    try:
-        from functions.scrapers.hackernews import fetch_hackernews_sync
-        hn = fetch_hackernews_sync(3)
-        print(f"  ✅ Hacker News: {len(hn)} articles")
-    except Exception as e:
-        print(f"  ❌ Hacker News: {e}")
+    from functions.scrapers.hackernews import fetch_hackernews
+    from functions.scrapers.techcrunch import fetch_techcrunch
+    from functions.scrapers.ai_blogs import fetch_ai_blogs
 
-    try:
-        from functions.scrapers.techcrunch import fetch_techcrunch
-        tc = fetch_techcrunch(3)
-        print(f"  ✅ TechCrunch: {len(tc)} articles")
-    except Exception as e:
-        print(f"  ❌ TechCrunch: {e}")
+    checks = {
+        "Hacker News": fetch_hackernews(3),
+        "TechCrunch": asyncio.to_thread(fetch_techcrunch, 3),
+        "AI Blogs": fetch_ai_blogs(2),
+    }
+    results = await asyncio.gather(*checks.values(), return_exceptions=True)
 
-    try:
-        from functions.scrapers.ai_blogs import fetch_ai_blogs_sync
-        ai = fetch_ai_blogs_sync(2)
-        print(f"  ✅ AI Blogs: {len(ai)} articles")
-    except Exception as e:
-        print(f"  ❌ AI Blogs: {e}")
+    for name, result in zip(checks, results):
+        if isinstance(result, Exception):
+            print(f"  ❌ {name}: {result}")
+        else:
+            print(f"  ✅ {name}: {len(result)} articles")
 
 
 def run_bot():
@@ -67,33 +63,33 @@ def run_bot():
 
     application = create_bot_application()
     
+    baku_tz = timezone(timedelta(hours=4))
+
     # Define scheduled job callback
     async def check_schedule(context):
-        """Check for scheduled digests every minute."""
-        # Get current time in Baku timezone
-        baku_tz = timezone(timedelta(hours=4))
-        now = datetime.now(baku_tz)
+        """Run scheduled digests; fires once at the top of every hour."""
+        # Name the nearest hour, in case the job fires a moment early
+        now = datetime.now(baku_tz) + timedelta(minutes=30)
+        current_time_str = now.strftime("%H:00")
+        print(f"⏰ Top of hour ({current_time_str}) - checking schedule...")
         
-        # Only run at top of the hour
-        if now.minute == 0:
-            current_time_str = now.strftime("%H:00")
-            print(f"⏰ Top of hour ({current_time_str}) - checking schedule...")
-            
-            try:
-                # Call the shared digest processing logic
-                result = await process_scheduled_digest(current_time_str)
-                if result.get('sent', 0) > 0:
-                    print(f"✅ Sent {result['sent']} digests")
-                elif result.get('message'):
-                    print(f"ℹ️ {result['message']}")
-            except Exception as e:
-                print(f"❌ Scheduled digest error: {e}")
+        try:
+            # Call the shared digest processing logic
+            result = await process_scheduled_digest(current_time_str)
+            if result.get('sent', 0) > 0:
+                print(f"✅ Sent {result['sent']} digests")
+            elif result.get('message'):
+                print(f"ℹ️ {result['message']}")
+        except Exception as e:
+            print(f"❌ Scheduled digest error: {e}")
     
     # Add recurring job to the job queue
     if application.job_queue:
-        # Check every 60 seconds
-        application.job_queue.run_repeating(check_schedule, interval=60, first=10)
-        print("✅ Local scheduler activated (checks every minute)")
+        # Hourly, starting at the next top of the hour
+        now = datetime.now(baku_tz)
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        application.job_queue.run_repeating(check_schedule, interval=timedelta(hours=1), first=next_hour)
+        print(f"✅ Local scheduler activated (hourly, next run {next_hour.strftime('%H:%M')})")
     else:
         print("⚠️ Warning: JobQueue not available")
 
@@ -109,7 +105,7 @@ if __name__ == "__main__":
 
     # Optional: test scrapers first
     if '--test-scrapers' in sys.argv:
-        test_scrapers()
+        asyncio.run(test_scrapers())
         print()
     
     # Run the bot
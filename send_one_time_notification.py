@@ -7,6 +7,8 @@ Run this script ONCE to notify users about bot downtime.
 import os
 import sys
 import asyncio
+import logging
+from collections import defaultdict
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 
@@ -16,6 +18,19 @@ load_dotenv()
 # Add functions directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from functions.database import get_all_active_users
+from functions.user_storage import get_user_languages
+from functions.observability import buffered_progress_logger
+from functions.telegram_bot import broadcast, close_broadcast_bot, seed_digest, send_digest_to_user
+from functions.scrapers.hackernews import fetch_hackernews
+from functions.scrapers.techcrunch import fetch_techcrunch_async
+from functions.scrapers.ai_blogs import fetch_ai_blogs
+from functions.scrapers.theverge import fetch_theverge_async
+from functions.scrapers.github_trending import fetch_github_trending_async
+from functions.scrapers.http_client import get_shared_client, close_shared_client
+from functions.summarizer import close_async_clients, summarize_news_with_status
+from functions.security_utils import stable_hash
+
 
 # Localized apology messages with explanation
 APOLOGY_MESSAGES = {
@@ -46,19 +61,15 @@ We've now resolved the underlying issue and restored full service. We are also a
 }
 
 
+# Generated digests, reused when the script is rerun on the same articles
+DIGEST_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+# Per-user send results, written by buffered_progress_logger
+logger = logging.getLogger('notify')
+
 
 async def send_one_time_notification():
     """Send one-time notification to all active users."""
-    from functions.database import get_all_active_users
-    from functions.user_storage import get_user_language
-    from functions.telegram_bot import send_digest_to_user
-    from functions.scrapers.hackernews import fetch_hackernews
-    from functions.scrapers.techcrunch import fetch_techcrunch
-    from functions.scrapers.ai_blogs import fetch_ai_blogs
-    from functions.scrapers.theverge import fetch_theverge
-    from functions.scrapers.github_trending import fetch_github_trending
-    from functions.summarizer import summarize_news
-    
     print("=" * 50)
     print("  One-Time Notification Script")
     print(f"  Time: {datetime.now(timezone(timedelta(hours=4))).strftime('%Y-%m-%d %H:%M')} (Baku)")
@@ -79,14 +90,19 @@ async def send_one_time_notification():
     
     # Fetch news from all sources
     print("\n📰 Fetching news from all sources...")
+    # All scrapers share one keep-alive pool (TCP/TLS reuse across sources)
+    client = get_shared_client()
     tasks = []
-    tasks.append(fetch_hackernews(15))
-    tasks.append(asyncio.to_thread(fetch_techcrunch, 10))
-    tasks.append(fetch_ai_blogs(5))
-    tasks.append(asyncio.to_thread(fetch_theverge, 8))
-    tasks.append(asyncio.to_thread(fetch_github_trending, 8))
+    tasks.append(fetch_hackernews(15, client=client))
+    tasks.append(fetch_techcrunch_async(10, client=client))
+    tasks.append(fetch_ai_blogs(5, client=client))
+    tasks.append(fetch_theverge_async(8, client=client))
+    tasks.append(fetch_github_trending_async(8, client=client))
     
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await close_shared_client()
     
     all_news = []
     for res in results:
@@ -101,15 +117,15 @@ async def send_one_time_notification():
         print("❌ No news available!")
         return
     
-    # Group users by language
-    users_by_lang = {}
+    # Group users by language (all languages fetched in one bulk lookup)
+    languages = get_user_languages(
+        user['telegram_id'] for user in users if user.get('telegram_id')
+    )
+    users_by_lang = defaultdict(list)
     for user in users:
         telegram_id = user.get('telegram_id')
         if telegram_id:
-            lang = get_user_language(telegram_id)
-            if lang not in users_by_lang:
-                users_by_lang[lang] = []
-            users_by_lang[lang].append(user)
+            users_by_lang[languages[telegram_id]].append(user)
     
     print(f"\n🌐 Users by language:")
     for lang, lang_users in users_by_lang.items():
@@ -118,57 +134,90 @@ async def send_one_time_notification():
     # Generate digest for each language
     print("\n🤖 Generating digests...")
     digests_by_lang = {}
+    # AI digests are cached on disk per (article set, language), so rerunning
+    # the script after a partial failure skips the LLM calls. Fallback
+    # digests are never cached, so a rerun retries the AI.
+    articles_key = stable_hash("\n".join(sorted(a.get('url', '') for a in all_news)))
+    os.makedirs(DIGEST_CACHE_DIR, exist_ok=True)
     for lang in users_by_lang.keys():
-        print(f"   Generating {lang} digest...")
-        digest = await summarize_news(all_news, language=lang)
+        cache_path = os.path.join(DIGEST_CACHE_DIR, f"digest_{articles_key}_{lang}.txt")
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                digest = f.read()
+            print(f"   Using cached {lang} digest")
+        else:
+            print(f"   Generating {lang} digest...")
+            digest, ai_generated = await summarize_news_with_status(all_news, language=lang)
+            if ai_generated:
+                tmp_path = cache_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(digest)
+                os.replace(tmp_path, cache_path)
+            else:
+                print(f"   ⚠️ {lang} digest used the fallback format, not caching it")
         # Prepend apology message
         apology = APOLOGY_MESSAGES.get(lang, APOLOGY_MESSAGES['en'])
         digests_by_lang[lang] = apology + digest
         print(f"   ✅ {lang} digest ready")
     
-    # Send to all users
     print("\n📤 Sending notifications...")
-    sent_count = 0
-    errors = []
     
-    for lang, lang_users in users_by_lang.items():
-        digest = digests_by_lang[lang]
-        for user in lang_users:
-            telegram_id = user.get('telegram_id')
-            username = user.get('username', 'Unknown')
-            
-            try:
-                print(f"   Sending to {username} ({telegram_id}) [{lang}]...", end=" ")
-                success = await send_digest_to_user(telegram_id, digest)
-                if success:
-                    print("✅")
-                    sent_count += 1
-                else:
-                    print("❌")
-                    errors.append(telegram_id)
-                
-                # Small delay to avoid rate limiting
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                errors.append(telegram_id)
+    # With NOTIFY_SEED_CHAT_ID set (e.g. an admin's chat with the bot), each
+    # language's digest is uploaded once there and copied to every user
+    seeds_by_lang = {}
+    seed_chat_id = os.environ.get('NOTIFY_SEED_CHAT_ID')
+    if seed_chat_id:
+        for lang, digest in digests_by_lang.items():
+            seeds_by_lang[lang] = await seed_digest(int(seed_chat_id), digest)
+    
+    usernames = {
+        user['telegram_id']: user.get('username', 'Unknown')
+        for user in users if user.get('telegram_id')
+    }
+    
+    async def send_notification(telegram_id: int) -> bool:
+        username = usernames[telegram_id]
+        lang = languages[telegram_id]
+        try:
+            success = await send_digest_to_user(
+                telegram_id, digests_by_lang[lang], seed=seeds_by_lang.get(lang)
+            )
+        except Exception as e:
+            logger.warning("❌ %s (%s) [%s]: %s", username, telegram_id, lang, e)
+            return False
+        if success:
+            logger.info("✅ %s (%s) [%s]", username, telegram_id, lang)
+        else:
+            logger.warning("❌ %s (%s) [%s]", username, telegram_id, lang)
+        return success
+    
+    with buffered_progress_logger('notify'):
+        result = await broadcast(usernames, send_notification)
     
     # Summary
     print("\n" + "=" * 50)
-    print(f"  ✅ Successfully sent: {sent_count}/{len(users)}")
-    if errors:
-        print(f"  ❌ Errors: {len(errors)} users")
-        print(f"     Failed IDs: {errors}")
+    print(f"  ✅ Successfully sent: {result['sent']}/{len(users)}")
+    if result['failed']:
+        print(f"  ❌ Errors: {result['failed']} users")
+        print(f"     Failed IDs: {result['failed_ids']}")
     print("=" * 50)
 
 
+async def main():
+    """Send the notification, then close the clients opened on this loop."""
+    try:
+        await send_one_time_notification()
+    finally:
+        await close_broadcast_bot()
+        await close_async_clients()
+
+
 if __name__ == "__main__":
     print("\n⚠️  This script will send a one-time notification to ALL users.")
     print("    Press Enter to continue or Ctrl+C to cancel...")
     
     try:
         input()
-        asyncio.run(send_one_time_notification())
+        asyncio.run(main())
     except KeyboardInterrupt:
         print("\n\n❌ Cancelled by user.")
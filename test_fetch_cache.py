@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from functions.scrapers import fetch_cache
+from functions.scrapers.fetch_cache import get_or_fetch
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    fetch_cache.clear_fetch_cache()
+    yield
+    fetch_cache.clear_fetch_cache()
+
+
+def counting_fetch(articles):
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return [dict(article) for article in articles]
+
+    return fetch, calls
+
+
+def test_get_or_fetch_reuses_fresh_results():
+    fetch, calls = counting_fetch([{"title": "A"}])
+
+    first = asyncio.run(get_or_fetch("hackernews", 10, fetch))
+    second = asyncio.run(get_or_fetch("hackernews", 10, fetch))
+
+    assert first == second == [{"title": "A"}]
+    assert len(calls) == 1
+
+
+def test_get_or_fetch_keys_on_source_and_limit():
+    fetch, calls = counting_fetch([{"title": "A"}])
+
+    asyncio.run(get_or_fetch("hackernews", 10, fetch))
+    asyncio.run(get_or_fetch("hackernews", 20, fetch))
+    asyncio.run(get_or_fetch("techcrunch", 10, fetch))
+
+    assert len(calls) == 3
+
+
+def test_get_or_fetch_refetches_after_ttl(monkeypatch):
+    fetch, calls = counting_fetch([{"title": "A"}])
+    now = [1000.0]
+    monkeypatch.setattr(fetch_cache.time, "monotonic", lambda: now[0])
+
+    asyncio.run(get_or_fetch("hackernews", 10, fetch, ttl_seconds=90))
+    now[0] += 89
+    asyncio.run(get_or_fetch("hackernews", 10, fetch, ttl_seconds=90))
+    assert len(calls) == 1
+
+    now[0] += 1
+    asyncio.run(get_or_fetch("hackernews", 10, fetch, ttl_seconds=90))
+    assert len(calls) == 2
+
+
+def test_get_or_fetch_returns_copies():
+    fetch, _ = counting_fetch([{"title": "A"}])
+
+    first = asyncio.run(get_or_fetch("hackernews", 10, fetch))
+    first[0]["title"] = "changed"
+    first.append({"title": "extra"})
+    second = asyncio.run(get_or_fetch("hackernews", 10, fetch))
+    second[0]["title"] = "changed again"
+
+    assert asyncio.run(get_or_fetch("hackernews", 10, fetch)) == [{"title": "A"}]
+
+
+def test_get_or_fetch_does_not_cache_empty_results():
+    fetch, calls = counting_fetch([])
+
+    asyncio.run(get_or_fetch("hackernews", 10, fetch))
+    asyncio.run(get_or_fetch("hackernews", 10, fetch))
+
+    assert len(calls) == 2
@@ -0,0 +1,22 @@
+from functions.message_utils import source_from_url
+
+
+def test_source_from_url_matches_host_and_subdomains():
+    assert source_from_url("https://techcrunch.com/2024/01/01/story/") == "TechCrunch"
+    assert source_from_url("https://www.theverge.com/tech/1") == "The Verge"
+    assert source_from_url("https://news.ycombinator.com/item?id=1") == "Hacker News"
+
+
+def test_source_from_url_labels_github_neutrally():
+    assert source_from_url("https://github.com/owner/repo") == "GitHub"
+    assert source_from_url("https://github.com/trending") == "GitHub"
+
+
+def test_source_from_url_prefers_the_most_specific_domain():
+    assert source_from_url("https://qwenlm.github.io/blog/qwen3/") == "Qwen"
+
+
+def test_source_from_url_unknown_or_invalid():
+    assert source_from_url("https://example.com/a") == ""
+    assert source_from_url("not a url") == ""
+    assert source_from_url("http://[::1") == ""
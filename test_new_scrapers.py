@@ -1,5 +1,6 @@
 """Test new scrapers"""
 import sys
+import asyncio
 sys.path.insert(0, 'functions')
 
 try:
@@ -11,21 +12,28 @@ from scrapers.theverge import fetch_theverge
 from scrapers.github_trending import fetch_github_trending
 from scrapers.producthunt import fetch_producthunt
 
-print("Testing The Verge...")
-verge = fetch_theverge(3)
+
+async def fetch_all():
+    """Run the three scrapers concurrently (each in its own thread)."""
+    return await asyncio.gather(
+        asyncio.to_thread(fetch_theverge, 3),
+        asyncio.to_thread(fetch_github_trending, 3),
+        asyncio.to_thread(fetch_producthunt, 3),
+    )
+
+
+print("Testing The Verge, GitHub Trending and Product Hunt...")
+verge, github, ph = asyncio.run(fetch_all())
+
 print(f"The Verge: {len(verge)} articles")
 for a in verge:
     print(f"  - {a['title'][:60]}")
 
-print("\nTesting GitHub Trending...")
-github = fetch_github_trending(3)
-print(f"GitHub: {len(github)} repos")
+print(f"\nGitHub: {len(github)} repos")
 for r in github:
     print(f"  - {r['title'][:60]}")
 
-print("\nTesting Product Hunt...")
-ph = fetch_producthunt(3)
-print(f"Product Hunt: {len(ph)} products")
+print(f"\nProduct Hunt: {len(ph)} products")
 for p in ph:
     print(f"  - {p['title'][:60]}")
 
@@ -0,0 +1,29 @@
+import logging
+
+import pytest
+
+from functions.observability import buffered_progress_logger
+
+
+def test_buffered_progress_logger_flushes_when_the_block_raises(capsys):
+    with pytest.raises(RuntimeError):
+        with buffered_progress_logger('test_progress', capacity=50) as logger:
+            logger.info("sent to 1")
+            logger.warning("failed for 2")
+            assert "sent to 1" not in capsys.readouterr().err
+            raise RuntimeError("crash mid-broadcast")
+
+    err = capsys.readouterr().err
+    assert "   sent to 1" in err
+    assert "   failed for 2" in err
+    assert not logging.getLogger('test_progress').handlers
+
+
+def test_buffered_progress_logger_writes_in_batches(capsys):
+    with buffered_progress_logger('test_progress', capacity=2) as logger:
+        logger.info("one")
+        assert capsys.readouterr().err == ""
+        logger.info("two")
+        assert capsys.readouterr().err == "   one\n   two\n"
+        logger.info("three")
+    assert capsys.readouterr().err == "   three\n"
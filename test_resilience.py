@@ -1,5 +1,6 @@
 import asyncio
-from functions.resilience import safe_call, safe_call_async
+import time
+from functions.resilience import safe_call, safe_call_async, AsyncRateLimiter
 
 def test_safe_call_success():
     def my_func(a, b):
@@ -43,3 +44,35 @@ def test_safe_call_async_exception(capsys):
     assert asyncio.run(safe_call_async(my_func, 1, 2, default=10)) == 10
     captured = capsys.readouterr()
     assert captured.out.count("WARNING: my_func failed: Oops. Returning default value.\n") == 2
+
+def test_rate_limiter_first_call_is_immediate():
+    limiter = AsyncRateLimiter(rate=10)
+
+    start = time.monotonic()
+    asyncio.run(limiter.acquire())
+    assert time.monotonic() - start < 0.05
+
+def test_rate_limiter_spaces_concurrent_callers():
+    limiter = AsyncRateLimiter(rate=50)
+    stamps = []
+
+    async def call():
+        await limiter.acquire()
+        stamps.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(main())
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    # 50/s means one slot every 20ms; allow a little scheduler jitter
+    assert all(gap >= 0.015 for gap in gaps)
+    assert stamps[-1] - stamps[0] >= 0.09
+
+def test_rate_limiter_is_shared_across_event_loops():
+    limiter = AsyncRateLimiter(rate=20)
+
+    start = time.monotonic()
+    asyncio.run(limiter.acquire())
+    asyncio.run(limiter.acquire())
+    assert time.monotonic() - start >= 0.045
@@ -1,5 +1,5 @@
 import pytest
-from functions.security_utils import escape_markdown_v1
+from functions.security_utils import escape_markdown_v1, has_balanced_markdown_v1
 
 def test_escape_markdown_v1_empty_string():
     """Test with empty strings and None."""
@@ -40,3 +40,21 @@ def test_escape_markdown_v1_mixed_text():
     input_str = "Check out this *awesome* repo: [Link](https://github.com/test)! It's 100% free."
     expected_str = r"Check out this \*awesome\* repo: \[Link\]\(https://github\.com/test\)\! It's 100% free\."
     assert escape_markdown_v1(input_str) == expected_str
+
+def test_has_balanced_markdown_v1_closed_entities():
+    """Closed bold, italic, code and link entities parse as Markdown."""
+    assert has_balanced_markdown_v1("*Bold* and _Italic_ with `code`")
+    assert has_balanced_markdown_v1("[Link](https://example.com/a_b) done")
+    assert has_balanced_markdown_v1("```\nsnake_case *x\n```")
+    assert has_balanced_markdown_v1("")
+
+def test_has_balanced_markdown_v1_unclosed_entities():
+    """Unterminated entities are reported so the chunk can go out as plain text."""
+    assert not has_balanced_markdown_v1("*Bold without end")
+    assert not has_balanced_markdown_v1("file_name.py")
+    assert not has_balanced_markdown_v1("[Link](https://example.com")
+    assert not has_balanced_markdown_v1("`code")
+
+def test_has_balanced_markdown_v1_escaped_chars():
+    """Escaped entity characters do not open entities."""
+    assert has_balanced_markdown_v1(escape_markdown_v1("file_name *star"))
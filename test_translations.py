@@ -0,0 +1,38 @@
+import string
+
+from functions import translations
+from functions.translations import _parse_template, get_message
+
+
+def test_parse_template_splits_plain_fields():
+    assert _parse_template("Hi {name}, {count} new") == (
+        ("Hi ", "name"), (", ", "count"), (" new", None),
+    )
+    assert _parse_template("No fields") == (("No fields", None),)
+
+
+def test_parse_template_leaves_complex_fields_to_str_format():
+    assert _parse_template("{count:>3}") is None
+    assert _parse_template("{name!r}") is None
+    assert _parse_template("{user.name}") is None
+    assert _parse_template("{items[0]}") is None
+    assert _parse_template("{0}") is None
+
+
+def test_get_message_matches_str_format_for_every_message():
+    for lang, messages in translations.MESSAGES.items():
+        for key, message in messages.items():
+            fields = {field for _, field, _, _ in string.Formatter().parse(message) if field}
+            kwargs = {field: f"<{field}>" for field in fields} or {"unused": 1}
+            assert get_message(key, lang, **kwargs) == message.format(**kwargs)
+
+
+def test_parse_template_keeps_escaped_braces_literal():
+    segments = _parse_template("{{x}} {y}")
+    text = "".join(literal + ("Y" if field else "") for literal, field in segments)
+    assert text == "{x} Y"
+
+
+def test_get_message_returns_template_when_an_argument_is_missing():
+    assert get_message("searching", "en") == translations.MESSAGES["en"]["searching"]
+    assert get_message("searching", "en", other="x") == translations.MESSAGES["en"]["searching"]
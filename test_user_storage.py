@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from functions import user_storage
+
+
+@pytest.fixture
+def local_store(tmp_path, monkeypatch):
+    """Point the local JSON fallback at a temp dir, with Firestore off."""
+    monkeypatch.setattr(user_storage, "STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(user_storage, "get_firestore_client", lambda: None)
+    user_storage._local_data_cache.clear()
+    user_storage._language_cache.clear()
+    yield tmp_path
+    user_storage._local_data_cache.clear()
+    user_storage._language_cache.clear()
+
+
+def test_loaded_data_is_not_shared_with_the_cache(local_store):
+    user_storage.set_user_language(1, "ru")
+
+    prefs = user_storage.get_user_preferences(1)
+    prefs["language"] = "az"
+    user_storage._language_cache.clear()
+
+    assert user_storage.get_user_language(1) == "ru"
+    assert user_storage._load_local_data(1) is not user_storage._load_local_data(1)
+
+
+def test_save_articles_batch_saves_repeated_urls_once(local_store):
+    saved = user_storage.save_articles_batch(1, [
+        ("First", "https://example.com/a", "HN"),
+        ("First again", "https://example.com/a", "HN"),
+        ("Second", "https://example.com/b", "HN"),
+    ])
+
+    assert saved == 2
+    articles = user_storage.get_all_saved_articles(1)
+    assert [a["url"] for a in articles] == ["https://example.com/b", "https://example.com/a"]
+    assert articles[1]["title"] == "First"
+
+
+def test_save_articles_batch_skips_already_saved_urls(local_store):
+    assert user_storage.save_article(1, "Old", "https://example.com/a")
+
+    saved = user_storage.save_articles_batch(1, [
+        ("Old", "https://example.com/a", ""),
+        ("New", "https://example.com/b", ""),
+    ])
+
+    assert saved == 1
+    assert user_storage.save_articles_batch(1, [("Old", "https://example.com/a", "")]) == 0
+    assert len(user_storage.get_all_saved_articles(1)) == 2
+
+
+def test_save_articles_batch_keeps_the_newest_local_articles(local_store):
+    limit = user_storage.LOCAL_SAVED_LIMIT
+    items = [(f"Story {i}", f"https://example.com/{i}", "") for i in range(limit + 5)]
+
+    assert user_storage.save_articles_batch(1, items) == limit + 5
+
+    data = user_storage._load_local_data(1)
+    assert len(data["saved_articles"]) == limit
+    assert data["saved_urls"] == [url for _, url, _ in items[5:]]
+    # Articles dropped by the cap can be saved again
+    assert user_storage.save_articles_batch(1, [items[0]]) == 1
+
+
+def write_user_file(store, telegram_id, data):
+    (store / f"user_{telegram_id}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_legacy_file_without_saved_urls_still_blocks_duplicates(local_store):
+    write_user_file(local_store, 1, {"saved_articles": [
+        {"title": "Old", "url": "https://example.com/a", "category": "tech"},
+    ]})
+
+    assert not user_storage.save_article(1, "Old", "https://example.com/a")
+    assert user_storage.save_article(1, "New", "https://example.com/b")
+
+    data = user_storage._load_local_data(1)
+    assert data["saved_urls"] == ["https://example.com/a", "https://example.com/b"]
+
+
+def test_stale_saved_urls_are_rebuilt_from_the_articles(local_store):
+    write_user_file(local_store, 1, {
+        "saved_articles": [
+            {"title": "A", "url": "https://example.com/a"},
+            {"title": "B", "url": "https://example.com/b"},
+        ],
+        # Written by an older version that did not keep the list in step
+        "saved_urls": ["https://example.com/a"],
+    })
+
+    assert user_storage.save_articles_batch(1, [("B", "https://example.com/b", "")]) == 0
+    assert user_storage._local_saved_urls(user_storage._load_local_data(1)) == {
+        "https://example.com/a", "https://example.com/b",
+    }
+
+
+def test_search_history_carries_over_legacy_entries(local_store):
+    legacy = [{"query": f"old {i}", "timestamp": ""} for i in range(25)]
+    write_user_file(local_store, 1, {"search_history": legacy})
+
+    # Before the log exists, history still comes from the data file
+    assert user_storage.get_search_history(1, limit=2) == ["old 24", "old 23"]
+
+    user_storage.add_search_history(1, "new")
+
+    history = user_storage.get_search_history(1, limit=100)
+    assert len(history) == user_storage.LOCAL_HISTORY_LIMIT
+    assert history[:2] == ["new", "old 24"]
+    assert history[-1] == "old 6"
+
+
+def test_search_history_log_is_compacted(local_store, monkeypatch):
+    monkeypatch.setattr(user_storage, "LOCAL_HISTORY_COMPACT_BYTES", 2048)
+    for i in range(100):
+        user_storage.add_search_history(1, f"query {i}")
+
+    log = local_store / "user_1.history.jsonl"
+    # At most one append past the threshold before it is rewritten
+    assert log.stat().st_size <= 2048 + 100
+    assert len(log.read_bytes().splitlines()) < 50
+    assert user_storage.get_search_history(1, limit=3) == ["query 99", "query 98", "query 97"]
+
+
+def test_search_history_ignores_a_torn_last_line(local_store):
+    user_storage.add_search_history(1, "first")
+    with open(local_store / "user_1.history.jsonl", "ab") as f:
+        f.write(b'{"query": "interrup')
+
+    assert user_storage.get_search_history(1) == ["first"]
+    user_storage.clear_search_history(1)
+    assert user_storage.get_search_history(1) == []